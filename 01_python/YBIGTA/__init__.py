@@ -1,3 +1,8 @@
 from .bpe_tokenizer import BPETokenizer
 from .word_tokenizer import WordTokenizer
-from .text_preprocessor import TextPreprocessor
+from .text_preprocessor import TextPreprocessor, count_corpus
+from .training_monitor import TrainingMonitor, TrainingProgress
+from .checkpoint import Checkpointer
+from .corpus_cache import CorpusCache
+from .batching import Batch, restore_order
+from .token_shards import ShardInfo, read_shard
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Type
+
+from .parallel import split_shards
+
+PARALLEL_MIN_DOCS = 512         # 이보다 작은 batch는 IPC 비용이 더 크므로 process pool을 쓰지 않는다
+CHUNK_SIZE = 256                # worker에 한 번에 보내는 문서 수
+
+class EncodeStats(NamedTuple):
+    n_docs: int
+    n_tokens: int
+    seconds: float
+    tokens_per_sec: float
+    workers: int
+
+_worker_tokenizer = None        # worker process마다 한 번 load 되는 tokenizer
+
+def _init_worker(cls: Type, path: str, kwargs: Dict[str, object]) -> None:
+
+    global _worker_tokenizer
+    _worker_tokenizer = cls.load(path, **kwargs)
+
+def _encode_chunk(texts: Sequence[str]) -> List[List[int]]:
+    return _worker_tokenizer._encode_texts(texts)
+
+class BatchEncoder:
+    # 학습된 tokenizer를 임시 파일로 save 한 뒤, worker process들이 그 파일을 한 번씩 load 해서 계속 쓰는 persistent pool
+    # (tokenizer 객체를 task마다 pickle 하지 않는다. worker마다 vocab / merge table 사본을 하나씩 갖는다)
+
+    def __init__(self, tokenizer, workers: int):
+
+        fd, self.path = tempfile.mkstemp(suffix='.ybtk')
+        os.close(fd)
+        tokenizer.save(self.path)
+
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(type(tokenizer), self.path, tokenizer._load_kwargs()))
+        self._finalizer = weakref.finalize(self, BatchEncoder._cleanup, self.pool, self.path)
+
+    @staticmethod
+    def _cleanup(pool: ProcessPoolExecutor, path: str) -> None:
+
+        pool.shutdown(wait=False, cancel_futures=True)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def encode(self, texts: Sequence[str], chunk_size: int = CHUNK_SIZE) -> List[List[int]]:     # 입력 순서 그대로 결과를 return
+
+        n_chunks = max(1, -(-len(texts) // chunk_size))
+        return [ids for chunk in self.pool.map(_encode_chunk, split_shards(texts, n_chunks)) for ids in chunk]
+
+    def imap(self, chunks: Iterable[Sequence[str]]) -> Iterator[List[List[int]]]:
+        # chunk 마다 encode 결과를 chunk 순서대로 yield. worker에 보내둔 chunk는 workers * 2개까지라서 메모리가 일정하다
+
+        pending = deque()
+        for chunk in chunks:
+            pending.append(self.pool.submit(_encode_chunk, chunk))
+            if len(pending) >= self.workers * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    def close(self) -> None:
+        self._finalizer()
+
+def _get_batch_encoder(tokenizer, workers: int) -> BatchEncoder:
+
+    if tokenizer.batch_encoder is None or tokenizer.batch_encoder.workers != workers:
+        tokenizer._close_batch_encoder()
+        tokenizer.batch_encoder = BatchEncoder(tokenizer, workers)
+    return tokenizer.batch_encoder
+
+def encode_batch(tokenizer, texts: Sequence[str], workers: Optional[int] = None, min_parallel: int = PARALLEL_MIN_DOCS) -> List[List[int]]:
+    # 문서마다 flat token id list를 return. 큰 batch는 tokenizer의 persistent pool로 나눠 보내고, 작은 batch는 현재 process에서 처리한다
+    # 처리량은 tokenizer.encode_stats (EncodeStats)에 기록된다
+
+    workers = tokenizer.workers if workers is None else workers
+    start = time.perf_counter()
+
+    if workers <= 1 or len(texts) < min_parallel:
+        result = tokenizer._encode_texts(texts)
+        workers = 1
+    else:
+        result = _get_batch_encoder(tokenizer, workers).encode(texts)
+
+    seconds = time.perf_counter() - start
+    n_tokens = sum(map(len, result))
+    tokenizer.encode_stats = EncodeStats(len(texts), n_tokens, seconds, n_tokens / seconds if seconds > 0 else float('inf'), workers)
+
+    return result
+
+def iter_encode(tokenizer, texts: Iterable[str], workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> Iterator[List[List[int]]]:
+    # 문서를 chunk_size개씩 읽어가면서 chunk 마다 문서별 token id list들을 입력 순서대로 yield 하는 generator
+    # (texts 전체를 list로 만들지 않는다. workers > 1 이면 encode_batch와 같은 persistent pool을 쓴다)
+
+    workers = tokenizer.workers if workers is None else workers
+    texts = iter(texts)
+    chunks = iter(lambda: list(islice(texts, chunk_size)), [])
+
+    if workers <= 1:
+        yield from map(tokenizer._encode_texts, chunks)
+    else:
+        yield from _get_batch_encoder(tokenizer, workers).imap(chunks)
@@ -0,0 +1,84 @@
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from .tensors import to_tensors
+
+SORTS = ('length', 'bucket', None)
+
+class Batch(NamedTuple):
+    indices: List[int]                  # 각 row의 원래 입력 위치 (restore_order에 쓴다)
+    input_ids: Union[List[List[int]], 'numpy.ndarray']
+    attention_mask: Union[List[List[int]], 'numpy.ndarray']
+    n_tokens: int                       # 실제 token 수
+    n_padding: int                      # '<PAD>'로 채운 자리 수
+    padding_ratio: float                # n_padding / (n_tokens + n_padding). padding에 낭비되는 계산 비율
+
+def iter_batches(tokenizer, texts: Sequence[str], batch_size: int = 32, max_tokens: Optional[int] = None, max_length: Optional[int] = None,
+                 sort: Optional[str] = 'length', bucket_size: int = 100, return_tensors: Optional[str] = None, workers: Optional[int] = None) -> Iterator[Batch]:
+    # texts를 한 번에 encode 한 뒤 길이가 비슷한 문서끼리 묶어 batch 안에서 가장 긴 문서에 맞춰 padding 한 Batch를 yield 하는 generator
+    #
+    #   sort='length' : 전체를 길이 순으로 정렬 (padding이 가장 적다)
+    #   sort='bucket' : 입력 순서대로 batch_size * bucket_size개씩 잘라 그 안에서만 정렬 (원래 순서와 가까운 채로 padding을 줄인다)
+    #   sort=None     : 입력 순서 그대로
+    #   max_tokens    : batch의 (row 수 * 가장 긴 길이)가 이 값을 넘지 않도록 batch_size보다 일찍 자른다
+    #
+    # Batch.indices로 restore_order(batches, outputs)를 부르면 결과를 원래 입력 순서로 되돌릴 수 있다
+
+    if sort not in SORTS:
+        raise ValueError(f"Unsupported sort: {sort!r}. Use one of {SORTS}.")
+    if return_tensors not in (None, 'np'):
+        raise ValueError(f"Unsupported return_tensors: {return_tensors!r}. Only 'np' is supported.")
+
+    encoded = tokenizer.encode_batch(texts, workers)
+    if max_length is not None:
+        encoded = [ids[:max_length] for ids in encoded]
+
+    order = list(range(len(encoded)))
+    length = lambda i: len(encoded[i])
+
+    if sort == 'length':
+        order.sort(key=length)
+    elif sort == 'bucket':
+        window = batch_size * bucket_size
+        order = [i for start in range(0, len(order), window) for i in sorted(order[start:start + window], key=length)]
+
+    batch, width = [], 0
+    for i in order:
+        new_width = max(width, len(encoded[i]))
+        if batch and (len(batch) == batch_size or (max_tokens is not None and (len(batch) + 1) * new_width > max_tokens)):
+            yield _pad(batch, encoded, tokenizer.pad_id, return_tensors)
+            batch, new_width = [], len(encoded[i])
+        batch.append(i)
+        width = new_width
+
+    if batch:
+        yield _pad(batch, encoded, tokenizer.pad_id, return_tensors)
+
+def _pad(indices: List[int], encoded: List[List[int]], pad_id: int, return_tensors: Optional[str]) -> Batch:
+
+    rows = [encoded[i] for i in indices]
+    width = max(map(len, rows))
+    n_tokens = sum(map(len, rows))
+    n_padding = width * len(rows) - n_tokens
+
+    if return_tensors == 'np':
+        ids, offsets = array('i'), array('q', [0])
+        for row in rows:
+            ids.extend(row)
+            offsets.append(len(ids))
+        tensors = to_tensors(ids, offsets, None, pad_id)
+        input_ids, attention_mask = tensors['input_ids'], tensors['attention_mask']
+    else:
+        input_ids = [row + [pad_id] * (width - len(row)) for row in rows]
+        attention_mask = [[1] * len(row) + [0] * (width - len(row)) for row in rows]
+
+    return Batch(indices, input_ids, attention_mask, n_tokens, n_padding, n_padding / (width * len(rows)) if width else 0.0)
+
+def restore_order(batches: Iterable[Batch], outputs: Iterable[Sequence[Any]]) -> List[Any]:
+    # batch 별 결과 (batch의 row 순서)를 원래 입력 순서의 list로 되돌린다
+
+    result: Dict[int, Any] = {}
+    for batch, output in zip(batches, outputs):
+        result.update(zip(batch.indices, output))
+
+    return [result[i] for i in range(len(result))]
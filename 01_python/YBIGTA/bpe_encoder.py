@@ -0,0 +1,78 @@
+import heapq
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+from .bpe_trainer import pack
+from .symbol_table import SymbolTable
+
+UNKNOWN = -1                # alphabet에 없는 글자
+MERGED = -2                 # 왼쪽 symbol에 합쳐져서 없어진 자리
+
+class BPEEncoder:
+    # merge를 rank(학습된 순서) 순으로 적용하는 encoder
+    # 단어 하나를 symbol linked list + (rank, position) heap으로 처리해서 O(n log n)에 끝난다.
+    # merge를 순서대로 전부 훑는 것과 결과가 같다: 각 단계에서 rank가 제일 낮은 pair를 왼쪽부터 합친다.
+    #
+    # word -> ids 결과는 크기를 정할 수 있는 LRU cache에 저장된다. (cache_info()로 hit / miss 확인)
+
+    def __init__(self, symbols: SymbolTable, merges: Iterable[Tuple[str, str]], unk_id: int, cache_size: Optional[int] = 100000):
+
+        self.ids = symbols.ids
+        self.unk_id = unk_id                                # alphabet에 없는 글자의 id
+        self.ranks: Dict[int, Tuple[int, int]] = {}        # pair key -> (rank, merge 된 token id)
+
+        for rank, (first, second) in enumerate(merges):
+            key = pack(self.ids[first], self.ids[second])
+            if key not in self.ranks:
+                self.ranks[key] = (rank, self.ids[first + second])
+
+        self.encode_word = lru_cache(maxsize=cache_size)(self._encode_word)
+
+    def cache_info(self):
+        return self.encode_word.cache_info()
+
+    def _encode_word(self, word: str) -> Tuple[int, ...]:              # word의 token id들. alphabet에 없는 글자는 unk_id
+
+        ids, ranks = self.ids, self.ranks
+        symbols = [ids.get(letter, UNKNOWN) for letter in word]
+        n = len(symbols)
+
+        heap = []
+        for i in range(n - 1):
+            merge = ranks.get(pack(symbols[i], symbols[i + 1]))
+            if merge is not None:
+                heap.append((merge[0], i))
+
+        if heap:
+            heapq.heapify(heap)
+            left_of = list(range(-1, n - 1))
+            right_of = list(range(1, n + 1))
+
+            while heap:
+                rank, i = heapq.heappop(heap)
+                j = right_of[i]
+
+                if j >= n:
+                    continue
+
+                merge = ranks.get(pack(symbols[i], symbols[j]))
+                if merge is None or merge[0] != rank:       # 이미 바뀐 자리 (stale entry)
+                    continue
+
+                symbols[i] = merge[1]
+                symbols[j] = MERGED
+                right_of[i] = right_of[j]
+                if right_of[j] < n:
+                    left_of[right_of[j]] = i
+
+                left, right = left_of[i], right_of[i]       # 새로 생긴 pair들. 이미 지나간 rank의 merge는 적용하지 않는다
+                if left >= 0:
+                    merge = ranks.get(pack(symbols[left], symbols[i]))
+                    if merge is not None and merge[0] > rank:
+                        heapq.heappush(heap, (merge[0], left))
+                if right < n:
+                    merge = ranks.get(pack(symbols[i], symbols[right]))
+                    if merge is not None and merge[0] > rank:
+                        heapq.heappush(heap, (merge[0], i))
+
+        return tuple(self.unk_id if symbol == UNKNOWN else symbol for symbol in symbols if symbol != MERGED)
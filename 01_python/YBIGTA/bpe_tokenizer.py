@@ -1,155 +1,404 @@
-import re
-from typing import List, Optional, Union
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 from .tokenizer import Tokenizer
-from .text_preprocessor import TextPreprocessor
+from .text_preprocessor import TextPreprocessor, count_corpus
+from .bpe_trainer import BPETrainer
+from .sharded_trainer import MIN_SHARD_WORDS, ShardedBPETrainer
+from .bpe_encoder import BPEEncoder
+from .symbol_table import SymbolTable
+from .parallel import count_words, map_shards
+from .serialization import Section, pack_strings, unpack_strings
+from .tensors import PAD, UNK
+from .training_monitor import TrainingMonitor
+from .checkpoint import Checkpointer, read_checkpoint
+from .decoder import Decoder
+from .trie_encoder import EncoderComparison, TrieEncoder
 from collections import defaultdict
+from itertools import islice
+from array import array
+
+ENCODINGS = ('bpe', 'trie')     # 'bpe': merge를 rank 순으로 적용 (학습과 같은 결과), 'trie': vocab에서 greedy longest match (더 빠름, 근사)
+
+class MergeComparison(NamedTuple):          # 두 tokenizer (예: merges_per_round=1과 > 1로 학습한 것)의 merge list가 다른 정도
+    n_merges: int               # 이 tokenizer의 merge 수
+    n_other: int                # 비교한 tokenizer의 merge 수
+    n_common: int               # 두 merge list에 모두 있는 pair 수 (순서 무관)
+    overlap: float              # n_common / max(n_merges, n_other)
+    common_prefix: int          # 처음부터 순서까지 같은 merge 수
+    compression: float          # held-out 문서에서 token 하나 당 글자 수 (클수록 잘 압축)
+    other_compression: float
 
 class BPETokenizer(Tokenizer):
-    def __init__(self, corpus: Optional[Union[List[str], str]] = None):
-        
-        super().__init__(corpus)
-        
+    def __init__(self, corpus: Optional[Union[Iterable[str], str]] = None, cache_size: Optional[int] = 100000, workers: int = 1, encoding: str = 'bpe'):
+
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unsupported encoding: {encoding!r}. Use one of {ENCODINGS}.")
+
         self.word_freqs = defaultdict(int)      # 각 단어마다 frequency가 대응된 dict {word : freq}
-        self.vocab = defaultdict(int)           # 각 pair마다 frequency가 대응된 dict {pair : freq}
-        self.alphabet = []                      # token을 담는 list (alphabet과 merge 된 pair 포함)
-        self.splits = {}                        # 각 단어와 단어의 merged 된 형태가 대응된 dict {word : ['w', 'or', 'd']}
+        self.new_word_freqs = {}                # 마지막 train 이후 add_corpus로 들어온 {word : freq} (다음 train에서 trainer에 더한다)
+        self.train_phases = []                  # 이어서 한 train 마다 (시작할 때의 merge 수, 그때 trainer에 더한 new_word_freqs). resume이 같은 순서로 다시 더한다
+        self.symbols = SymbolTable([PAD, UNK])  # token string <-> id table (alphabet과 merge 된 pair 포함, '<PAD>'는 0, '<UNK>'는 1)
         self.merges = {}                        # pair와 merge 된 string이 대응된 dict {('t', 'h') : 'th'}
-        
-    def compute_word_freqs(self) -> None:           # 각 단어마다 frequency를 계산하는 함수
-                                                    # self.word_freqs, self.alphabet, self.splits를 만든다
-        
-        for sent in self.corpus:
-            
+        self.merge_rounds = array('I')          # 학습한 round 마다 merge 수 (merges_per_round > 1 이면 여러 개). resume이 같은 round로 다시 적용한다
+        self.trainer = None                     # heap 기반 incremental 학습 엔진. 단어들의 split을 symbol id array로 갖고 있다 (get_stats에서 만든다)
+        self.cache_size = cache_size            # encoder의 word -> ids LRU cache 크기 (None이면 제한 없음)
+        self.encoding = encoding                # tokenize에 쓸 encoder 종류 ('bpe' / 'trie')
+        self.encoder = None                     # 단어를 token id들로 쪼개는 encoder (tokenize에서 만든다)
+        self.monitor = None                     # 마지막 train의 phase 별 시간 / merge 속도 (TrainingMonitor)
+
+        super().__init__(corpus, workers)       # corpus가 있으면 add_corpus로 바로 센다
+
+    @property
+    def alphabet(self) -> List[str]:            # token을 담는 list (alphabet과 merge 된 pair 포함)
+        return [token for token in self.symbols.tokens if token not in (PAD, UNK)]
+
+    @property
+    def pad_id(self) -> int:
+        return self.symbols.ids[PAD]
+
+    @property
+    def unk_id(self) -> int:
+        return self.symbols.ids[UNK]
+
+    @property
+    def vocab(self) -> Dict[Tuple[str, str], int]:      # 각 pair마다 frequency가 대응된 dict {pair : freq}
+        if self.trainer is None:
+            return {}
+        tokens = self.symbols.tokens
+        return {(tokens[first], tokens[second]): freq for (first, second), freq in self.trainer.pair_freqs().items()}
+
+    def cache_info(self):                       # encoder cache의 hits / misses / maxsize / currsize
+        return self.get_encoder().cache_info()
+
+    def _load_kwargs(self) -> Dict[str, object]:
+        return {'cache_size': self.cache_size, 'encoding': self.encoding}
+
+    def _build_encoder(self, encoding: str) -> Union[BPEEncoder, TrieEncoder]:
+
+        if encoding == 'trie':
+            return TrieEncoder(self.symbols, self.unk_id, self.cache_size, (self.pad_id, self.unk_id))
+        return BPEEncoder(self.symbols, self.merges, self.unk_id, self.cache_size)
+
+    def get_encoder(self) -> Union[BPEEncoder, TrieEncoder]:
+
+        if self.encoder is None:
+            self.encoder = self._build_encoder(self.encoding)
+        return self.encoder
+
+    def set_encoding(self, encoding: str) -> None:          # 'bpe' / 'trie' 전환
+
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unsupported encoding: {encoding!r}. Use one of {ENCODINGS}.")
+
+        if encoding != self.encoding:
+            self._close_batch_encoder()                     # encode_batch worker들은 이전 encoding으로 load 되어 있다
+            self.encoding = encoding
+            self.encoder = None
+
+    def compare_encoders(self, corpus: Union[List[str], str]) -> EncoderComparison:
+        # corpus의 단어들을 'bpe'와 'trie' 두 encoder로 쪼개서 결과가 얼마나 다른지 return
+
+        word_freqs = defaultdict(int)
+        for sent in TextPreprocessor.preprocess(corpus if isinstance(corpus, list) else [corpus]):
+            for word in sent.split():
+                word_freqs[word] += 1
+
+        bpe, trie = (self._build_encoder(encoding).encode_word for encoding in ENCODINGS)
+
+        n_words = n_different = n_unique_different = bpe_tokens = trie_tokens = 0
+        for word, freq in word_freqs.items():
+            bpe_ids, trie_ids = bpe(word), trie(word)
+            n_words += freq
+            bpe_tokens += len(bpe_ids) * freq
+            trie_tokens += len(trie_ids) * freq
+            if bpe_ids != trie_ids:
+                n_different += freq
+                n_unique_different += 1
+
+        return EncoderComparison(n_words, n_different, n_different / n_words if n_words else 0.0,
+                                 len(word_freqs), n_unique_different, n_unique_different / len(word_freqs) if word_freqs else 0.0,
+                                 bpe_tokens, trie_tokens)
+
+    def compression_ratio(self, corpus: Union[List[str], str]) -> float:     # corpus를 encode 했을 때 token 하나 당 글자 수 (공백 제외)
+
+        n_letters = n_tokens = 0
+        encode_word = self.get_encoder().encode_word
+        for sent in TextPreprocessor.preprocess(corpus if isinstance(corpus, list) else [corpus]):
             for word in sent.split():
-                
-                if word in self.word_freqs:
-                    self.word_freqs[word] += 1
+                n_letters += len(word)
+                n_tokens += len(encode_word(word))
+
+        return n_letters / n_tokens if n_tokens else 0.0
+
+    def compare_merges(self, other: 'BPETokenizer', held_out: Union[List[str], str]) -> MergeComparison:
+        # 두 tokenizer의 merge list가 얼마나 다른지와 held_out 문서에서의 압축률 (예: 근사 학습 vs 정확한 학습)
+
+        merges, other_merges = list(self.merges), list(other.merges)
+        n_common = len(set(merges) & set(other_merges))
+
+        common_prefix = 0
+        for pair, other_pair in zip(merges, other_merges):
+            if pair != other_pair:
+                break
+            common_prefix += 1
+
+        return MergeComparison(len(merges), len(other_merges), n_common, n_common / max(len(merges), len(other_merges), 1),
+                               common_prefix, self.compression_ratio(held_out), other.compression_ratio(held_out))
+
+    def _merge_ids(self) -> array:                 # merge 순서대로 token id 3개씩: first, second, merged
+
+        ids = self.symbols.ids
+
+        merges = array('I')
+        for (first, second), merged in self.merges.items():
+            merges.extend((ids[first], ids[second], ids[merged]))
+
+        return merges
+
+    def _sections(self) -> Dict[str, Section]:     # symbol table + merge
+
+        tokens, token_offsets = pack_strings(self.symbols.tokens)
+        return {'tokens': tokens, 'token_offsets': token_offsets, 'merges': self._merge_ids()}
+
+    def _load_sections(self, sections: Dict[str, memoryview]) -> None:
+        # tokens / merges section을 SymbolTable과 merge dict로 decode 한다 (mmap은 load가 끝나면 닫힌다)
+
+        self.symbols = SymbolTable(unpack_strings(sections['tokens'], sections['token_offsets']))
+        self.symbols.intern(UNK)                # '<UNK>'가 없던 파일이면 제일 뒤에 붙인다
+        tokens = self.symbols.tokens
+
+        merges = sections['merges']
+        self.merges = {(tokens[first], tokens[second]): tokens[merged] for first, second, merged in zip(merges[0::3], merges[1::3], merges[2::3])}
+        self.merge_rounds = array('I')
+        self.encoder = None
+        self.decoder = None
+
+    def add_corpus(self, corpus: Union[Iterable[str], str]) -> None:     # 문서를 chunk 단위로 전처리하고 단어 빈도만 합친다 (원문은 남기지 않는다)
+
+        self.add_word_freqs(*count_corpus(corpus, self.workers))
+
+    def compute_word_freqs(self) -> None:           # 각 단어마다 frequency를 계산하는 함수
+                                                    # self.corpus에 직접 넣은 (전처리된) 문장이 있으면 세서 self.word_freqs, self.symbols에 합치고 비운다
+
+        for word_freqs, alphabet in map_shards(count_words, self.corpus, self.workers):    # shard 별로 센 결과를 순서대로 합친다
+            self.add_word_freqs(word_freqs, alphabet)
+
+        self.corpus = []
+
+    def add_word_freqs(self, word_freqs: Dict[str, int], alphabet: Optional[Iterable[str]] = None) -> None:
+        # 미리 센 {word : freq}와 alphabet (count_corpus / CorpusCache의 결과)을 corpus 대신 추가. 다음 train에서 그대로 쓴다
+        # alphabet이 없으면 단어들에서 처음 등장한 순서대로 만든다
+
+        if alphabet is None:
+            alphabet = dict.fromkeys(letter for word in word_freqs for letter in word)
+
+        new_word_freqs = self.new_word_freqs
+        for word, freq in word_freqs.items():
+            self.word_freqs[word] += freq
+            new_word_freqs[word] = new_word_freqs.get(word, 0) + freq
+
+        for letter in alphabet:
+            self.symbols.intern(letter)
+
+    def add_words(self) -> None:     # 마지막 train 이후 들어온 단어 빈도를 trainer에 더하는 함수
+                                     # 있던 단어는 freq만 늘리고, 새 단어에만 지금까지의 merge를 rank 순으로 적용해서 넣는다 (전체 단어를 다시 쪼개지 않는다)
+
+        if self.trainer is None:     # load 한 tokenizer는 trainer가 없으므로 모든 단어가 새 단어
+            self.trainer = BPETrainer({}, self.symbols)
+
+        encoder = BPEEncoder(self.symbols, self.merges, self.unk_id, cache_size=0)
+        self.trainer.add_words(self.new_word_freqs, encoder._encode_word)
+
+    def _add_new_words(self) -> None:   # add_words 후 new_word_freqs를 train_phases에 옮긴다 (checkpoint가 단어를 더한 시점까지 저장하도록)
+
+        if self.new_word_freqs:
+            self.train_phases.append((len(self.merges), self.new_word_freqs))
+        self.add_words()
+        self.new_word_freqs = {}
+
+    def _train_words(self) -> Tuple[Dict[str, int], List[Tuple[int, Dict[str, int]]]]:
+        # (처음 get_stats에 쓴 {word : freq}, train_phases). 전자는 word_freqs에서 나중에 더한 빈도를 빼서 만든다 (load 한 tokenizer면 비어있다)
+
+        added = defaultdict(int)
+        for word_freqs in [word_freqs for _, word_freqs in self.train_phases] + [self.new_word_freqs]:
+            for word, freq in word_freqs.items():
+                added[word] += freq
+
+        base = {word: freq - added[word] for word, freq in self.word_freqs.items() if freq > added.get(word, 0)}
+        return base, list(self.train_phases)
+
+    def get_stats(self) -> None:     # 각 pair 마다 frequency를 계산하는 함수.
+                                     # pair -> 단어 inverted index와 heap을 가진 self.trainer를 만든다
+                                     # 단어가 충분히 많고 workers > 1 이면 단어 table을 worker process들에 나눠 갖는 ShardedBPETrainer (merge 결과는 같다)
+                                     # (이어서 학습할 수 있도록 worker들은 tokenizer.close() 또는 tokenizer가 없어질 때까지 남는다)
+
+        if self.trainer is not None:     # 이전 trainer의 worker process 정리
+            self.trainer.close()
+
+        n_shards = min(self.workers, len(self.word_freqs) // MIN_SHARD_WORDS)
+
+        if n_shards > 1:
+            self.trainer = ShardedBPETrainer(self.word_freqs, self.symbols, n_shards)
+        else:
+            self.trainer = BPETrainer(self.word_freqs, self.symbols)
+
+    def merge_vocab(self, *pairs: Tuple[str, str]) -> None:    # 인수로 들어온 pair(들)에 대해 merge 하는 과정
+                                                              # pair를 포함하는 단어들만 merge 하고, 바뀐 pair의 freq만 반영 (여러 개면 서로 겹치지 않는 pair들)
+
+        ids = self.symbols.ids
+        self.trainer.merge_many([((ids[first], ids[second]), self.symbols.intern(first + second)) for first, second in pairs])
+
+    def train(self, n_iter: int, monitor: Optional[TrainingMonitor] = None, checkpoint: Optional[Checkpointer] = None, merges_per_round: int = 1) -> None:
+        # merge를 n_iter개 더 학습한다. 이미 학습된 (또는 load 한) tokenizer면 기존 merge 위에 이어서 학습한다
+        # monitor를 주면 phase 별 시간 / merge 속도를 기록하고 monitor.every merge 마다 callback을 부른다 (False를 return 하면 멈춘다)
+        # checkpoint를 주면 학습 상태를 주기적으로 저장한다 (BPETokenizer.resume으로 이어서 학습)
+        # merges_per_round > 1 이면 근사 학습: round 마다 freq 상위 pair 중 서로 symbol을 공유하지 않는 것을 최대 merges_per_round개 한 번에 merge 한다
+        # (그 round에 새로 생긴 token을 포함한 pair는 다음 round에서야 고를 수 있어서 merge list가 정확한 학습과 조금 달라진다. compare_merges로 확인)
+
+        self._close_batch_encoder()                        # 이전 모델을 load 한 encode_batch worker들은 더 이상 쓸 수 없다
+        self.monitor = monitor = monitor if monitor is not None else TrainingMonitor()
+
+        with monitor.phase('compute_word_freqs'):
+            self.compute_word_freqs()
+
+        if not self.merges:                                # 처음 학습
+            with monitor.phase('get_stats'):
+                self.get_stats()
+        else:                                              # 새로 들어온 단어만 trainer에 더하고 이어서 학습
+            with monitor.phase('add_words'):
+                self._add_new_words()
+
+        self.new_word_freqs = {}
+        self._merge_loop(len(self.merges) + n_iter, monitor, checkpoint, merges_per_round)
+
+    @classmethod
+    def resume(cls, path: str, n_iter: int, monitor: Optional[TrainingMonitor] = None, checkpoint: Optional[Checkpointer] = None,
+               merges_per_round: int = 1, **kwargs) -> 'BPETokenizer':
+        # Checkpointer가 저장한 파일에서 학습을 이어간다. n_iter는 처음 train에 준 값과 같은 전체 merge 수, merges_per_round도 처음과 같은 값
+        # 저장된 merge를 같은 순서, 같은 round 단위로 다시 적용하고, 이어서 한 train에서 더한 단어도 같은 시점에 add_words로 더하므로
+        # (pair id 순서까지 같아진다) 끊기지 않은 학습과 같은 merge list가 나온다
+
+        tokenizer = cls(**kwargs)
+        tokenizer.monitor = monitor = monitor if monitor is not None else TrainingMonitor()
+
+        with monitor.phase('resume'):
+            sections = read_checkpoint(path)
+            words = unpack_strings(sections['words'], sections['word_offsets'])
+            tokens = unpack_strings(sections['tokens'], sections['token_offsets'])
+
+            # words는 처음 get_stats에 쓴 단어들 뒤에 train_phases의 단어들이 phase 순서로 붙어있다 (phase 정보가 없는 예전 파일은 전부 처음 단어)
+            phase_sizes = list(sections['phase_words']) if 'phase_words' in sections else []
+            phase_merges = list(sections['phase_merges']) if 'phase_merges' in sections else []
+            entries = zip(words, sections['word_freqs'])
+
+            tokenizer.symbols = SymbolTable(tokens)    # 이어서 학습한 경우 merge 된 token 뒤에 새 글자가 있을 수 있으므로 전부 쓴다
+            tokenizer.word_freqs.update(islice(entries, len(words) - sum(phase_sizes)))
+            tokenizer.get_stats()
+
+            merges = sections['merges']
+            rounds = list(sections['rounds']) if 'rounds' in sections else []
+            rounds[:0] = [1] * (len(merges) // 3 - sum(rounds))     # round를 모르는 앞쪽 merge (load 한 tokenizer에서 이어서 학습한 경우)는 하나씩
+            tokenizer.merge_rounds = array('I', rounds)
+
+            triples = zip(merges[0::3], merges[1::3], merges[2::3])
+            rounds = iter(rounds)
+            for stop, n_words in list(zip(phase_merges, phase_sizes)) + [(len(merges) // 3, None)]:
+                while len(tokenizer.merges) < stop:
+                    round_merges = list(islice(triples, next(rounds)))
+                    for first, second, merged in round_merges:
+                        tokenizer.merges[(tokens[first], tokens[second])] = tokens[merged]
+                    tokenizer.trainer.merge_many([((first, second), tokenizer.symbols.intern(tokens[merged])) for first, second, merged in round_merges])
+
+                if n_words is not None:                # 이 시점에 이어서 한 train이 더한 단어
+                    tokenizer.add_word_freqs(dict(islice(entries, n_words)), ())
+                    tokenizer._add_new_words()
+
+        tokenizer._merge_loop(n_iter, monitor, checkpoint, merges_per_round)
+        return tokenizer
+
+    def _merge_loop(self, n_iter: int, monitor: TrainingMonitor, checkpoint: Optional[Checkpointer], merges_per_round: int = 1) -> None:
+        # 전체 merge 수가 n_iter가 될 때까지 학습
+
+        if merges_per_round < 1:
+            raise ValueError(f"merges_per_round must be positive, got {merges_per_round}.")
+
+        tokens = self.symbols.tokens
+        self.encoder = None                                # merge가 바뀌므로 encoder와 cache를 다시 만든다
+        self.decoder = None                                # decoder는 학습이 끝난 뒤 token table로 다시 만든다
+
+        n_merges = len(self.merges)
+        monitor.start(n_iter, n_merges)
+
+        with monitor.phase('merge'):
+            while n_merges < n_iter:
+
+                if merges_per_round == 1:
+                    best = self.trainer.best_pair()        # freq가 제일 높은 pair (heap에서 꺼낸다)
+                    if best is None:                       # 더 이상 merge 할 pair가 없는 경우
+                        break
+                    round_pairs = [best]
                 else:
-                    self.word_freqs[word] = 1
-                    
-                    for letter in word:                        
-                        
-                        if letter not in self.alphabet:     
-                            self.alphabet.append(letter)
-                    
-                self.splits[word] = ' '.join(word)
-        
-    def get_stats(self) -> None:     # 각 pair 마다 frequency를 계산하는 함수. (self.vocab를 만든다)
-  
-        for word, freq in self.word_freqs.items():
-            
-            split = self.splits[word].split()
-            
-            if len(split) == 1:
-                continue
-            
-            for i in range(len(split) - 1):
-                
-                pair = (split[i], split[i + 1])
-                
-                self.vocab[pair] += freq
-
-                           
-    def merge_vocab(self, pair: List[tuple[str, str]]) -> None:   # 인수로 들어온 pair에 대해 merge 하는 과정
-                                                                  # merge 한 후 새로운 token에 대한 pair를 self.vocab에 저장
-         
-        bigram = re.escape(' '.join(pair))
-        pattern = re.compile(r'\b' + bigram + r'\b')
-        
-        for word in self.word_freqs:
-
-            if len(word) == 1:
-                continue
-            
-            if ' '.join(pair) not in self.splits[word]:         # pair가 word에 없는 경우 - no merge, no self.vocab update
-                continue
-            
-            else:
-
-                self.splits[word] = pattern.sub(''.join(pair), self.splits[word])   # self.splits에서 pair를 합친다
-              
-                list_split = self.splits[word].split()
-                
-                if(''.join(pair) not in list_split): 
-                    continue
-                else: 
-                    idx = list_split.index(''.join(pair))           # split된 word에서 pair의 index 찾기
-                
-                if(idx >= 1):
-                    self.vocab[(list_split[idx - 1], list_split[idx])] += self.word_freqs[word]
-                
-                if idx < len(list_split) - 1:
-                    self.vocab[(list_split[idx], list_split[idx + 1])] += self.word_freqs[word]
-        
-    def train(self, n_iter: int) -> None:
-
-        self.compute_word_freqs()
-        self.get_stats()
-        
-        for _ in range(n_iter):
-            
-            best = max(self.vocab, key=self.vocab.get)     # self.vocab에서 freq가 제일 높은 key 값(pair) 찾기
-            self.merges[best] = ''.join(best)              # self.merges에 추가
-            self.merge_vocab(best)                         # merge_vocab 함수를 통해 self.splits 변경, self.vocab 업데이트
-            self.alphabet.append(''.join(best))            # self.alphabet에 새로운 token 추가
-            self.vocab[best] = 0                           # 각 loop 마다 best 값이 달라져야 하므로 best의 freq를 0으로 변경
-        
-        
-    def tokenize(self, text: Union[List[str], str], padding: bool = False, max_length: Optional[int] = None) -> List[List[int]]:
-       
+                    round_pairs = self.trainer.best_pairs(min(merges_per_round, n_iter - n_merges))
+                    if not round_pairs:
+                        break
+
+                pairs = [(tokens[first], tokens[second]) for first, second in round_pairs]
+                for pair in pairs:
+                    self.merges[pair] = ''.join(pair)      # self.merges에 추가
+                self.merge_vocab(*pairs)                   # merge_vocab 함수를 통해 단어들의 split 변경, pair freq 업데이트 (새로운 token도 self.symbols에 추가)
+
+                n_merges += len(pairs)
+                self.merge_rounds.append(len(pairs))
+                if checkpoint is not None:
+                    checkpoint.step(self, n_merges, len(pairs))
+                if not monitor.step(n_merges, len(tokens), len(pairs)):
+                    break
+
+        monitor.finish(n_merges, len(tokens))
+        if checkpoint is not None:
+            checkpoint.close(self)                # 마지막 상태까지 저장
+
+    def _encode_into(self, ids: array, sent: str, word_positions: Optional[array] = None) -> None:
+
+        encode_word = self.get_encoder().encode_word
+        for word in sent.split():
+            if word_positions is not None:
+                word_positions.append(len(ids))
+            ids.extend(encode_word(word))
+
+    def close(self) -> None:     # encode_batch pool과 trainer의 worker process 정리
+                                 # (ShardedBPETrainer로 학습했다면 close 후에는 이어서 학습할 수 없다. train이 add_words에서 RuntimeError를 낸다)
+        super().close()
+        if self.trainer is not None:
+            self.trainer.close()
+
+    def _decoder(self) -> Decoder:
+        return Decoder(self.symbols.tokens, (self.pad_id, self.unk_id))
+
+    def tokenize(self, text: Union[List[str], str], padding: bool = False, max_length: Optional[int] = None, return_tensors: Optional[str] = None) -> List[List[int]]:
+        # return_tensors='np' 이면 {'input_ids', 'attention_mask', 'offsets'} numpy array dict를 return (alphabet에 없는 글자는 unk_id)
+
         text = TextPreprocessor.preprocess(text)
+
+        if return_tensors is not None:
+            return self._to_tensors(text, return_tensors, max_length)
+
         tokens = []
+        encode_word = self.get_encoder().encode_word
 
-        
         for sent in text:
-            tokenized_sent = []
-            
-            for word in sent.split():
-                
-                if word in self.splits:
-                    tokenized_sent.append(self.splits[word])
-                else:
-                    
-                    word = ' '.join(word)
-                    
-                    for pair, merge in self.merges.items():
-                        
-                        if ' '.join(pair) not in word:
-                            continue
-                        else:
-                            pattern = re.compile(r'\b' + ' '.join(pair) + r'\b')
-                            word = pattern.sub(merge, word)
-                    
-                    tokenized_sent.append(word)
-            
-            tokens.append(tokenized_sent)
-
-        char_to_index = {'<PAD>': 0, **{c: idx + 1 for idx, c in enumerate(self.alphabet)}}
-        
+            tokens.append([encode_word(word) for word in sent.split()])
+
         if isinstance(text, list) and padding:
             max_len = max(len(token) for token in tokens)
-            tokens = [token + ['<PAD>'] * (max_len - len(token)) for token in tokens]
+            tokens = [token + [(self.pad_id,)] * (max_len - len(token)) for token in tokens]
 
         if max_length is not None:
             tokens = [token[:max_length] for token in tokens]
 
-        indices = []                # token_index로 출력하기
-
-        for sent in tokens: 
-            idx_sent = []
-            for token in sent:
-                idx_to_str = ''
-                for i in range(len(token.split())):
-                    c = token.split()[i]
-                    if(c not in char_to_index.keys()):
-                        idx_to_str += '-'
-                    else: 
-                        idx_to_str += str(char_to_index[c])
-                    idx_to_str += ' '
-                
-                idx_sent.append(idx_to_str.strip())
-                
-            indices.append(idx_sent)
-         
+        indices = []                # token_index로 출력하기 (alphabet에 없는 글자는 '-')
+
+        unk_id = self.unk_id
+        for sent in tokens:
+            indices.append([' '.join('-' if idx == unk_id else str(idx) for idx in token) for token in sent])
 
         return indices
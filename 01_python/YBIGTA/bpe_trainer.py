@@ -0,0 +1,232 @@
+import heapq
+from array import array
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .symbol_table import SymbolTable
+
+Pair = Tuple[int, int]
+
+def pack(first: int, second: int) -> int:      # (id, id) pair를 하나의 int key로
+    return (first << 32) | second
+
+def unpack(key: int) -> Pair:
+    return key >> 32, key & 0xFFFFFFFF
+
+class BPETrainer:
+    # pair count를 priority queue(heap)로 관리하고, pair -> 그 pair를 포함하는 단어들의 inverted index를 유지한다.
+    # merge 한 번에 해당 pair가 들어있는 단어들만 다시 쪼개고, 바뀐 pair count만 업데이트한다.
+    #
+    # 단어는 symbol id sequence로 하나의 flat buffer(array('I'))에 들어있다.
+    # word id i의 symbol들은 buf[offsets[i] : offsets[i] + lengths[i]] 이고, merge 하면 lengths[i]만 줄어든다.
+
+    def __init__(self, word_freqs: Dict[str, int], symbols: SymbolTable):
+
+        self.index = {word: word_id for word_id, word in enumerate(word_freqs)}     # word -> word id
+        self.freqs = array('Q', word_freqs.values())                                # word id -> freq
+
+        self.buf = array('I')
+        self.offsets = array('Q')
+        self.lengths = array('I')
+
+        ids = symbols.ids
+        for word in word_freqs:
+            self.offsets.append(len(self.buf))
+            self.lengths.append(len(word))
+            self.buf.extend([ids[letter] for letter in word])
+
+        self.pair_ids = {}                      # pair key -> pair id (pair가 처음 등장한 순서. max(vocab, key=vocab.get)과 같은 tie-break)
+        self.keys = array('Q')                  # pair id -> pair key
+        self.counts = array('q')                # pair id -> freq
+        self.where: List[array] = []            # pair id -> pair를 포함하는 word id들 (append only. 이미 merge 되어 pair가 없어진 단어도 남아있을 수 있다)
+
+        for word_id in range(len(self.lengths)):
+            split = self.word_symbols(word_id)
+            freq = self.freqs[word_id]
+            for key in map(pack, split, split[1:]):
+                pair_id = self._register(key)
+                self.counts[pair_id] += freq
+                self._index(pair_id, word_id)
+
+        self.heap = [(-freq, pair_id) for pair_id, freq in enumerate(self.counts) if freq > 0]   # (-freq, pair id), lazy invalidation
+        heapq.heapify(self.heap)
+
+    def _register(self, key: int) -> int:
+
+        pair_id = self.pair_ids.get(key)
+
+        if pair_id is None:
+            pair_id = len(self.keys)
+            self.pair_ids[key] = pair_id
+            self.keys.append(key)
+            self.counts.append(0)
+            self.where.append(array('I'))
+
+        return pair_id
+
+    def _index(self, pair_id: int, word_id: int) -> None:
+
+        where = self.where[pair_id]
+        if not where or where[-1] != word_id:       # 같은 단어 안에서 연속으로 등장하는 pair는 한 번만
+            where.append(word_id)
+
+    def word_symbols(self, word_id: int) -> array:     # word id의 현재 symbol id들
+
+        start = self.offsets[word_id]
+        return self.buf[start:start + self.lengths[word_id]]
+
+    def pair_freqs(self) -> Dict[Pair, int]:       # {(id, id) : freq} (freq가 0인 pair 제외)
+        return {unpack(key): self.counts[pair_id] for key, pair_id in self.pair_ids.items() if self.counts[pair_id] > 0}
+
+    def best_pair(self) -> Optional[Pair]:      # freq가 제일 높은 pair. 더 이상 merge 할 pair가 없으면 None
+
+        heap, counts = self.heap, self.counts
+
+        while heap:
+            neg_freq, pair_id = heap[0]
+            freq = counts[pair_id]
+
+            if freq == -neg_freq and freq > 0:
+                return unpack(self.keys[pair_id])
+
+            heapq.heappop(heap)                 # stale entry - 현재 freq로 다시 넣는다 (freq는 줄어들기만 하므로 heap 순서가 유지된다)
+            if freq > 0:
+                heapq.heappush(heap, (-freq, pair_id))
+
+        return None
+
+    def best_pairs(self, k: int, window: int = 4) -> List[Pair]:
+        # freq 순으로 최대 k개의 pair. 이미 고른 pair와 symbol을 공유하는 pair는 건너뛴다 (heap에서 최대 k * window개까지 본다)
+        # 고른 pair들은 서로 겹치지 않으므로 어느 순서로 merge 해도 결과가 같고, 한 pair의 merge가 다른 pair의 count를 바꾸지 않는다
+
+        heap, counts, keys = self.heap, self.counts, self.keys
+        pairs, used, skipped = [], set(), []
+
+        while len(pairs) < k and len(pairs) + len(skipped) < k * window:
+            if self.best_pair() is None:            # heap[0]을 유효한 entry로 맞춘다
+                break
+            entry = heapq.heappop(heap)
+            pair = unpack(keys[entry[1]])
+
+            if pair[0] in used or pair[1] in used:
+                skipped.append(entry)
+            else:
+                pairs.append(pair)
+                used.update(pair)
+                skipped.append(entry)               # merge 되면 count가 0이 되어 stale entry로 버려진다
+
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+
+        return pairs
+
+    def merge(self, pair: Pair, new_id: int) -> List[int]:     # pair를 포함하는 단어들만 new_id로 merge 하고, 바뀐 word id들을 return
+        return self.merge_many([(pair, new_id)])
+
+    def merge_many(self, merges: Sequence[Tuple[Pair, int]]) -> List[int]:
+        # 서로 symbol을 공유하지 않는 pair들 (best_pairs의 결과)을 한 번에 merge. 단어마다 한 번만 다시 쪼개고 count도 한 번에 반영한다
+
+        affected, deltas = self.merge_words(merges)
+        self.apply_deltas(deltas)
+        return affected
+
+    def merge_words(self, merges: Sequence[Tuple[Pair, int]]) -> Tuple[List[int], Dict[int, int]]:
+        # 단어들의 split만 바꾸고 (바뀐 word id들, {pair key : count 변화량})을 return. count / heap은 apply_deltas에서 반영한다
+
+        targets, word_ids = {}, set()
+        for (first, second), new_id in merges:
+            pair_id = self.pair_ids.get(pack(first, second))
+            if pair_id is not None:
+                targets[pack(first, second)] = new_id
+                word_ids.update(self.where[pair_id])
+                self.where[pair_id] = array('I')
+
+        if not targets:
+            return [], {}
+
+        firsts = {key >> 32 for key in targets}
+        buf, offsets, lengths, freqs = self.buf, self.offsets, self.lengths, self.freqs
+        deltas = defaultdict(int)
+
+        affected = []
+        for word_id in sorted(word_ids):
+            start = offsets[word_id]
+            split = buf[start:start + lengths[word_id]]
+
+            new_split = []
+            i, n = 0, len(split)
+            while i < n:
+                if i < n - 1 and split[i] in firsts:
+                    new_id = targets.get(pack(split[i], split[i + 1]))
+                    if new_id is not None:
+                        new_split.append(new_id)
+                        i += 2
+                        continue
+                new_split.append(split[i])
+                i += 1
+
+            if len(new_split) == n:             # 이전 merge로 pair가 이미 없어진 단어
+                continue
+
+            freq = freqs[word_id]
+            old_keys = list(map(pack, split, split[1:]))
+            for key in old_keys:
+                deltas[key] -= freq
+
+            old_keys = set(old_keys)
+            for key in map(pack, new_split, new_split[1:]):
+                deltas[key] += freq
+                if key not in old_keys:
+                    self._index(self._register(key), word_id)
+
+            buf[start:start + len(new_split)] = array('I', new_split)
+            lengths[word_id] = len(new_split)
+            affected.append(word_id)
+
+        return affected, deltas
+
+    def add_words(self, word_freqs: Dict[str, int], encode: Callable[[str], Sequence[int]]) -> None:
+        # 학습 중간에 단어 빈도를 더한다. 있던 단어는 freq만 늘고, 새 단어는 encode (지금까지의 merge를 rank 순으로 적용)로 쪼개서 뒤에 붙인다
+        self.apply_deltas(self.insert_words(word_freqs, encode))
+
+    def insert_words(self, word_freqs: Dict[str, int], encode: Callable[[str], Sequence[int]]) -> Dict[int, int]:
+        # add_words에서 split / inverted index만 바꾸고 {pair key : count 변화량}을 return
+
+        buf, offsets, lengths, freqs = self.buf, self.offsets, self.lengths, self.freqs
+        deltas = defaultdict(int)
+
+        for word, freq in word_freqs.items():
+            word_id = self.index.get(word)
+
+            if word_id is None:
+                word_id = self.index[word] = len(freqs)
+                split = array('I', encode(word))
+                freqs.append(0)
+                offsets.append(len(buf))
+                lengths.append(len(split))
+                buf.extend(split)
+                for key in map(pack, split, split[1:]):
+                    self._index(self._register(key), word_id)
+            else:
+                split = self.word_symbols(word_id)
+
+            freqs[word_id] += freq
+            for key in map(pack, split, split[1:]):
+                deltas[key] += freq
+
+        return deltas
+
+    def close(self) -> None:           # 더 이상 학습하지 않을 때 호출. 정리할 resource가 없다 (ShardedBPETrainer는 worker process를 끝낸다)
+        pass
+
+    def apply_deltas(self, deltas: Dict[int, int]) -> None:
+
+        for key, delta in deltas.items():
+            if delta == 0:
+                continue
+
+            changed = self._register(key)
+            self.counts[changed] += delta
+
+            if delta > 0:
+                heapq.heappush(self.heap, (-self.counts[changed], changed))
@@ -0,0 +1,92 @@
+import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .serialization import Section, pack_strings, read_sections, write_sections
+
+KIND = 'BPECheckpoint'
+
+class Checkpointer:
+    # BPETokenizer.train 도중 every merge 또는 seconds 초마다 학습 상태를 path에 저장한다
+    #
+    # 저장하는 것은 단어 빈도 (학습 중에는 바뀌지 않으므로 train 마다 한 번만 pack 한다), token table, 지금까지의 merge와 round 크기 뿐이다.
+    # 단어 빈도는 처음 get_stats에 쓴 것과 이어서 한 train 마다 더한 것 (train_phases)을 나눠서, 더한 시점의 merge 수와 함께 저장한다.
+    # resume은 처음 단어들로 trainer를 다시 만들고 merge를 순서대로, 학습 때와 같은 round 단위로 다시 적용하면서 같은 시점에 단어를 더하므로 pair id와 tie-break까지 똑같아져서
+    # 끊기지 않은 학습과 같은 merge list가 나온다.
+    #
+    # merge loop에서는 merge id array만 복사하고, pack / 파일 쓰기는 background thread 하나에서 한다.
+    # 이전 checkpoint를 아직 쓰고 있으면 이번 것은 건너뛰고 다음 기회에 쓴다 (write_sections가 rename 하므로 파일은 항상 완전하다).
+    # train이 끝날 때 close로 thread와 pack 한 단어를 정리하므로, add_corpus 후 이어서 하는 train에 같은 Checkpointer를 다시 줄 수 있다.
+
+    def __init__(self, path: str, every: Optional[int] = 1000, seconds: Optional[float] = None):
+
+        if every is None and seconds is None:
+            raise ValueError("Checkpointer needs every or seconds.")
+
+        self.path = path
+        self.every = every
+        self.seconds = seconds
+        self.n_saved = 0                        # 실제로 쓴 checkpoint 수
+
+        self._executor: Optional[ThreadPoolExecutor] = None     # 첫 save에서 만든다
+        self._pending: Optional[Future] = None
+        self._words: Optional[Dict[str, Section]] = None
+        self._last_time = time.monotonic()
+
+    def step(self, tokenizer, n_merges: int, n_new: int = 1) -> None:      # merge가 끝날 때마다 호출 (n_new는 이번에 한 merge 수)
+
+        if self.every is not None and n_merges % self.every < n_new:
+            self.save(tokenizer)
+        elif self.seconds is not None and time.monotonic() - self._last_time >= self.seconds:
+            self.save(tokenizer)
+
+    def save(self, tokenizer, wait: bool = False) -> None:
+
+        pending = self._pending
+        if pending is not None:
+            if not pending.done() and not wait:
+                return
+            pending.result()                    # 이전 checkpoint를 쓰다가 난 에러는 여기서 올린다
+
+        self._last_time = time.monotonic()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        snapshot = (tokenizer._train_words() if self._words is None else None, list(tokenizer.symbols.tokens), tokenizer._merge_ids(),
+                    array('I', tokenizer.merge_rounds))
+        self._pending = self._executor.submit(self._write, *snapshot)
+
+        if wait:
+            self._pending.result()
+
+    def _write(self, train_words: Optional[Tuple[Dict[str, int], List[Tuple[int, Dict[str, int]]]]], tokens: list, merges: array, rounds: array) -> None:
+
+        if self._words is None:
+            base, phases = train_words
+            word_freqs = [base] + [phase_words for _, phase_words in phases]
+
+            words, word_offsets = pack_strings([word for phase_words in word_freqs for word in phase_words])
+            self._words = {'words': words, 'word_offsets': word_offsets,
+                           'word_freqs': array('Q', [freq for phase_words in word_freqs for freq in phase_words.values()]),
+                           'phase_words': array('Q', [len(phase_words) for _, phase_words in phases]),
+                           'phase_merges': array('Q', [n_merges for n_merges, _ in phases])}
+
+        symbols, symbol_offsets = pack_strings(tokens)
+        write_sections(self.path, KIND, {**self._words, 'tokens': symbols, 'token_offsets': symbol_offsets, 'merges': merges, 'rounds': rounds})
+        self.n_saved += 1
+
+    def close(self, tokenizer=None) -> None:       # tokenizer를 주면 마지막 상태를 저장한 뒤 thread를 정리한다 (다음 save는 새로 시작한다)
+
+        if tokenizer is not None:
+            self.save(tokenizer, wait=True)
+        elif self._pending is not None:
+            self._pending.result()
+
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._executor = None
+        self._pending = None
+        self._words = None                      # 다음 train 전에 add_corpus로 단어가 늘 수 있다
+
+def read_checkpoint(path: str) -> Dict[str, memoryview]:
+    return read_sections(path, KIND)
@@ -0,0 +1,104 @@
+import hashlib
+import inspect
+import json
+import os
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import text_preprocessor
+from .serialization import pack_strings, read_sections, unpack_strings, write_sections
+
+KIND = 'CorpusCache'
+CACHE_VERSION = 1               # cache 파일 구조가 바뀌면 올린다
+CHUNK = 1 << 20
+INDEX = 'files.json'            # {path : [size, mtime_ns, sha256]}. 바뀌지 않은 파일은 다시 hash 하지 않는다
+
+def _preprocess_signature() -> str:        # 전처리 코드가 바뀌면 key도 바뀌도록 text_preprocessor 소스 전체를 hash 한다
+    return hashlib.sha256(inspect.getsource(text_preprocessor).encode('utf-8')).hexdigest()
+
+class CorpusCache:
+    # 전처리 + 단어 세기 결과 ({word : freq}, alphabet)를 입력 파일 내용과 설정의 sha256으로 저장하는 disk cache
+    #
+    #   key   : sha256(CACHE_VERSION, 입력 파일들의 sha256, 전처리 코드, settings)
+    #   entry : cache_dir/<key>.ybtk (serialization format)
+    #
+    # 입력 파일이나 전처리 코드, settings 중 하나라도 바뀌면 key가 달라져서 예전 entry는 더 이상 읽히지 않고,
+    # put 할 때 최근에 쓴 max_entries개만 남기고 지운다.
+
+    def __init__(self, cache_dir: str = '.ybigta_cache', max_entries: int = 8):
+
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.ybtk')
+
+    def file_hash(self, path: str) -> str:         # 파일 내용의 sha256. size / mtime이 그대로면 index에 저장된 값을 쓴다
+
+        index_path = os.path.join(self.cache_dir, INDEX)
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+
+        stat = os.stat(path)
+        real_path = os.path.realpath(path)
+        size, mtime_ns, digest = index.get(real_path, (None, None, None))
+
+        if (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(CHUNK), b''):
+                    sha.update(block)
+            digest = sha.hexdigest()
+
+            index[real_path] = [stat.st_size, stat.st_mtime_ns, digest]
+            tmp_path = f'{index_path}.tmp{os.getpid()}'
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f)
+            os.replace(tmp_path, index_path)
+
+        return digest
+
+    def key(self, paths: Iterable[str], **settings) -> str:     # 입력 파일들 + 전처리 코드 + settings (n_corpus 등)의 sha256
+
+        sha = hashlib.sha256(f'{KIND}:{CACHE_VERSION}:{_preprocess_signature()}'.encode())
+        for path in paths:
+            sha.update(self.file_hash(path).encode())
+        sha.update(json.dumps(settings, sort_keys=True).encode())
+        return sha.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, int], List[str]]]:     # ({word : freq}, alphabet). 없으면 None
+
+        path = self._path(key)
+        try:
+            sections = read_sections(path, KIND)
+        except (OSError, ValueError):           # 없거나 깨진 entry
+            return None
+
+        os.utime(path)                          # 최근에 쓴 entry로 표시 (prune 순서)
+        words = unpack_strings(sections['words'], sections['word_offsets'])
+        word_freqs = dict(zip(words, sections['word_freqs']))
+        alphabet = unpack_strings(sections['alphabet'], sections['alphabet_offsets'])
+
+        return word_freqs, alphabet
+
+    def put(self, key: str, word_freqs: Dict[str, int], alphabet: List[str]) -> None:
+
+        words, word_offsets = pack_strings(list(word_freqs))
+        letters, letter_offsets = pack_strings(alphabet)
+        write_sections(self._path(key), KIND, {
+            'words': words, 'word_offsets': word_offsets, 'word_freqs': array('Q', word_freqs.values()),
+            'alphabet': letters, 'alphabet_offsets': letter_offsets,
+        })
+        self.prune()
+
+    def prune(self) -> None:           # 최근에 쓴 max_entries개만 남긴다
+
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.ybtk')]
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns, reverse=True)
+
+        for entry in entries[self.max_entries:]:
+            os.remove(entry.path)
@@ -0,0 +1,69 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+class Decoder:
+    # token id -> string table. 학습 / load가 끝난 tokenizer의 token list로 한 번 만들고 바꾸지 않는다
+    #
+    # table[i]는 id i의 token, table[i + size]는 앞에 공백이 붙은 token (단어의 첫 token)이라서
+    # 단어 경계 (word_starts)가 있으면 id + size * word_start 로 index 한 token들을 ''.join 하기만 하면 된다.
+    # word_level이면 (WordTokenizer) 모든 token이 단어이므로 항상 공백으로 구분한다.
+
+    def __init__(self, tokens: Sequence[str], special_ids: Iterable[int] = (), word_level: bool = False):
+
+        self.size = len(tokens)
+        self.word_level = word_level
+        self.table = list(tokens) + [' ' + token for token in tokens]
+
+        self.skip_table = list(self.table)      # skip_special_tokens=True 일 때 쓰는 table
+        for idx in special_ids:
+            self.skip_table[idx] = self.skip_table[idx + self.size] = ''
+
+        self._np_tables = None
+
+    def decode(self, ids: Sequence[int], word_starts: Optional[Sequence[int]] = None, skip_special_tokens: bool = False) -> str:
+        # 문장 하나의 id들을 string으로. word_starts (ids와 같은 길이, 단어의 첫 token이면 1)가 없으면 BPE token은 공백 없이 이어붙인다
+
+        table = self.skip_table if skip_special_tokens else self.table
+        ids = [int(idx) for idx in ids]
+
+        if self.word_level:
+            return ' '.join(filter(None, map(table.__getitem__, ids)))
+
+        if word_starts is not None:
+            size = self.size
+            ids = [idx + size * bool(start) for idx, start in zip(ids, word_starts)]
+
+        return ''.join(map(table.__getitem__, ids)).lstrip(' ')
+
+    def decode_batch(self, ids: Union[Sequence[Sequence[int]], 'numpy.ndarray', Dict[str, 'numpy.ndarray']],
+                     attention_mask: Optional['numpy.ndarray'] = None, word_starts: Optional['numpy.ndarray'] = None,
+                     skip_special_tokens: bool = False) -> List[str]:
+        # 여러 문장을 한 번에 decode. tokenize(return_tensors='np')의 결과 dict를 그대로 넣어도 된다
+        # 2차원 numpy array는 table을 numpy로 index 해서 한 번에 token string으로 바꾼 뒤 문장마다 join 한다
+
+        if isinstance(ids, dict):
+            attention_mask = ids.get('attention_mask') if attention_mask is None else attention_mask
+            word_starts = ids.get('word_starts') if word_starts is None else word_starts
+            ids = ids['input_ids']
+
+        if not hasattr(ids, 'ndim'):
+            if word_starts is None:
+                return [self.decode(sent, None, skip_special_tokens) for sent in ids]
+            return [self.decode(sent, starts, skip_special_tokens) for sent, starts in zip(ids, word_starts)]
+
+        import numpy as np
+
+        if self._np_tables is None:
+            self._np_tables = (np.array(self.table, dtype=object), np.array(self.skip_table, dtype=object))
+        table = self._np_tables[skip_special_tokens]
+
+        index = ids.astype(np.int64)
+        if self.word_level:
+            index = index + self.size
+        elif word_starts is not None:
+            index = index + self.size * (word_starts != 0)
+
+        pieces = table[index]
+        keep = np.ones(ids.shape, dtype=bool) if attention_mask is None else attention_mask.astype(bool)
+
+        rows = np.split(pieces[keep], np.cumsum(keep.sum(axis=1))[:-1])
+        return [''.join(row).lstrip(' ') for row in rows]
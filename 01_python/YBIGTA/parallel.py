@@ -0,0 +1,67 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+MIN_SHARD_SIZE = 1000           # shard 하나에 들어갈 최소 문장 수 (이보다 작으면 process를 띄우는 비용이 더 크다)
+
+def split_shards(items: Sequence[T], n_shards: int) -> List[Sequence[T]]:      # 순서를 유지한 채 연속된 n_shards개의 조각으로 나눈다
+
+    size, rest = divmod(len(items), n_shards)
+    shards, start = [], 0
+
+    for i in range(n_shards):
+        end = start + size + (1 if i < rest else 0)
+        shards.append(items[start:end])
+        start = end
+
+    return shards
+
+def map_shards(func: Callable[[Sequence[T]], R], items: Sequence[T], workers: int = 1, min_shard_size: int = MIN_SHARD_SIZE) -> List[R]:
+    # items를 shard로 나눠 process pool에서 func를 실행하고, 결과를 shard 순서대로 return 하는 함수
+    # workers가 1이거나 items가 작으면 process 없이 한 번에 처리한다 (결과는 shard 하나짜리 list)
+
+    n_shards = min(workers, len(items) // min_shard_size)
+
+    if n_shards <= 1:
+        return [func(items)]
+
+    with ProcessPoolExecutor(max_workers=n_shards) as pool:
+        return list(pool.map(func, split_shards(items, n_shards)))
+
+def imap_chunks(func: Callable[[List[T]], R], items: Iterable[T], workers: int = 1, chunk_size: int = MIN_SHARD_SIZE) -> Iterator[R]:
+    # items를 chunk_size개씩 읽어 process pool에서 func를 실행하고, 결과를 chunk 순서대로 yield 하는 generator
+    # 한 번에 읽어두는 chunk는 workers * 2개까지라서 items가 아무리 커도 메모리는 일정하다
+
+    items = iter(items)
+    chunks = iter(lambda: list(islice(items, chunk_size)), [])
+
+    if workers <= 1:
+        yield from map(func, chunks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+def count_words(corpus: Sequence[str]) -> Tuple[Dict[str, int], List[str]]:     # shard 하나의 {word : freq}와 alphabet (둘 다 처음 등장한 순서)
+
+    word_freqs = {}
+
+    for sent in corpus:
+        for word in sent.split():
+            word_freqs[word] = word_freqs.get(word, 0) + 1
+
+    alphabet = dict.fromkeys(letter for word in word_freqs for letter in word)
+
+    return word_freqs, list(alphabet)
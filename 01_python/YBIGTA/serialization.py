@@ -0,0 +1,113 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, List, Sequence, Tuple, Union
+
+# 학습된 tokenizer를 저장하는 binary format (little endian)
+#
+#   header  : magic 'YBTK' | version u16 | kind (16 bytes) | section 개수 u32
+#   section : name (16 bytes) | typecode (1 byte) | offset u64 | nbytes u64
+#   data    : 각 section의 raw array. 8 byte 단위로 정렬되어 있어서 mmap 위에서 바로 memoryview.cast 할 수 있다
+#
+# string list는 utf-8로 이어붙인 blob과 글자 단위 offset array ('Q', n + 1개) 두 section으로 저장한다.
+
+MAGIC = b'YBTK'
+VERSION = 1
+ALIGN = 8
+
+HEADER = struct.Struct('<4sH16sI')
+ENTRY = struct.Struct('<16scQQ')
+
+Section = Union[array, bytes]
+
+def _pad(n: int) -> int:
+    return -n % ALIGN
+
+def pack_strings(strings: Sequence[str]) -> Tuple[bytes, array]:      # string list -> (utf-8 blob, 글자 offset array)
+
+    offsets = array('Q', [0])
+    total = 0
+    for string in strings:
+        total += len(string)
+        offsets.append(total)
+
+    return ''.join(strings).encode('utf-8'), offsets
+
+def unpack_strings(blob: Union[bytes, memoryview], offsets: Sequence[int]) -> List[str]:     # pack_strings의 반대. blob을 한 번에 decode 한 뒤 잘라낸다
+
+    text = str(blob, 'utf-8')
+    return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+def write_sections(path: str, kind: str, sections: Dict[str, Section]) -> None:
+    # sections를 path에 저장한다. 임시 파일에 쓴 뒤 rename 하므로 다른 process가 읽고 있어도 안전하다
+
+    entries = []
+    offset = HEADER.size + ENTRY.size * len(sections)
+    offset += _pad(offset)
+
+    for name, data in sections.items():
+        if isinstance(data, array):
+            typecode, nbytes = data.typecode.encode(), data.itemsize * len(data)
+        else:
+            typecode, nbytes = b'B', len(data)
+        entries.append((name, typecode, offset, nbytes, data))
+        offset += nbytes + _pad(nbytes)
+
+    tmp_path = f'{path}.tmp{os.getpid()}'
+
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, kind.encode(), len(entries)))
+        for name, typecode, offset, nbytes, _ in entries:
+            f.write(ENTRY.pack(name.encode(), typecode, offset, nbytes))
+
+        for _, _, offset, nbytes, data in entries:
+            f.write(b'\0' * (offset - f.tell()))
+            if isinstance(data, array) and sys.byteorder != 'little':
+                data = array(data.typecode, data)
+                data.byteswap()
+            f.write(data)
+
+    os.replace(tmp_path, path)
+
+def read_sections(path: str, kind: str) -> Dict[str, memoryview]:
+    # path를 mmap 해서 {section name : memoryview}를 return 한다 (section을 읽을 때 파일 전체를 복사하지 않는다)
+    # mmap은 memoryview가 남아 있는 동안만 유지된다. memoryview를 list / dict로 바꾸는 쪽은 process마다 자기 사본을 갖는다
+
+    with open(path, 'rb') as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(buf)
+    if len(view) < HEADER.size:
+        raise ValueError(f"{path} is not a YBIGTA tokenizer file.")
+    magic, version, stored_kind, n_sections = HEADER.unpack_from(view)
+
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a YBIGTA tokenizer file.")
+    if version > VERSION:
+        raise ValueError(f"{path} was written by a newer version (format {version} > {VERSION}).")
+    stored_kind = stored_kind.rstrip(b'\0').decode()
+    if stored_kind != kind:
+        raise ValueError(f"{path} holds a {stored_kind}, not a {kind}.")
+
+    if HEADER.size + n_sections * ENTRY.size > len(view):
+        raise ValueError(f"{path} is truncated.")
+
+    sections = {}
+    for i in range(n_sections):
+        name, typecode, offset, nbytes = ENTRY.unpack_from(view, HEADER.size + i * ENTRY.size)
+        if offset + nbytes > len(view):
+            raise ValueError(f"{path} is truncated.")
+        data = view[offset:offset + nbytes]
+
+        if typecode != b'B':
+            data = data.cast(typecode.decode())
+            if sys.byteorder != 'little':
+                swapped = array(typecode.decode(), data)
+                swapped.byteswap()
+                data = memoryview(swapped)
+
+        sections[name.rstrip(b'\0').decode()] = data
+
+    return sections
@@ -0,0 +1,286 @@
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# 학습된 tokenizer를 한 번 load 해서 local TCP / Unix socket으로 encode 요청을 받는 asyncio server와 client
+#
+# protocol : 한 줄에 JSON 하나 (utf-8, '\n'으로 끝난다). 한 connection에서 여러 요청을 응답을 기다리지 않고 보낼 수 있다
+#   요청 {"id": 1, "op": "encode", "text": "..."}   -> 응답 {"id": 1, "ids": [...]}
+#   요청 {"id": 2, "op": "stats"}                    -> 응답 {"id": 2, "stats": {...}}
+#   잘못된 요청                                       -> 응답 {"id": ..., "error": "..."}
+
+MAX_BATCH_SIZE = 64
+MAX_WAIT_MS = 5.0
+LATENCY_WINDOW = 10000          # p50 / p99를 계산할 최근 요청 수
+LINE_LIMIT = 1 << 24            # 요청 한 줄의 최대 크기 (bytes)
+
+def percentile(values: List[float], q: float) -> float:        # nearest-rank percentile (values는 정렬되어 있어야 한다)
+
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values))) - 1))]
+
+class TokenizerService:
+    # 동시에 들어온 encode 요청들을 queue에 모았다가 max_batch_size개가 되거나 첫 요청 후 max_wait_ms가 지나면
+    # 한 번에 tokenizer.encode_batch로 보내는 micro-batching server
+    # encode는 event loop 밖의 thread 하나에서 돌고 (tokenizer.workers > 1 이면 그 안에서 encode_batch의 process pool을 쓴다),
+    # 그동안 event loop는 다음 요청들을 계속 받는다.
+
+    def __init__(self, tokenizer, max_batch_size: int = MAX_BATCH_SIZE, max_wait_ms: float = MAX_WAIT_MS):
+
+        self.tokenizer = tokenizer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self.queue = deque()                    # (text, future, 들어온 시각)
+        self._ready: Optional[asyncio.Event] = None     # queue가 비어있지 않으면 set
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.server = None
+        self._batcher = None
+
+        self.latencies = deque(maxlen=LATENCY_WINDOW)     # 요청이 queue에 들어온 뒤 결과가 나올 때까지 (초)
+        self.n_requests = 0
+        self.n_batches = 0
+        self.max_queue_depth = 0
+
+    def stats(self) -> Dict[str, Any]:
+
+        latencies = sorted(self.latencies)
+        return {
+            'requests': self.n_requests,
+            'batches': self.n_batches,
+            'mean_batch_size': self.n_requests / self.n_batches if self.n_batches else 0.0,
+            'queue_depth': len(self.queue),
+            'max_queue_depth': self.max_queue_depth,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+        }
+
+    async def encode(self, text: str) -> List[int]:    # 요청 하나를 queue에 넣고 batch 결과를 기다린다
+
+        future = asyncio.get_running_loop().create_future()
+        self.queue.append((text, future, time.perf_counter()))
+        self.max_queue_depth = max(self.max_queue_depth, len(self.queue))
+        self._ready.set()
+        return await future
+
+    async def _run_batches(self) -> None:
+
+        loop = asyncio.get_running_loop()
+        queue, ready = self.queue, self._ready
+
+        while True:
+            await ready.wait()
+            deadline = loop.time() + self.max_wait
+
+            while len(queue) < self.max_batch_size:     # 첫 요청 후 max_wait 동안 더 모은다
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                ready.clear()
+                try:
+                    await asyncio.wait_for(ready.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [queue.popleft() for _ in range(min(len(queue), self.max_batch_size))]
+            if queue:
+                ready.set()
+            else:
+                ready.clear()
+
+            texts = [text for text, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self.tokenizer.encode_batch, texts)
+            except Exception:                   # batch가 실패하면 하나씩 다시 encode 해서 실패한 요청에만 에러를 돌려준다
+                results = await loop.run_in_executor(self.executor, self._encode_each, texts)
+
+            now = time.perf_counter()
+            self.n_batches += 1
+            self.n_requests += len(batch)
+            for (_, future, start), ids in zip(batch, results):
+                self.latencies.append(now - start)
+                if future.done():
+                    continue
+                if isinstance(ids, Exception):
+                    future.set_exception(ids)
+                else:
+                    future.set_result(ids)
+
+    def _encode_each(self, texts: List[str]) -> List[Any]:     # 문서마다 따로 encode -> token id list 또는 그 문서에서 난 exception
+
+        results = []
+        for text in texts:
+            try:
+                results.append(self.tokenizer.encode_batch([text])[0])
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def _respond(self, writer: asyncio.StreamWriter, request: Dict[str, Any]) -> None:
+
+        response = {'id': request.get('id')}
+        try:
+            op = request.get('op')
+            if op == 'encode':
+                text = request.get('text')
+                if not isinstance(text, str):        # batch에 들어가기 전에 거른다 (같은 batch의 다른 요청까지 실패하지 않게)
+                    raise TypeError(f"'text' must be a string, not {type(text).__name__}")
+                response['ids'] = await self.encode(text)
+            elif op == 'stats':
+                response['stats'] = self.stats()
+            else:
+                raise ValueError(f"Unknown op: {op!r}")
+        except Exception as e:
+            response['error'] = f"{type(e).__name__}: {e}"
+
+        if not writer.is_closing():
+            writer.write(json.dumps(response).encode() + b'\n')
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    writer.write(json.dumps({'id': None, 'error': f"Invalid JSON: {e}"}).encode() + b'\n')
+                    continue
+
+                task = asyncio.ensure_future(self._respond(writer, request))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.gather(*pending)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0, path: Optional[str] = None) -> None:
+        # path를 주면 Unix socket, 아니면 TCP (port=0이면 빈 port를 골라 self.address에 남긴다)
+
+        self._ready = asyncio.Event()
+        self._batcher = asyncio.ensure_future(self._run_batches())
+
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle, path, limit=LINE_LIMIT)
+            self.address = path
+        else:
+            self.server = await asyncio.start_server(self._handle, host, port, limit=LINE_LIMIT)
+            self.address = self.server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+        self.executor.shutdown(wait=False)
+
+class TokenizerClient:
+    # TokenizerService에 붙는 asyncio client. connection 하나로 여러 요청을 동시에 보낼 수 있다 (응답은 id로 짝을 맞춘다)
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count()
+        self.pending: Dict[int, asyncio.Future] = {}
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 8765, path: Optional[str] = None) -> 'TokenizerClient':
+
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        return cls(reader, writer)
+
+    async def _receive(self) -> None:
+
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self.pending.pop(response.get('id'), None)
+                if future is None or future.done():
+                    continue
+                if 'error' in response:
+                    future.set_exception(RuntimeError(response['error']))
+                else:
+                    future.set_result(response)
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Tokenizer service closed the connection."))
+            self.pending.clear()
+
+    async def _request(self, op: str, **fields) -> Dict[str, Any]:
+
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+
+        self.writer.write(json.dumps({'id': request_id, 'op': op, **fields}).encode() + b'\n')
+        await self.writer.drain()
+        return await future
+
+    async def encode(self, text: str) -> List[int]:        # 문서 하나의 flat token id list (encode_batch와 같은 결과)
+        return (await self._request('encode', text=text))['ids']
+
+    async def stats(self) -> Dict[str, Any]:               # server의 요청 수 / batch 크기 / queue depth / p50, p99 latency
+        return (await self._request('stats'))['stats']
+
+    async def close(self) -> None:
+
+        self.writer.close()
+        await self.writer.wait_closed()
+        self._receiver.cancel()
+
+def _load_tokenizer(path: str, kind: str, workers: int):
+
+    from . import BPETokenizer, WordTokenizer
+    cls = {'BPETokenizer': BPETokenizer, 'WordTokenizer': WordTokenizer}[kind]
+    return cls.load(path, workers=workers)
+
+async def _main(args: argparse.Namespace) -> None:
+
+    service = TokenizerService(_load_tokenizer(args.model, args.kind, args.workers), args.max_batch_size, args.max_wait_ms)
+    await service.start(args.host, args.port, args.path)
+    print(f"serving {args.kind} from {args.model} on {service.address}", flush=True)
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+        service.tokenizer.close()
+
+if __name__ == "__main__":
+    # 01_python 폴더에서: python -m YBIGTA.service -m tokenizer.ybtk -p 8765
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-m", "--model", type=str, required=True)                 # Tokenizer.save로 저장한 파일
+    parser.add_argument("-k", "--kind", type=str, default="BPETokenizer", choices=["BPETokenizer", "WordTokenizer"])
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=8765)
+    parser.add_argument("-u", "--path", type=str, default=None)                   # Unix socket 경로 (주면 TCP 대신)
+    parser.add_argument("-b", "--max_batch_size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("-t", "--max_wait_ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("-w", "--workers", type=int, default=1)                   # encode_batch process 수
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,174 @@
+import bisect
+import heapq
+import multiprocessing
+import weakref
+from array import array
+from collections import defaultdict
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from .bpe_trainer import BPETrainer, Pair
+from .parallel import split_shards
+from .symbol_table import SymbolTable
+
+MIN_SHARD_WORDS = 50000         # shard 하나의 최소 단어 수 (이보다 작으면 merge 마다 주고받는 비용이 더 크다)
+
+def _shard_worker(conn, word_freqs: Dict[str, int], tokens: List[str]) -> None:
+    # 단어 table의 한 조각을 BPETrainer로 들고 있는 worker process
+    #   ('merge', merges)                 -> 자기 단어들만 merge 하고 (새로 본 pair key들, count 변화량, 바뀐 word id들)을 보낸다
+    #   ('add', word_freqs, splits)       -> 단어 빈도를 더하고 (새 단어는 splits의 split으로) (새로 본 pair key들, count 변화량)을 보낸다
+
+    trainer = BPETrainer(word_freqs, SymbolTable(tokens))
+    trainer.heap = []                       # best pair는 coordinator가 고른다
+    conn.send((trainer.keys, trainer.counts))
+
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+
+        n_keys = len(trainer.keys)
+
+        if message[0] == 'merge':
+            affected, deltas = trainer.merge_words(message[1])
+            conn.send((trainer.keys[n_keys:], array('Q', deltas.keys()), array('q', deltas.values()), array('I', affected)))
+        else:
+            _, word_freqs, splits = message
+            deltas = trainer.insert_words(word_freqs, splits.__getitem__)
+            conn.send((trainer.keys[n_keys:], array('Q', deltas.keys()), array('q', deltas.values())))
+
+    conn.close()
+
+class ShardedBPETrainer(BPETrainer):
+    # 단어 table을 연속된 n_shards개의 조각으로 나눠 worker process들이 각자 split / inverted index를 들고 있는 BPETrainer
+    #
+    # coordinator (이 객체)는 전체 pair count와 heap만 갖고 best pair를 고른 뒤 모든 worker에 merge를 보낸다.
+    # worker들은 count 변화량과 새로 본 pair key들만 돌려준다.
+    # 새 pair는 shard 순서 -> shard 안에서 처음 본 순서로 pair id를 받으므로 단어를 순서대로 훑는 BPETrainer와 pair id,
+    # tie-break가 같고, 따라서 merge 결과도 single process 학습과 똑같다.
+
+    def __init__(self, word_freqs: Dict[str, int], symbols: SymbolTable, n_shards: int):
+
+        ctx = multiprocessing.get_context()
+        self.conns, self.processes, self.starts = [], [], []
+
+        start = 0
+        for shard in split_shards(list(word_freqs.items()), n_shards):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=_shard_worker, args=(child, dict(shard), list(symbols.tokens)), daemon=True)
+            process.start()
+            child.close()
+
+            self.conns.append(parent)
+            self.processes.append(process)
+            self.starts.append(start)               # shard의 첫 단어의 word id
+            start += len(shard)
+
+        self._finalizer = weakref.finalize(self, ShardedBPETrainer._shutdown, self.conns, self.processes)
+        self.index = {word: word_id for word_id, word in enumerate(word_freqs)}     # word -> word id (shard를 찾는 데 쓴다)
+
+        self.pair_ids = {}
+        self.keys = array('Q')
+        self.counts = array('q')
+
+        for conn in self.conns:                     # shard 순서대로 pair를 등록하고 count를 합친다
+            keys, counts = conn.recv()
+            for key, count in zip(keys, counts):
+                self.counts[self._register(key)] += count
+
+        self.heap = [(-freq, pair_id) for pair_id, freq in enumerate(self.counts) if freq > 0]
+        heapq.heapify(self.heap)
+
+    def _register(self, key: int) -> int:          # coordinator는 inverted index (where)를 갖지 않는다
+
+        pair_id = self.pair_ids.get(key)
+
+        if pair_id is None:
+            pair_id = len(self.keys)
+            self.pair_ids[key] = pair_id
+            self.keys.append(key)
+            self.counts.append(0)
+
+        return pair_id
+
+    def _check_open(self) -> None:
+
+        if not self._finalizer.alive:
+            raise RuntimeError("ShardedBPETrainer is closed; its worker processes have exited.")
+
+    def merge_many(self, merges: Sequence[Tuple[Pair, int]]) -> List[int]:     # 한 round의 merge들을 message 한 번으로 보낸다
+
+        self._check_open()
+        merges = list(merges)
+        for conn in self.conns:                     # 모든 shard가 동시에 merge 한다
+            conn.send(('merge', merges))
+
+        deltas = defaultdict(int)
+        affected = []
+
+        for conn, start in zip(self.conns, self.starts):
+            new_keys, keys, values, words = conn.recv()
+            for key in new_keys:
+                self._register(key)
+            for key, delta in zip(keys, values):
+                deltas[key] += delta
+            affected.extend(start + word_id for word_id in words)
+
+        self.apply_deltas(deltas)
+        return affected
+
+    def add_words(self, word_freqs: Dict[str, int], encode: Callable[[str], Sequence[int]]) -> None:
+        # 있던 단어는 그 단어를 가진 shard로, 새 단어는 split과 함께 마지막 shard로 보낸다
+        # (새 단어가 단어 table 맨 뒤에 붙는 것은 BPETrainer.add_words와 같으므로 pair id 순서도 같다)
+
+        self._check_open()
+        shard_freqs = [{} for _ in self.conns]
+        splits = {}
+
+        for word, freq in word_freqs.items():
+            word_id = self.index.get(word)
+            if word_id is None:
+                self.index[word] = len(self.index)
+                splits[word] = array('I', encode(word))
+                shard_freqs[-1][word] = freq
+            else:
+                shard_freqs[bisect.bisect_right(self.starts, word_id) - 1][word] = freq
+
+        for i, (conn, freqs) in enumerate(zip(self.conns, shard_freqs)):
+            conn.send(('add', freqs, splits if i == len(self.conns) - 1 else {}))
+
+        deltas = defaultdict(int)
+        for conn in self.conns:
+            new_keys, keys, values = conn.recv()
+            for key in new_keys:
+                self._register(key)
+            for key, delta in zip(keys, values):
+                deltas[key] += delta
+
+        self.apply_deltas(deltas)
+
+    def insert_words(self, word_freqs: Dict[str, int], encode: Callable[[str], Sequence[int]]):
+        raise NotImplementedError("ShardedBPETrainer keeps the word splits in its worker processes.")
+
+    def merge_words(self, merges: Sequence[Tuple[Pair, int]]):
+        raise NotImplementedError("ShardedBPETrainer keeps the word splits in its worker processes.")
+
+    def word_symbols(self, word_id: int):
+        raise NotImplementedError("ShardedBPETrainer keeps the word splits in its worker processes.")
+
+    @staticmethod
+    def _shutdown(conns: Sequence, processes: Sequence) -> None:
+
+        for conn in conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    def close(self) -> None:           # worker process 정리 (close 한 뒤에도 pair count / best_pair는 그대로 쓸 수 있다)
+        self._finalizer()
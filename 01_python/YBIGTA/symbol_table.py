@@ -0,0 +1,39 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+class SymbolTable:
+    # token string <-> int id를 interning 하는 table
+    # id는 처음 intern 된 순서대로 0, 1, 2, ... 가 붙는다 (special token이 제일 앞)
+
+    def __init__(self, specials: Iterable[str] = ()):
+
+        self.tokens: List[str] = []             # id -> token
+        self.ids: Dict[str, int] = {}           # token -> id
+
+        for token in specials:
+            self.intern(token)
+
+    def intern(self, token: str) -> int:        # token의 id. 처음 보는 token이면 새 id를 붙인다
+
+        idx = self.ids.get(token)
+
+        if idx is None:
+            idx = len(self.tokens)
+            self.ids[token] = idx
+            self.tokens.append(token)
+
+        return idx
+
+    def id_of(self, token: str, default: Optional[int] = None) -> Optional[int]:
+        return self.ids.get(token, default)
+
+    def token_of(self, idx: int) -> str:
+        return self.tokens[idx]
+
+    def __contains__(self, token: str) -> bool:
+        return token in self.ids
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tokens)
@@ -0,0 +1,54 @@
+from array import array
+from typing import Dict, Optional
+
+PAD = '<PAD>'
+UNK = '<UNK>'
+
+def to_tensors(ids: array, offsets: array, max_length: Optional[int] = None, pad_id: int = 0, word_positions: Optional[array] = None) -> Dict[str, 'numpy.ndarray']:
+    # 문장들의 token id를 이어붙인 flat array('i')와 문장 경계 offsets array('q') (n + 1개)를
+    # model 입력으로 바로 쓸 수 있는 numpy array들로 바꾸는 함수 (python loop 없이 numpy 연산만 사용)
+    #
+    #   input_ids      : (n, width) int32. 가장 긴 문장 길이 (max_length로 자름)에 맞춰 pad_id로 채운다
+    #   attention_mask : (n, width) int32. 실제 token 자리는 1, padding은 0
+    #   offsets        : (n + 1,) int64. input_ids[attention_mask == 1]에서 i번째 문장은 offsets[i] : offsets[i + 1]
+    #   word_starts    : (n, width) int32. word_positions (각 단어의 첫 token의 flat 위치 array('q'))를 준 경우만. 단어의 첫 token 자리는 1
+
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("return_tensors='np' requires numpy. Install it with `pip install numpy`.") from e
+
+    flat = np.frombuffer(ids, dtype=np.int32) if len(ids) else np.zeros(0, dtype=np.int32)
+    starts = np.frombuffer(offsets, dtype=np.int64)
+    lengths = np.diff(starts)
+
+    word_starts = None
+    if word_positions is not None:
+        word_starts = np.zeros(len(flat), dtype=np.int32)
+        word_starts[np.frombuffer(word_positions, dtype=np.int64)] = 1
+
+    if max_length is not None:
+        truncated = np.minimum(lengths, max_length)
+        position = np.arange(len(flat)) - np.repeat(starts[:-1], lengths)      # 각 token의 문장 안에서의 위치
+        flat = flat[position < max_length]
+        if word_starts is not None:
+            word_starts = word_starts[position < max_length]
+        lengths = truncated
+
+    width = int(lengths.max()) if len(lengths) else 0
+    attention_mask = (np.arange(width) < lengths[:, None]).astype(np.int32)
+
+    input_ids = np.full((len(lengths), width), pad_id, dtype=np.int32)
+    input_ids[attention_mask.astype(bool)] = flat
+
+    tensors = {
+        'input_ids': input_ids,
+        'attention_mask': attention_mask,
+        'offsets': np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+    }
+
+    if word_starts is not None:
+        tensors['word_starts'] = np.zeros((len(lengths), width), dtype=np.int32)
+        tensors['word_starts'][attention_mask.astype(bool)] = word_starts
+
+    return tensors
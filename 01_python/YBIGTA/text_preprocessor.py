@@ -1,21 +1,102 @@
-from typing import List, Union
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
 import re
+from .parallel import count_words, imap_chunks, map_shards
+
+WORD = re.compile(r'\w+')
+SYMBOLS = str.maketrans({**dict.fromkeys("\"'.,/#@?!$%»^&*;:{}=-_`~()[]0123456789", None), '\n': ' '})    # 지울 기호 / 숫자, 줄바꿈은 공백으로
+SEPARATOR = '\x00'                                                          # batch로 이어붙일 때 문서 사이에 넣는 글자 (\w가 아니라서 하이픈 처리가 문서를 넘어가지 않는다)
+
+def preprocess_and_count(texts: Sequence[str]) -> Tuple[Dict[str, int], List[str]]:     # 원본 문서 chunk를 전처리하고 단어 빈도 / alphabet을 센다
+    return count_words(TextPreprocessor._preprocess_shard(texts))
+
+def count_corpus(corpus: Union[Iterable[str], str], workers: int = 1) -> Tuple[Dict[str, int], List[str]]:
+    # 원본 문서들을 chunk 단위로 전처리하면서 전체 {word : freq}와 alphabet을 센다 (둘 다 처음 등장한 순서, 전처리된 문장은 남기지 않는다)
+
+    if isinstance(corpus, str):
+        corpus = [corpus]
+
+    word_freqs, alphabet = {}, {}
+    for chunk_freqs, chunk_alphabet in imap_chunks(preprocess_and_count, corpus, workers):
+        for word, freq in chunk_freqs.items():
+            word_freqs[word] = word_freqs.get(word, 0) + freq
+        alphabet.update(dict.fromkeys(chunk_alphabet))
+
+    return word_freqs, list(alphabet)
 
 class TextPreprocessor:
     @staticmethod
-    def preprocess(text: Union[List[str], str]) -> List[str]:
+    def preprocess(text: Union[Iterable[str], str], workers: int = 1) -> List[str]:
         if isinstance(text, list):
-            return [TextPreprocessor._preprocess_sentence(sentence) for sentence in text]
+            return TextPreprocessor.preprocess_batch(text, workers)
         elif isinstance(text, str):
-            return [TextPreprocessor._preprocess_sentence(text)]
+            return [TextPreprocessor._preprocess_fast(text)]
+        elif isinstance(text, Iterable):
+            return list(TextPreprocessor.iter_preprocess(text, workers))
         else:
-            raise ValueError("Invalid input type. Text should be either List[str] or str.")
+            raise ValueError("Invalid input type. Text should be either Iterable[str] or str.")
+
+    @staticmethod
+    def preprocess_batch(texts: Sequence[str], workers: int = 1) -> List[str]:
+        # 여러 문서를 한 번에 전처리하는 함수. 결과는 _preprocess_sentence를 문서마다 부른 것과 같다
+        # workers > 1 이면 문서들을 shard로 나눠 process pool에서 처리한다
+        return [sentence for shard in map_shards(TextPreprocessor._preprocess_shard, texts, workers) for sentence in shard]
+
+    @staticmethod
+    def iter_preprocess(text: Union[Iterable[str], str], workers: int = 1) -> Iterator[str]:
+        # 문서를 하나씩 읽어가면서 전처리 결과를 yield 하는 generator (전체 corpus를 list로 만들지 않는다)
+        if isinstance(text, str):
+            yield TextPreprocessor._preprocess_fast(text)
+        elif workers <= 1:
+            yield from map(TextPreprocessor._preprocess_fast, text)
+        else:
+            for shard in imap_chunks(TextPreprocessor._preprocess_shard, text, workers):
+                yield from shard
+
+    @staticmethod
+    def _preprocess_shard(sentences: Sequence[str]) -> List[str]:
+        # 문서들을 SEPARATOR로 이어붙여 하이픈 처리 / translate / lower를 한 번씩만 돌린다
+
+        if not sentences:
+            return []
+
+        if any(SEPARATOR in sentence for sentence in sentences):
+            return [TextPreprocessor._preprocess_fast(sentence) for sentence in sentences]
+
+        joined = TextPreprocessor._split_hyphens(SEPARATOR.join(sentences)).translate(SYMBOLS).lower()
+
+        return [sentence.strip() for sentence in joined.split(SEPARATOR)]
+
+    @staticmethod
+    def _preprocess_fast(sentence: str) -> str:                 # _preprocess_sentence와 같은 결과 (regex callback 대신 translation table)
+        return TextPreprocessor._split_hyphens(sentence).translate(SYMBOLS).strip().lower()
+
+    @staticmethod
+    def _split_hyphens(text: str) -> str:
+        # re.sub(r'(\b\w+)-(\w+\b)', r'\1 \2', text)와 같은 결과를 '-' 위치만 보고 만든다
+        # 'a-b-c' -> 'a b-c' : 바로 앞 하이픈이 바뀌었고 그 사이가 단어 하나뿐이면, 그 단어는 이미 match에 쓰였으므로 바꾸지 않는다
+
+        if '-' not in text:
+            return text
+
+        parts = text.split('-')
+        pieces = [parts[0]]
+        replaced = False
+
+        for left, right in zip(parts, parts[1:]):
+            replaced = (left != '' and right != ''
+                        and (left[-1].isalnum() or left[-1] == '_')
+                        and (right[0].isalnum() or right[0] == '_')
+                        and not (replaced and WORD.fullmatch(left)))
+            pieces.append(' ' if replaced else '-')
+            pieces.append(right)
+
+        return ''.join(pieces)
 
     @staticmethod
     def _preprocess_sentence(sentence: str) -> str:
-        
+
         symbols = r"[\"'.,\/#@?!$%»\^&\*;:{}=\-_\`~\(\)\[\]0-9\n]"
         sentence = re.sub(r'(\b\w+)-(\w+\b)', r'\1 \2', sentence)
         final_sentence = re.sub(symbols, lambda x: " " if x.group() == "\n" else "", sentence).strip().lower()
 
-        return final_sentence
\ No newline at end of file
+        return final_sentence
@@ -0,0 +1,95 @@
+import json
+import os
+import sys
+import time
+from array import array
+from itertools import chain
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from .batch_encoder import CHUNK_SIZE, iter_encode
+
+# corpus 전체를 학습에 바로 쓸 수 있는 flat token id 파일로 저장하는 format (little endian)
+#
+#   <path>       : 모든 문서의 token id를 이어붙인 raw array (vocab 크기가 65536 이하면 uint16, 아니면 uint32)
+#   <path>.idx   : 문서 offset (uint64, n_docs + 1개). 문서 i는 ids[offsets[i]:offsets[i + 1]]
+#   <path>.json  : {"dtype", "n_docs", "n_tokens", "vocab_size", "tokenizer"}
+#
+# header가 없어서 numpy.memmap(path, dtype=meta['dtype'])으로 파일 전체를 읽지 않고 바로 열 수 있다.
+
+INDEX_SUFFIX = '.idx'
+META_SUFFIX = '.json'
+
+class ShardInfo(NamedTuple):
+    path: str
+    dtype: str                          # numpy dtype string ('<u2' / '<u4')
+    n_docs: int
+    n_tokens: int
+    seconds: float
+    tokens_per_sec: float
+
+def shard_dtype(vocab_size: int) -> Tuple[str, str]:     # (array typecode, numpy dtype string). id가 모두 들어가는 가장 작은 unsigned type
+
+    if vocab_size <= 1 << 16:
+        return 'H', '<u2'
+    if vocab_size <= 1 << 32:
+        return 'I', '<u4'
+    raise ValueError(f"vocab_size {vocab_size} does not fit in uint32.")
+
+def _write(f, values: array) -> None:
+
+    if sys.byteorder != 'little':
+        values.byteswap()
+    values.tofile(f)
+
+def encode_to_file(tokenizer, texts: Iterable[str], path: str, workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> ShardInfo:
+    # 문서를 chunk_size개씩 읽어 encode 하고 바로 파일 뒤에 붙인다 (texts 전체나 encode 결과 전체를 메모리에 들지 않는다)
+    # 임시 파일에 쓴 뒤 끝나면 rename 하므로 중간에 멈춰도 예전 파일이 깨지지 않는다
+
+    vocab_size = tokenizer.vocab_size
+    typecode, dtype = shard_dtype(vocab_size)
+    tmp = f'.tmp{os.getpid()}'
+    paths = (path, path + INDEX_SUFFIX, path + META_SUFFIX)
+
+    start = time.perf_counter()
+    n_docs = n_tokens = 0
+
+    with open(paths[0] + tmp, 'wb') as ids_file, open(paths[1] + tmp, 'wb') as index_file:
+        _write(index_file, array('Q', [0]))
+
+        for chunk in iter_encode(tokenizer, texts, workers, chunk_size):
+            offsets = array('Q')
+            for ids in chunk:
+                n_tokens += len(ids)
+                offsets.append(n_tokens)
+
+            _write(ids_file, array(typecode, chain.from_iterable(chunk)))
+            _write(index_file, offsets)
+            n_docs += len(chunk)
+
+    with open(paths[2] + tmp, 'w') as f:
+        json.dump({'dtype': dtype, 'n_docs': n_docs, 'n_tokens': n_tokens, 'vocab_size': vocab_size, 'tokenizer': type(tokenizer).__name__}, f)
+
+    for final in paths:
+        os.replace(final + tmp, final)
+
+    seconds = time.perf_counter() - start
+    return ShardInfo(path, dtype, n_docs, n_tokens, seconds, n_tokens / seconds if seconds > 0 else float('inf'))
+
+def read_shard(path: str) -> Tuple['numpy.ndarray', 'numpy.ndarray']:
+    # encode_to_file로 만든 파일을 numpy.memmap으로 연다 -> (ids, offsets). 문서 i는 ids[offsets[i]:offsets[i + 1]]
+
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("read_shard requires numpy. Install it with `pip install numpy`.") from e
+
+    with open(path + META_SUFFIX) as f:
+        meta = json.load(f)
+
+    if meta['n_tokens'] == 0:           # 크기가 0인 파일은 mmap 할 수 없다
+        ids = np.zeros(0, dtype=meta['dtype'])
+    else:
+        ids = np.memmap(path, dtype=meta['dtype'], mode='r', shape=(meta['n_tokens'],))
+    offsets = np.memmap(path + INDEX_SUFFIX, dtype='<u8', mode='r', shape=(meta['n_docs'] + 1,))
+
+    return ids, offsets
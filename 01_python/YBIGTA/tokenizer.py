@@ -1,22 +1,127 @@
-from typing import List, Optional, Union
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
 from .text_preprocessor import TextPreprocessor
+from .batch_encoder import encode_batch
+from .serialization import Section, read_sections, write_sections
+from .tensors import to_tensors
+from .decoder import Decoder
+from .batching import Batch, iter_batches
+from .token_shards import ShardInfo, encode_to_file
 
 class Tokenizer:
-    def __init__(self, corpus: Optional[Union[List[str], str]] = None):
-        
-        if corpus is None:
-            self.corpus = []
-        else:
-            self.corpus = TextPreprocessor.preprocess(corpus)
+    def __init__(self, corpus: Optional[Union[Iterable[str], str]] = None, workers: int = 1):
+
+        self.workers = workers          # 전처리 / 단어 빈도 계산 / encode_batch에 쓸 process 수
+        self.corpus = []
+        self.batch_encoder = None       # encode_batch의 persistent worker pool (처음 필요할 때 만든다)
+        self.encode_stats = None        # 마지막 encode_batch의 처리량 (EncodeStats)
+        self.decoder = None             # 학습 / load 이후 고정되는 id -> token table (decode에서 만든다)
+
+        if corpus is not None:
+            self.add_corpus(corpus)
+
+    def add_corpus(self, corpus: Union[Iterable[str], str]) -> None:     # corpus는 list가 아니어도 된다 (generator면 문서를 하나씩 읽어 전처리)
+
+        self.corpus.extend(TextPreprocessor.iter_preprocess(corpus, self.workers))
+
+    def add_word_freqs(self, word_freqs: Dict[str, int], alphabet: Optional[Iterable[str]] = None) -> None:     # 전처리 / 단어 세기를 이미 한 corpus를 추가
+        raise NotImplementedError
+
+    def save(self, path: str) -> None:         # 학습된 tokenizer를 binary 파일로 저장 (corpus는 저장하지 않는다)
+
+        write_sections(path, type(self).__name__, self._sections())
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'Tokenizer':       # save()로 저장한 파일을 읽어 바로 tokenize 할 수 있는 tokenizer를 만든다
+                                                             # (section은 mmap 위에서 읽지만 vocab / merge table은 Python 객체로 새로 만든다)
+
+        tokenizer = cls(**kwargs)
+        tokenizer._load_sections(read_sections(path, cls.__name__))
+        return tokenizer
+
+    def _load_kwargs(self) -> Dict[str, object]:     # encode_batch worker가 load 할 때 넘길 생성자 인자 (모델이 아닌 설정)
+        return {}
+
+    def _sections(self) -> Dict[str, Section]:
+        raise NotImplementedError
+
+    def _load_sections(self, sections: Dict[str, memoryview]) -> None:
+        raise NotImplementedError
+
+    def _encode_into(self, ids: array, sent: str, word_positions: Optional[array] = None) -> None:
+        # 전처리된 문장 하나의 token id들을 ids 뒤에 붙인다. word_positions를 주면 각 단어의 첫 token 위치도 붙인다
+        raise NotImplementedError
+
+    def _decoder(self) -> Decoder:
+        raise NotImplementedError
+
+    def get_decoder(self) -> Decoder:
+
+        if self.decoder is None:
+            self.decoder = self._decoder()
+        return self.decoder
+
+    @property
+    def vocab_size(self) -> int:        # '<PAD>', '<UNK>'를 포함한 token 수
+        return self.get_decoder().size
+
+    def decode(self, ids: Sequence[int], word_starts: Optional[Sequence[int]] = None, skip_special_tokens: bool = False) -> str:
+        # token id들을 다시 string으로 (전처리된 문장 기준). BPETokenizer는 word_starts가 있어야 단어 사이 공백이 복원된다
+        return self.get_decoder().decode(ids, word_starts, skip_special_tokens)
+
+    def decode_batch(self, ids, attention_mask=None, word_starts=None, skip_special_tokens: bool = False) -> List[str]:
+        # id list들 / (n, width) numpy array / tokenize(return_tensors='np')의 결과 dict를 문장 string list로
+        return self.get_decoder().decode_batch(ids, attention_mask, word_starts, skip_special_tokens)
+
+    def _to_tensors(self, text: List[str], return_tensors: str, max_length: Optional[int] = None) -> Dict[str, 'numpy.ndarray']:
+        # 전처리된 문장들을 flat id array + 문장 offset + 단어 시작 위치로 encode 한 뒤 numpy array로 바꾼다 (항상 가장 긴 문장에 맞춰 padding)
+
+        if return_tensors != 'np':
+            raise ValueError(f"Unsupported return_tensors: {return_tensors!r}. Only 'np' is supported.")
+
+        ids, offsets, word_positions = array('i'), array('q', [0]), array('q')
+        for sent in text:
+            self._encode_into(ids, sent, word_positions)
+            offsets.append(len(ids))
+
+        return to_tensors(ids, offsets, max_length, self.pad_id, word_positions)
+
+    def _encode_texts(self, texts: Sequence[str]) -> List[List[int]]:      # 문서마다 flat token id list
+
+        result = []
+        for sent in TextPreprocessor.preprocess_batch(list(texts)):
+            ids = array('i')
+            self._encode_into(ids, sent)
+            result.append(ids.tolist())
+
+        return result
+
+    def encode_batch(self, texts: Sequence[str], workers: Optional[int] = None) -> List[List[int]]:
+        # 많은 문서를 한 번에 encode 하는 함수. 문서마다 flat token id list를 입력 순서대로 return
+        # 큰 batch는 학습된 tokenizer를 한 번씩 load 한 worker process들에 나눠 보낸다 (pool은 close() 전까지 재사용)
+        return encode_batch(self, texts, workers)
+
+    def iter_batches(self, texts: Sequence[str], batch_size: int = 32, **kwargs) -> Iterator[Batch]:
+        # 길이가 비슷한 문서끼리 묶어 padding 한 Batch들을 yield (batch 마다 padding 비율 포함, restore_order로 원래 순서 복원)
+        return iter_batches(self, texts, batch_size, **kwargs)
+
+    def encode_to_file(self, texts: Iterable[str], path: str, workers: Optional[int] = None, **kwargs) -> ShardInfo:
+        # 문서들을 chunk 단위로 읽으면서 encode 해서 flat token id 파일 (+ 문서 offset .idx, dtype .json)로 저장 (YBIGTA.read_shard로 memmap)
+        return encode_to_file(self, texts, path, workers, **kwargs)
+
+    def _close_batch_encoder(self) -> None:     # encode_batch의 worker pool 정리 (모델이 바뀌면 worker들이 load 한 모델은 쓸 수 없다)
 
-    def add_corpus(self, corpus: Union[List[str], str]) -> None:
+        if self.batch_encoder is not None:
+            self.batch_encoder.close()
+            self.batch_encoder = None
 
-        self.corpus.extend(TextPreprocessor.preprocess(corpus))
+    def close(self) -> None:            # tokenizer가 가진 worker process 정리 (encode_batch의 pool)
+        self._close_batch_encoder()
 
-    def tokenize(self, text: Union[List[str], str], padding: bool = False, max_length: Optional[int] = None) -> Union[List[List[int]], List[int]]:
+    def tokenize(self, text: Union[List[str], str], padding: bool = False, max_length: Optional[int] = None, return_tensors: Optional[str] = None) -> Union[List[List[int]], List[int]]:
         
         raise NotImplementedError        
         
-    def __call__(self, text, padding, max_length) -> Union[List[List[int]], List[int]]:
-        return self.tokenize(text, padding, max_length)
+    def __call__(self, text, padding, max_length, return_tensors=None) -> Union[List[List[int]], List[int]]:
+        return self.tokenize(text, padding, max_length, return_tensors)
 
@@ -0,0 +1,133 @@
+import cProfile
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+PROFILERS = (None, 'cprofile', 'tracemalloc')
+
+class TrainingProgress(NamedTuple):
+    n_merges: int                       # 지금까지 한 merge 수
+    n_iter: int                         # train(n_iter)의 목표 merge 수
+    vocab_size: int                     # 현재 symbol 수 ('<PAD>', '<UNK>' 포함)
+    elapsed: float                      # merge loop 시작 후 지난 시간 (초)
+    merges_per_sec: float               # 직전 progress 이후 구간의 merge 속도
+    phase_seconds: Dict[str, float]     # 끝난 phase 별 시간 (compute_word_freqs, get_stats, ...)
+
+class TrainingMonitor:
+    # BPETokenizer.train의 진행 상황을 재는 객체
+    #
+    #   phase_seconds  : phase 이름 -> 걸린 시간 (compute_word_freqs / get_stats / merge)
+    #   history        : every merge 마다 기록한 TrainingProgress list
+    #   callback       : every merge 마다 TrainingProgress로 호출. False를 return 하면 학습을 멈춘다
+    #   profile        : 'cprofile' 이면 profile_window (merge 번호 [start, stop)) 동안 cProfile을 켜고 pstats.Stats를,
+    #                    'tracemalloc' 이면 같은 구간의 (snapshot, peak bytes)를 profile_result에 남긴다
+
+    def __init__(self, callback: Optional[Callable[[TrainingProgress], Optional[bool]]] = None, every: int = 1000,
+                 profile: Optional[str] = None, profile_window: Optional[Tuple[int, int]] = None):
+
+        if every < 1:
+            raise ValueError(f"every must be positive, got {every}.")
+        if profile not in PROFILERS:
+            raise ValueError(f"Unsupported profile: {profile!r}. Use one of {PROFILERS}.")
+
+        self.callback = callback
+        self.every = every
+        self.profile = profile
+        self.profile_window = profile_window if profile_window is not None else (0, every)
+        self.profile_result = None
+
+        self.phase_seconds: Dict[str, float] = {}
+        self.history: List[TrainingProgress] = []
+        self.stopped = False                    # callback이 학습을 멈췄는지
+
+        self.n_iter = 0
+        self._profiler = None
+        self._started_tracemalloc = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:      # with monitor.phase('get_stats'): ... 로 구간 시간을 잰다
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + time.perf_counter() - start
+
+    def start(self, n_iter: int, n_merges: int = 0) -> None:      # merge loop 직전에 호출 (resume이면 n_merges는 이미 한 merge 수)
+
+        self.n_iter = n_iter
+        self._start = self._last_time = time.perf_counter()
+        self._last_merges = n_merges
+        self._update_profiler(n_merges)
+
+    def step(self, n_merges: int, vocab_size: int, n_new: int = 1) -> bool:
+        # merge가 끝날 때마다 호출 (n_new는 이번에 한 merge 수. merges_per_round > 1 이면 한 round씩). False면 학습을 멈춘다
+
+        if self.profile is not None:
+            self._update_profiler(n_merges)
+
+        if n_merges % self.every >= n_new:      # 이번 step에서 every의 배수를 지나지 않았다
+            return True
+        return self._report(n_merges, vocab_size)
+
+    def finish(self, n_merges: int, vocab_size: int) -> None:  # merge loop가 끝난 뒤 호출 (profiler 정리, 마지막 progress 기록)
+
+        self._stop_profiler()
+        if not self.history or self.history[-1].n_merges != n_merges:
+            self._record(n_merges, vocab_size)
+
+    def _record(self, n_merges: int, vocab_size: int) -> TrainingProgress:
+
+        now = time.perf_counter()
+        window = now - self._last_time
+        progress = TrainingProgress(n_merges, self.n_iter, vocab_size, now - self._start,
+                                    (n_merges - self._last_merges) / window if window > 0 else float('inf'), dict(self.phase_seconds))
+
+        self._last_time, self._last_merges = now, n_merges
+        self.history.append(progress)
+        return progress
+
+    def _report(self, n_merges: int, vocab_size: int) -> bool:
+
+        progress = self._record(n_merges, vocab_size)
+        if self.callback is not None and self.callback(progress) is False:
+            self.stopped = True
+            return False
+        return True
+
+    def _update_profiler(self, n_merges: int) -> None:
+
+        start, stop = self.profile_window
+        if start <= n_merges < stop and self._profiler is None and self.profile_result is None:
+            self._start_profiler()
+        elif n_merges >= stop:
+            self._stop_profiler()
+
+    def _start_profiler(self) -> None:
+
+        if self.profile == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.profile == 'tracemalloc':
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._profiler = tracemalloc
+
+    def _stop_profiler(self) -> None:
+
+        if self._profiler is None:
+            return
+
+        if self.profile == 'cprofile':
+            self._profiler.disable()
+            self.profile_result = pstats.Stats(self._profiler)
+        else:
+            self.profile_result = (tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[1])
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+        self._profiler = None
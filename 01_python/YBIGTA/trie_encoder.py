@@ -0,0 +1,88 @@
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from .symbol_table import SymbolTable
+
+ROOT = 0
+NO_TOKEN = -1
+CHAR_BITS = 21              # unicode code point는 21 bit 안에 들어간다
+
+class EncoderComparison(NamedTuple):       # 같은 corpus를 'bpe'와 'trie'로 encode 했을 때 결과가 다른 정도
+    n_words: int                # 단어 수 (등장 횟수 기준)
+    n_different: int            # 두 encoder의 결과가 다른 단어 수 (등장 횟수 기준)
+    rate: float                 # n_different / n_words
+    n_unique: int               # 서로 다른 단어 수
+    n_unique_different: int
+    unique_rate: float
+    bpe_tokens: int             # 'bpe'로 encode 한 전체 token 수
+    trie_tokens: int            # 'trie'로 encode 한 전체 token 수
+
+class TrieEncoder:
+    # 학습된 vocab (alphabet + merge 된 token)을 flat trie 하나로 compile 해서 greedy longest match로 단어를 쪼개는 encoder
+    #
+    #   children : (state << 21 | 글자 code point) -> 다음 state. state마다 dict를 두지 않고 dict 하나에 전부 넣는다
+    #   token_of : state -> 그 state에서 끝나는 token의 id (없으면 -1)
+    #
+    # 단어를 왼쪽부터 한 번만 훑으면서 가장 긴 token을 고르므로 merge를 rank 순으로 적용하는 BPEEncoder보다 빠르지만,
+    # 결과가 항상 같지는 않다 (BPETokenizer.compare_encoders로 얼마나 다른지 확인할 수 있다).
+    # word -> ids 결과는 BPEEncoder처럼 LRU cache에 저장된다.
+
+    def __init__(self, symbols: SymbolTable, unk_id: int, cache_size: Optional[int] = 100000, special_ids: Iterable[int] = ()):
+
+        self.unk_id = unk_id
+        self.children: Dict[int, int] = {}
+        self.token_of = array('i', [NO_TOKEN])
+
+        special_ids = set(special_ids)
+        for idx, token in enumerate(symbols.tokens):
+            if idx not in special_ids:
+                self._insert(token, idx)
+
+        self.encode_word = lru_cache(maxsize=cache_size)(self._encode_word)
+
+    def _insert(self, token: str, idx: int) -> None:
+
+        children, token_of = self.children, self.token_of
+        state = ROOT
+
+        for letter in token:
+            key = state << CHAR_BITS | ord(letter)
+            child = children.get(key)
+            if child is None:
+                child = children[key] = len(token_of)
+                token_of.append(NO_TOKEN)
+            state = child
+
+        token_of[state] = idx
+
+    def __len__(self) -> int:          # trie의 state 수
+        return len(self.token_of)
+
+    def cache_info(self):
+        return self.encode_word.cache_info()
+
+    def _encode_word(self, word: str) -> Tuple[int, ...]:      # word의 token id들. alphabet에 없는 글자는 unk_id
+
+        children, token_of = self.children, self.token_of
+        codes = [ord(letter) for letter in word]
+        n = len(codes)
+
+        ids = []
+        start = 0
+        while start < n:
+            best, end = self.unk_id, start + 1          # 매칭되는 token이 없으면 글자 하나를 unk_id로
+            state, i = ROOT, start
+
+            while i < n:
+                state = children.get(state << CHAR_BITS | codes[i])
+                if state is None:
+                    break
+                i += 1
+                if token_of[state] != NO_TOKEN:
+                    best, end = token_of[state], i
+
+            ids.append(best)
+            start = end
+
+        return tuple(ids)
@@ -0,0 +1,43 @@
+import heapq
+from typing import Dict, List, Optional
+
+class VocabBuilder:
+    # 메모리 상한이 정해진 streaming 단어 빈도 sketch (Misra-Gries heavy hitters)
+    #
+    # capacity개 까지만 단어를 들고 있고, 넘치면 (capacity + 1)번째로 큰 count만큼 모든 count를 빼고 0 이하인 단어를 버린다.
+    # 그래서 count는 실제 빈도보다 작거나 같고, 차이는 최대 self.error (= 지금까지 뺀 값의 합) 이다.
+    # 한 번도 넘친 적이 없으면 (error == 0) count는 정확하다.
+
+    def __init__(self, capacity: int = 1000000):
+
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}        # {word : count} (처음 등장한 순서)
+        self.error = 0                          # count의 최대 과소 추정치
+        self.total = 0                          # 지금까지 들어온 단어 수
+
+    def update(self, word_freqs: Dict[str, int]) -> None:      # 한 chunk의 {word : freq}를 합친다
+
+        counts = self.counts
+        for word, freq in word_freqs.items():
+            counts[word] = counts.get(word, 0) + freq
+            self.total += freq
+
+        if len(counts) > self.capacity:
+            self._reduce()
+
+    def _reduce(self) -> None:
+
+        cut = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+        self.counts = {word: count - cut for word, count in self.counts.items() if count > cut}
+        self.error += cut
+
+    def most_common(self, max_vocab: Optional[int] = None, min_freq: int = 1) -> List[str]:
+        # count가 min_freq 이상인 단어 중 count가 큰 max_vocab개를 처음 등장한 순서대로 return
+
+        words = [word for word, count in self.counts.items() if count >= min_freq]
+
+        if max_vocab is not None and len(words) > max_vocab:
+            keep = set(heapq.nlargest(max_vocab, words, key=self.counts.__getitem__))
+            words = [word for word in words if word in keep]
+
+        return words
@@ -1,53 +1,108 @@
-from typing import List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
+from array import array
 from .tokenizer import Tokenizer
-from .text_preprocessor import TextPreprocessor
+from .text_preprocessor import TextPreprocessor, preprocess_and_count
+from .parallel import imap_chunks
+from .serialization import Section, pack_strings, unpack_strings
+from .tensors import PAD, UNK
+from .vocab_builder import VocabBuilder
+from .decoder import Decoder
 
 class WordTokenizer(Tokenizer):
-        
-    
-    def __init__(self, corpus: Optional[Union[List[str], str]] = None):
-        
-        super().__init__(corpus)
-        
-        self.word_tokens = {}
-        
-    
-    def train(self, *args, **kwargs) -> None:
-
-        i = 1
-        for sent in self.corpus:
-            for word in sent.split():
-                if word not in self.word_tokens.keys():
-                    self.word_tokens[word] = i
-                    i += 1
-        
-        self.word_tokens['<PAD>'] = 0
-                    
-    def tokenize(self, text: Union[List[str], str], padding: bool = False, max_length: Optional[int] = None) -> List[List[int]]:
-        
-        text = TextPreprocessor.preprocess(text)
+    # corpus는 저장하지 않고 add_corpus 할 때마다 단어 빈도만 메모리 상한이 있는 VocabBuilder에 합친다.
+    # train()이 max_vocab / min_freq에 맞는 단어만 골라 word_tokens를 고정하고, 나머지 단어는 '<UNK>'가 된다.
 
-        if isinstance(text, list) and padding:
-            max_len = max(len(token) for token in text)
-            tokens = [token + '<PAD>' * (max_len - len(token)) for token in text]
+    def __init__(self, corpus: Optional[Union[Iterable[str], str]] = None, workers: int = 1,
+                 max_vocab: Optional[int] = None, min_freq: int = 1, sketch_size: int = 1000000):
 
-        if max_length is not None:
-            if isinstance(text, list):
-                tokens = [token[:max_length] for token in tokens]
-            else:
-                tokens = [tokens[:max_length]]
+        self.vocab_builder = VocabBuilder(sketch_size)     # 단어 빈도 sketch (단어 sketch_size개 까지만 들고 있는다)
+        self.max_vocab = max_vocab                          # '<PAD>', '<UNK>'를 포함한 최대 vocab 크기
+        self.min_freq = min_freq
+
+        super().__init__(corpus, workers)
+
+        self.word_tokens = {PAD: 0, UNK: 1}    # {word : id}, '<PAD>'는 0, '<UNK>'는 1. train()이 끝나면 바꾸지 않는다
+
+    @property
+    def pad_id(self) -> int:
+        return self.word_tokens[PAD]
+
+    @property
+    def unk_id(self) -> int:
+        return self.word_tokens[UNK]
+
+    def add_corpus(self, corpus: Union[Iterable[str], str]) -> None:     # 문서를 chunk 단위로 전처리하고 단어 빈도만 sketch에 합친다 (원문은 버린다)
+
+        if isinstance(corpus, str):
+            corpus = [corpus]
+
+        for word_freqs, _ in imap_chunks(preprocess_and_count, corpus, self.workers):
+            self.vocab_builder.update(word_freqs)
+
+    def add_word_freqs(self, word_freqs: Dict[str, int], alphabet: Optional[Iterable[str]] = None) -> None:     # 미리 센 {word : freq}를 corpus 대신 추가
+        self.vocab_builder.update(word_freqs)
+
+    def train(self, *args, max_vocab: Optional[int] = None, min_freq: Optional[int] = None, **kwargs) -> None:
+
+        self._close_batch_encoder()     # 이전 모델을 load 한 encode_batch worker들은 더 이상 쓸 수 없다
+
+        max_vocab = self.max_vocab if max_vocab is None else max_vocab
+        min_freq = self.min_freq if min_freq is None else min_freq
+
+        word_tokens = {PAD: 0, UNK: 1}
+        limit = None if max_vocab is None else max(max_vocab - len(word_tokens), 0)
+
+        for word in self.vocab_builder.most_common(limit, min_freq):
+            word_tokens.setdefault(word, len(word_tokens))
+
+        self.word_tokens = word_tokens
+        self.decoder = None
+
+    def _sections(self) -> Dict[str, Section]:
 
+        words, word_offsets = pack_strings(list(self.word_tokens))
+        return {'words': words, 'word_offsets': word_offsets, 'word_ids': array('I', self.word_tokens.values())}
+
+    def _load_sections(self, sections: Dict[str, memoryview]) -> None:
+
+        words = unpack_strings(sections['words'], sections['word_offsets'])
+        self.word_tokens = dict(zip(words, sections['word_ids']))
+        self.decoder = None
+
+    def _encode_into(self, ids: array, sent: str, word_positions: Optional[array] = None) -> None:
+
+        word_tokens, unk_id = self.word_tokens, self.unk_id
+        start = len(ids)
+        ids.extend([word_tokens.get(word, unk_id) for word in sent.split()])
+
+        if word_positions is not None:              # 모든 token이 단어의 시작
+            word_positions.extend(range(start, len(ids)))
+
+    def _decoder(self) -> Decoder:
+
+        tokens = [''] * len(self.word_tokens)
+        for word, idx in self.word_tokens.items():
+            tokens[idx] = word
+        return Decoder(tokens, (self.pad_id, self.unk_id), word_level=True)
+
+    def tokenize(self, text: Union[List[str], str], padding: bool = False, max_length: Optional[int] = None, return_tensors: Optional[str] = None) -> List[List[int]]:
+        # 모르는 단어는 unk_id. return_tensors='np' 이면 {'input_ids', 'attention_mask', 'offsets'} numpy array dict를 return
+
+        text = TextPreprocessor.preprocess(text)
+
+        if return_tensors is not None:
+            return self._to_tensors(text, return_tensors, max_length)
+
+        word_tokens, unk_id = self.word_tokens, self.unk_id
         indices = []
         for sent in text:
-            tokenized_sent =[]
-            for word in sent.split():
-                if word in self.word_tokens.keys():
-                    tokenized_sent.append(self.word_tokens[word])
-                else:
-                    tokenized_sent.append('-')
-            indices.append(tokenized_sent)
-            
-        return indices
+            indices.append([word_tokens.get(word, unk_id) for word in sent.split()])     # 모르는 단어는 unk_id
 
+        if isinstance(text, list) and padding:
+            max_len = max(len(sent) for sent in indices)
+            indices = [sent + [self.pad_id] * (max_len - len(sent)) for sent in indices]
+
+        if max_length is not None:
+            indices = [sent[:max_length] for sent in indices]
 
-    
+        return indices
@@ -0,0 +1,74 @@
+# BPETokenizer.train의 근사 학습 (merges_per_round > 1)과 정확한 학습 (merges_per_round=1) 비교
+# merges_per_round 별 학습 시간 / speedup, 정확한 학습과의 merge list 차이, held-out 문서의 압축률 (token 하나 당 글자 수) 측정
+# 01_python 폴더에서: python -m benchmarks.bench_multi_merge -n 5000 -i 5000 -k 1,8,32,128 -o results.json
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from YBIGTA import BPETokenizer
+from benchmarks.synthetic import make_corpus
+
+
+def parse_ints(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+def train(corpus, n_iter, merges_per_round, workers):      # (tokenizer, 학습 시간)
+    tokenizer = BPETokenizer(corpus, workers=workers)
+    start = time.perf_counter()
+    tokenizer.train(n_iter, merges_per_round=merges_per_round)
+    seconds = time.perf_counter() - start
+    tokenizer.trainer.close()
+    return tokenizer, seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--n_docs", type=int, default=5000)                      # 학습 corpus 문서 수
+    parser.add_argument("-i", "--n_iter", type=int, default=5000)
+    parser.add_argument("-k", "--merges_per_round", type=parse_ints, default=[1, 8, 32, 128])
+    parser.add_argument("-e", "--n_held_out", type=int, default=1000)                  # 압축률을 잴 held-out 문서 수
+    parser.add_argument("-w", "--workers", type=int, default=1)                        # workers > 1 이고 단어가 충분히 많으면 ShardedBPETrainer
+    parser.add_argument("-o", "--output", type=str, default=None)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.n_docs)
+    held_out = make_corpus(args.n_held_out, seed=1)
+
+    exact, exact_seconds = train(corpus, args.n_iter, 1, args.workers)
+
+    results = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'args': vars(args),
+        'runs': [],
+    }
+
+    for merges_per_round in args.merges_per_round:
+        if merges_per_round == 1:
+            tokenizer, seconds = exact, exact_seconds
+        else:
+            tokenizer, seconds = train(corpus, args.n_iter, merges_per_round, args.workers)
+
+        comparison = tokenizer.compare_merges(exact, held_out)
+        results['runs'].append({
+            'merges_per_round': merges_per_round,
+            'train_seconds': round(seconds, 4),
+            'speedup': round(exact_seconds / seconds, 2),
+            'n_merges': comparison.n_merges,
+            'overlap': round(comparison.overlap, 4),
+            'common_prefix': comparison.common_prefix,
+            'compression': round(comparison.compression, 4),
+            'exact_compression': round(comparison.other_compression, 4),
+        })
+        print(f"merges_per_round={merges_per_round} done", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
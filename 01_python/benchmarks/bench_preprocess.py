@@ -0,0 +1,49 @@
+# TextPreprocessor 문서별 전처리(_preprocess_sentence) vs batch 전처리(preprocess_batch) 비교
+# 01_python 폴더에서: python -m benchmarks.bench_preprocess -n 20000 -w 4
+import argparse
+import json
+import os
+import time
+
+from YBIGTA import TextPreprocessor
+from benchmarks.synthetic import make_corpus
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--n_docs", type=int, default=20000)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.n_docs)
+    n_chars = sum(map(len, corpus))
+
+    runs = {
+        'per_sentence': lambda: [TextPreprocessor._preprocess_sentence(doc) for doc in corpus],
+        'batch': lambda: TextPreprocessor.preprocess_batch(corpus),
+        f'batch_workers_{args.workers}': lambda: TextPreprocessor.preprocess_batch(corpus, args.workers),
+    }
+
+    expected = None
+    results = {'n_docs': args.n_docs, 'n_chars': n_chars}
+
+    for name, run in runs.items():
+        best = float('inf')
+        for _ in range(args.repeat):
+            output, seconds = timed(run)
+            best = min(best, seconds)
+
+        if expected is None:
+            expected = output
+        assert output == expected, f"{name} output differs from per_sentence"
+
+        results[name] = {'seconds': round(best, 4), 'docs_per_sec': round(args.n_docs / best), 'mb_per_sec': round(n_chars / best / 1e6, 2)}
+
+    print(json.dumps(results, indent=2))
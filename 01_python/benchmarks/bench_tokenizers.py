@@ -0,0 +1,139 @@
+# BPETokenizer / WordTokenizer 학습 시간 (n_iter 별), encode 처리량 (batch size 별), encode -> decode 왕복 처리량, peak 메모리 (tracemalloc) 측정
+# 01_python 폴더에서: python -m benchmarks.bench_tokenizers -n 1000,5000 -i 100,1000 -o results.json
+# --cnn을 주면 CNN stories 크기 (약 92k 문서, 문서당 약 760 단어)의 synthetic corpus도 측정한다
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from YBIGTA import BPETokenizer, TextPreprocessor, WordTokenizer
+from benchmarks.synthetic import make_corpus
+
+CNN_DOCS = 92579
+CNN_WORDS_PER_DOC = 760
+
+
+def parse_ints(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+def build(cls, corpus, n_iter):     # (tokenizer, 전처리 시간, 학습 시간)
+    start = time.perf_counter()
+    tokenizer = cls(corpus)
+    preprocessed = time.perf_counter()
+    tokenizer.train(n_iter)
+    return tokenizer, preprocessed - start, time.perf_counter() - preprocessed
+
+
+def peak_memory(cls, corpus, n_iter):      # 전처리 + 학습 중 python heap의 peak (MB). tracemalloc은 느리므로 시간 측정과 따로 돌린다
+    tracemalloc.start()
+    tokenizer, _, _ = build(cls, corpus, n_iter)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tokenizer.close()
+    return round(peak / 1e6, 2)
+
+
+def bench_train(cls, corpus, n_iters):
+    runs = []
+    for n_iter in n_iters:
+        tokenizer, preprocess_seconds, train_seconds = build(cls, corpus, n_iter)
+        run = {'n_iter': n_iter, 'preprocess_seconds': round(preprocess_seconds, 4), 'train_seconds': round(train_seconds, 4)}
+        if isinstance(tokenizer, BPETokenizer):
+            run['n_merges'] = len(tokenizer.merges)
+            run['vocab_size'] = len(tokenizer.symbols)
+        else:
+            run['vocab_size'] = len(tokenizer.word_tokens)
+        runs.append(run)
+    return tokenizer, runs
+
+
+def bench_encode(tokenizer, docs, batch_sizes, workers):
+    runs = []
+    for batch_size in batch_sizes:
+        n_tokens = 0
+        start = time.perf_counter()
+        for i in range(0, len(docs), batch_size):
+            n_tokens += sum(map(len, tokenizer.encode_batch(docs[i:i + batch_size], workers)))
+        seconds = time.perf_counter() - start
+        runs.append({
+            'batch_size': batch_size,
+            'seconds': round(seconds, 4),
+            'docs_per_sec': round(len(docs) / seconds),
+            'tokens_per_sec': round(n_tokens / seconds),
+        })
+    tokenizer.close()
+    return runs
+
+
+def bench_round_trip(tokenizer, docs):     # tokenize(return_tensors='np') -> decode_batch. exact는 전처리된 문장으로 그대로 돌아온 비율
+    start = time.perf_counter()
+    tensors = tokenizer.tokenize(docs, return_tensors='np')
+    encoded = time.perf_counter()
+    decoded = tokenizer.decode_batch(tensors)
+    end = time.perf_counter()
+
+    expected = [' '.join(sent.split()) for sent in TextPreprocessor.preprocess_batch(docs)]
+    return {
+        'encode_seconds': round(encoded - start, 4),
+        'decode_seconds': round(end - encoded, 4),
+        'decode_docs_per_sec': round(len(docs) / (end - encoded)),
+        'decode_tokens_per_sec': round(int(tensors['attention_mask'].sum()) / (end - encoded)),
+        'exact': round(sum(map(str.__eq__, decoded, expected)) / len(docs), 4),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--sizes", type=parse_ints, default=[1000, 5000])        # 학습 corpus 문서 수 (쉼표로 구분)
+    parser.add_argument("-i", "--n_iters", type=parse_ints, default=[100, 500, 2000])  # BPETokenizer.train의 n_iter (쉼표로 구분)
+    parser.add_argument("-b", "--batch_sizes", type=parse_ints, default=[1, 16, 128, 1024])
+    parser.add_argument("-e", "--n_encode", type=int, default=2000)                    # encode 처리량 측정에 쓸 held-out 문서 수
+    parser.add_argument("-w", "--workers", type=int, default=1)                        # encode_batch worker 수
+    parser.add_argument("--cnn", action="store_true")
+    parser.add_argument("--no_memory", action="store_true")                            # tracemalloc 측정을 건너뛴다
+    parser.add_argument("-o", "--output", type=str, default=None)
+    args = parser.parse_args()
+
+    corpora = [(n_docs, 200) for n_docs in args.sizes]
+    if args.cnn:
+        corpora.append((CNN_DOCS, CNN_WORDS_PER_DOC))
+
+    results = {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'args': {'n_iters': args.n_iters, 'batch_sizes': args.batch_sizes, 'n_encode': args.n_encode, 'workers': args.workers},
+        'runs': [],
+    }
+
+    for n_docs, words_per_doc in corpora:
+        corpus = make_corpus(n_docs, words_per_doc)
+        held_out = make_corpus(args.n_encode, words_per_doc, seed=1)       # 학습에 없던 문서로 encode 측정
+
+        for cls in (BPETokenizer, WordTokenizer):
+            n_iters = args.n_iters if cls is BPETokenizer else [0]         # WordTokenizer는 n_iter를 쓰지 않는다
+            tokenizer, train_runs = bench_train(cls, corpus, n_iters)
+
+            run = {
+                'tokenizer': cls.__name__,
+                'n_docs': n_docs,
+                'words_per_doc': words_per_doc,
+                'train': train_runs,
+                'encode': bench_encode(tokenizer, held_out, args.batch_sizes, args.workers),
+                'round_trip': bench_round_trip(tokenizer, held_out),
+            }
+            if not args.no_memory:
+                run['peak_memory_mb'] = peak_memory(cls, corpus, max(n_iters))
+
+            results['runs'].append(run)
+            print(f"{cls.__name__} n_docs={n_docs} done", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
@@ -0,0 +1,71 @@
+# TokenizerService load generator: concurrency개의 client가 동시에 encode 요청을 보내고 처리량 / latency를 측정
+# 01_python 폴더에서: python -m benchmarks.load_service -c 64 -n 5000
+#   --port / --path를 주면 이미 떠 있는 server (python -m YBIGTA.service)에 붙고, 아니면 synthetic corpus로 학습한 BPETokenizer로 server를 같이 띄운다
+import argparse
+import asyncio
+import json
+import time
+
+from YBIGTA import BPETokenizer
+from YBIGTA.service import TokenizerClient, TokenizerService, percentile
+from benchmarks.synthetic import make_corpus
+
+
+async def run_client(client, docs, latencies):
+    for doc in docs:
+        start = time.perf_counter()
+        await client.encode(doc)
+        latencies.append(time.perf_counter() - start)
+
+
+async def main(args):
+    service = None
+    if args.port is None and args.path is None:
+        tokenizer = BPETokenizer(make_corpus(args.n_train))
+        tokenizer.train(args.n_iter)
+        service = TokenizerService(tokenizer, args.max_batch_size, args.max_wait_ms)
+        await service.start()
+        host, port = service.address
+    else:
+        host, port = args.host, args.port
+
+    docs = make_corpus(args.n_requests, args.words_per_doc, seed=1)
+    clients = [await TokenizerClient.connect(host, port, args.path) for _ in range(args.connections)]
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(clients[i % len(clients)], docs[i::args.concurrency], latencies) for i in range(args.concurrency)))
+    seconds = time.perf_counter() - start
+
+    server_stats = await clients[0].stats()
+    for client in clients:
+        await client.close()
+    if service is not None:
+        await service.close()
+
+    latencies.sort()
+    print(json.dumps({
+        'requests': args.n_requests,
+        'concurrency': args.concurrency,
+        'seconds': round(seconds, 4),
+        'requests_per_sec': round(args.n_requests / seconds),
+        'client_p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'client_p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'server': server_stats,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--n_requests", type=int, default=5000)
+    parser.add_argument("-c", "--concurrency", type=int, default=64)         # 동시에 요청을 보내는 coroutine 수
+    parser.add_argument("--connections", type=int, default=4)                # concurrency개의 coroutine이 나눠 쓰는 connection 수
+    parser.add_argument("--words_per_doc", type=int, default=200)
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=None)
+    parser.add_argument("-u", "--path", type=str, default=None)
+    parser.add_argument("-b", "--max_batch_size", type=int, default=64)      # 같이 띄우는 server의 설정
+    parser.add_argument("-t", "--max_wait_ms", type=float, default=5.0)
+    parser.add_argument("--n_train", type=int, default=2000)
+    parser.add_argument("--n_iter", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,28 @@
+import random
+from typing import List
+
+LETTERS = 'etaoinshrdlcumwfgypbvkjxqz'
+LETTER_WEIGHTS = [12.7, 9.1, 8.2, 7.5, 7.0, 6.7, 6.3, 6.1, 6.0, 4.3, 4.0, 2.8, 2.8, 2.4, 2.4, 2.2, 2.0, 2.0, 1.9, 1.5, 1.0, 0.8, 0.2, 0.2, 0.1, 0.1]
+PUNCTUATION = ['.', ',', '!', '?', ';', ':', ' -', '"', "'s", ' (1)', ' 2019']
+
+def make_corpus(n_docs: int, words_per_doc: int = 200, n_words: int = 20000, seed: int = 0) -> List[str]:
+    # seed가 같으면 항상 같은 corpus를 만드는 synthetic 뉴스 기사 생성기
+    # 단어 빈도는 Zipf 분포, 문장 사이에 기호 / 숫자 / 하이픈 단어 / 줄바꿈이 섞여 있다
+    rng = random.Random(seed)
+
+    words = [''.join(rng.choices(LETTERS, LETTER_WEIGHTS, k=rng.randint(1, 10))) for _ in range(n_words)]
+    zipf = [1 / rank for rank in range(1, n_words + 1)]
+
+    docs = []
+    for _ in range(n_docs):
+        tokens = rng.choices(words, zipf, k=words_per_doc)
+
+        for i in range(0, len(tokens), 12):
+            tokens[i] = tokens[i].capitalize()
+            tokens[i - 1] += rng.choice(PUNCTUATION)
+        for i in range(5, len(tokens), 37):
+            tokens[i] = tokens[i] + '-' + tokens[i - 1]
+
+        docs.append(' '.join(tokens) + '\n\n@highlight\n\n' + ' '.join(tokens[:12]))
+
+    return docs
@@ -1,26 +1,40 @@
 import argparse
-import os, tarfile
+import os, sys, tarfile
+from itertools import islice
 from urllib.request import urlretrieve
-from typing import Optional
+from typing import Iterator, Optional
 
-from YBIGTA import BPETokenizer, WordTokenizer
+from YBIGTA import BPETokenizer, WordTokenizer, TrainingMonitor, TrainingProgress, CorpusCache, count_corpus
+
+CNN_URL = "https://huggingface.co/datasets/cnn_dailymail/resolve/main/data/cnn_stories.tgz"
+TEXT_DIR = "cnn/stories/"
+
+
+def download_corpus(url: str = CNN_URL, dl_name: str = "dataset.tgz") -> str:
+    if not os.path.exists(dl_name):
+        urlretrieve(url, dl_name)
+    return dl_name
 
 
 def load_corpus(
-    url: str = "https://huggingface.co/datasets/cnn_dailymail/resolve/main/data/cnn_stories.tgz",
+    url: str = CNN_URL,
     dl_name: str = "dataset.tgz",
-    text_dir: str = "cnn/stories/",
+    text_dir: str = TEXT_DIR,
     n: Optional[int] = None
-) -> list[str]:
-    if not os.path.exists(text_dir):
-        if not os.path.exists(dl_name):
-            urlretrieve(url, dl_name)
-        tarfile.open(dl_name).extractall()
+) -> Iterator[str]:
+    # archive를 풀지 않고 tarfile에서 story를 하나씩 읽어 yield 하는 generator
+    download_corpus(url, dl_name)
+
+    with tarfile.open(dl_name, mode="r|gz") as archive:
+        stories = (m for m in archive if m.isfile() and m.name.startswith(text_dir))
 
-    ls = os.listdir(text_dir)[:n]
-    dir_to_text = lambda f: open(text_dir + f, encoding='utf-8').read()
-    dataset = [*map(dir_to_text, ls)]
-    return dataset
+        for member in islice(stories, n):
+            yield archive.extractfile(member).read().decode('utf-8')
+
+
+def print_progress(progress: TrainingProgress) -> None:
+    print(f"[{progress.n_merges}/{progress.n_iter}] vocab {progress.vocab_size}, "
+          f"{progress.merges_per_sec:.0f} merges/s, {progress.elapsed:.1f}s", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -28,22 +42,53 @@ if __name__ == "__main__":
     parser.add_argument("-t", "--use_bpe", action = "store_true", default=True)
     parser.add_argument("-c", "--n_corpus", type=int, default=40000)
     parser.add_argument("-i", "--n_iter", type=int, default=30000)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("-s", "--save_path", type=str, default=None)    # 학습한 tokenizer를 저장할 경로
+    parser.add_argument("-l", "--load_path", type=str, default=None)    # 저장된 tokenizer를 불러와서 학습을 건너뛴다
+    parser.add_argument("-p", "--progress", type=int, default=1000)     # 이 merge 수마다 학습 진행 상황을 stderr에 출력
+    parser.add_argument("-k", "--merges_per_round", type=int, default=1)  # > 1 이면 round 마다 겹치지 않는 상위 pair들을 한 번에 merge (근사, 더 빠름)
+    parser.add_argument("--cache_dir", type=str, default=".ybigta_cache")  # 전처리 + 단어 세기 결과 cache (같은 입력이면 바로 학습)
+    parser.add_argument("--no_cache", action="store_true")
+    parser.add_argument("-o", "--output", type=str, default=None)       # n_corpus개 문서를 encode 한 token id 파일 경로 (.idx, .json도 같이 만든다)
     args = parser.parse_args()
 
     use_bpe = args.use_bpe
     n_corpus = args.n_corpus
     n_iter = args.n_iter
+    workers = args.workers
 
-    corpus = load_corpus(n=n_corpus)
-    
     SelectedTokenizer = BPETokenizer if use_bpe else WordTokenizer
-    tokenizer = SelectedTokenizer(corpus[:n_corpus//2])
-    tokenizer.add_corpus(corpus[n_corpus//2:])
-    
-    tokenizer.train(n_iter=n_iter)
+
+    if args.load_path is not None:
+        tokenizer = SelectedTokenizer.load(args.load_path)
+    else:
+        word_counts = None
+
+        if not args.no_cache:
+            cache = CorpusCache(args.cache_dir)
+            key = cache.key([download_corpus()], n_corpus=n_corpus, text_dir=TEXT_DIR)
+            word_counts = cache.get(key)
+
+        if word_counts is None:
+            word_counts = count_corpus(load_corpus(n=n_corpus), workers)
+            if not args.no_cache:
+                cache.put(key, *word_counts)
+
+        tokenizer = SelectedTokenizer(workers=workers)
+        tokenizer.add_word_freqs(*word_counts)
+
+        tokenizer.train(n_iter=n_iter, monitor=TrainingMonitor(print_progress, every=args.progress), merges_per_round=args.merges_per_round)
+
+    if args.save_path is not None:
+        tokenizer.save(args.save_path)
+
+    if args.output is not None:
+        info = tokenizer.encode_to_file(load_corpus(n=n_corpus), args.output, workers)
+        print(f"{info.n_docs} docs, {info.n_tokens} tokens ({info.dtype}) -> {info.path}, "
+              f"{info.tokens_per_sec:.0f} tokens/s", file=sys.stderr)
 
     input_ids = tokenizer.tokenize(
-        corpus[:10],
+        list(load_corpus(n=10)),
         padding=True,
         max_length=1024
     )
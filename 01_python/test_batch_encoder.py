@@ -0,0 +1,58 @@
+import unittest
+from YBIGTA import BPETokenizer, WordTokenizer
+from YBIGTA.batch_encoder import encode_batch, iter_encode
+from benchmarks.synthetic import make_corpus
+
+class TestBatchEncoder(unittest.TestCase):
+    # 작은 corpus도 pool로 보내도록 encode_batch를 min_parallel=0으로 부른다
+
+    def setUp(self):
+        self.corpus = make_corpus(60, words_per_doc=40, n_words=500)
+
+        self.bpe = BPETokenizer(self.corpus)
+        self.bpe.train(100)
+        self.word = WordTokenizer(self.corpus, max_vocab=200)
+        self.word.train()
+
+    def test_pooled_matches_in_process(self):
+        for tokenizer in (self.bpe, self.word):
+            expected = tokenizer._encode_texts(self.corpus)
+
+            pooled = encode_batch(tokenizer, self.corpus, workers=2, min_parallel=0)
+            self.assertEqual(expected, pooled)
+            self.assertEqual(2, tokenizer.encode_stats.workers)
+            self.assertEqual(sum(map(len, expected)), tokenizer.encode_stats.n_tokens)
+
+            self.assertEqual(expected, tokenizer.encode_batch(self.corpus, workers=1))
+            self.assertEqual(1, tokenizer.encode_stats.workers)
+            tokenizer.close()
+
+    def test_small_batch_stays_in_process(self):
+        self.bpe.workers = 2
+        self.assertEqual(self.bpe._encode_texts(self.corpus[:3]), self.bpe.encode_batch(self.corpus[:3]))
+        self.assertEqual(1, self.bpe.encode_stats.workers)
+        self.assertIsNone(self.bpe.batch_encoder)
+
+    def test_pool_is_rebuilt_after_training(self):
+        # 다시 학습하면 예전 모델을 load 한 worker는 버리고 새 모델로 encode 한다
+        encode_batch(self.bpe, self.corpus, workers=2, min_parallel=0)
+        encoder = self.bpe.batch_encoder
+        self.bpe.train(20)
+
+        try:
+            self.assertEqual(self.bpe._encode_texts(self.corpus), encode_batch(self.bpe, self.corpus, workers=2, min_parallel=0))
+            self.assertIsNot(encoder, self.bpe.batch_encoder)
+        finally:
+            self.bpe.close()
+
+    def test_iter_encode(self):
+        expected = self.bpe._encode_texts(self.corpus)
+
+        for workers in (1, 2):
+            chunks = list(iter_encode(self.bpe, iter(self.corpus), workers=workers, chunk_size=7))
+            self.assertTrue(all(len(chunk) <= 7 for chunk in chunks))
+            self.assertEqual(expected, [ids for chunk in chunks for ids in chunk])
+        self.bpe.close()
+
+if __name__ == '__main__':
+    unittest.main()
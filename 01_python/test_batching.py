@@ -0,0 +1,89 @@
+import random
+import unittest
+from YBIGTA import WordTokenizer, restore_order
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class TestBatching(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        words = [''.join(rng.choice('abcdef') for _ in range(3)) for _ in range(50)]
+        self.texts = [' '.join(rng.choice(words) for _ in range(rng.randint(0, 30))) for _ in range(500)]
+
+        self.tokenizer = WordTokenizer(self.texts)
+        self.tokenizer.train()
+        self.encoded = self.tokenizer.encode_batch(self.texts)
+
+    def check_batches(self, batches, batch_size):
+        # 모든 문서가 한 번씩, padding을 빼면 encode_batch 결과 그대로 들어 있어야 한다
+
+        self.assertEqual(list(range(len(self.texts))), sorted(i for batch in batches for i in batch.indices))
+        for batch in batches:
+            self.assertLessEqual(len(batch.indices), batch_size)
+            width = max(len(self.encoded[i]) for i in batch.indices)
+
+            for i, row, mask in zip(batch.indices, batch.input_ids, batch.attention_mask):
+                n = len(self.encoded[i])
+                self.assertEqual(self.encoded[i] + [self.tokenizer.pad_id] * (width - n), list(row))
+                self.assertEqual([1] * n + [0] * (width - n), list(mask))
+
+            n_tokens = sum(len(self.encoded[i]) for i in batch.indices)
+            self.assertEqual(n_tokens, batch.n_tokens)
+            self.assertEqual(width * len(batch.indices) - n_tokens, batch.n_padding)
+
+    def test_sorts(self):
+        padding = {}
+        for sort in ('length', 'bucket', None):
+            batches = list(self.tokenizer.iter_batches(self.texts, batch_size=16, sort=sort, bucket_size=4))
+            self.check_batches(batches, 16)
+            padding[sort] = sum(batch.n_padding for batch in batches)
+
+        self.assertLessEqual(padding['length'], padding['bucket'])
+        self.assertLessEqual(padding['bucket'], padding[None])
+
+    def test_unsorted_keeps_input_order(self):
+        batches = list(self.tokenizer.iter_batches(self.texts, batch_size=16, sort=None))
+        self.assertEqual(list(range(len(self.texts))), [i for batch in batches for i in batch.indices])
+
+    def test_bucket_stays_in_window(self):
+        # sort='bucket' 이면 batch_size * bucket_size개 window 안에서만 순서가 바뀐다
+        batches = list(self.tokenizer.iter_batches(self.texts, batch_size=10, sort='bucket', bucket_size=5))
+        for batch in batches:
+            self.assertEqual(1, len({i // 50 for i in batch.indices}))
+
+    def test_max_tokens(self):
+        batches = list(self.tokenizer.iter_batches(self.texts, batch_size=64, max_tokens=100))
+        self.check_batches(batches, 64)
+        for batch in batches:
+            width = len(batch.input_ids[0])
+            self.assertTrue(len(batch.indices) == 1 or len(batch.indices) * width <= 100)
+
+    def test_max_length(self):
+        batches = list(self.tokenizer.iter_batches(self.texts, batch_size=16, max_length=5))
+        for batch in batches:
+            for i, row, mask in zip(batch.indices, batch.input_ids, batch.attention_mask):
+                self.assertEqual(self.encoded[i][:5], [idx for idx, keep in zip(row, mask) if keep])
+
+    def test_restore_order(self):
+        batches = list(self.tokenizer.iter_batches(self.texts, batch_size=16))
+        outputs = [[sum(row) for row in batch.input_ids] for batch in batches]
+        self.assertEqual([sum(ids) for ids in self.encoded], restore_order(batches, outputs))
+
+    @unittest.skipIf(np is None, "requires numpy")
+    def test_return_tensors(self):
+        batches = list(self.tokenizer.iter_batches(self.texts, batch_size=16, return_tensors='np'))
+        self.check_batches(batches, 16)
+        self.assertTrue(all(isinstance(batch.input_ids, np.ndarray) for batch in batches))
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            list(self.tokenizer.iter_batches(self.texts, sort='random'))
+        with self.assertRaises(ValueError):
+            list(self.tokenizer.iter_batches(self.texts, return_tensors='pt'))
+
+if __name__ == '__main__':
+    unittest.main()
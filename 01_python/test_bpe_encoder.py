@@ -0,0 +1,54 @@
+import unittest
+from YBIGTA import BPETokenizer
+from benchmarks.synthetic import make_corpus
+
+def apply_in_order(word, merges):
+    # merge를 학습된 순서대로 하나씩 단어 전체에 적용하는 (느린) 기준 구현
+
+    symbols = list(word)
+    for first, second in merges:
+        merged, i = [], 0
+        while i < len(symbols):
+            if i < len(symbols) - 1 and symbols[i] == first and symbols[i + 1] == second:
+                merged.append(first + second)
+                i += 2
+            else:
+                merged.append(symbols[i])
+                i += 1
+        symbols = merged
+    return symbols
+
+class TestBPEEncoder(unittest.TestCase):
+
+    def setUp(self):
+        self.tokenizer = BPETokenizer(make_corpus(40, words_per_doc=100, n_words=1000))
+        self.tokenizer.train(150)
+
+    def test_encode_matches_in_order_merges(self):
+        merges, tokens = list(self.tokenizer.merges), self.tokenizer.symbols.tokens
+        encode_word = self.tokenizer.get_encoder().encode_word
+        words = list(self.tokenizer.word_freqs) + ['zzzz', 'theeee', 'a']
+
+        for word in words:
+            self.assertEqual(apply_in_order(word, merges), [tokens[i] for i in encode_word(word)], word)
+
+    def test_unknown_letter(self):
+        # alphabet에 없는 글자는 unk_id가 되고 merge 되지 않는다
+        encode_word = self.tokenizer.get_encoder().encode_word
+        unk_id = self.tokenizer.unk_id
+
+        self.assertEqual((unk_id, unk_id), encode_word('ßß'))
+        self.assertEqual(encode_word('the') + (unk_id,) + encode_word('the'), encode_word('theßthe'))
+
+    def test_cache(self):
+        tokenizer = BPETokenizer(make_corpus(5, words_per_doc=20, n_words=50), cache_size=2)
+        tokenizer.train(10)
+        encode_word = tokenizer.get_encoder().encode_word
+
+        for word in ('ab', 'ab', 'cd', 'ef', 'ab'):
+            encode_word(word)
+        info = tokenizer.cache_info()
+        self.assertEqual((1, 4, 2, 2), (info.hits, info.misses, info.maxsize, info.currsize))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from collections import Counter
+from YBIGTA import BPETokenizer
+from benchmarks.synthetic import make_corpus
+
+class TestBPETokenizer(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = make_corpus(40, words_per_doc=100, n_words=1000)
+
+    def test_train_merges_most_frequent_pair(self):
+        tokenizer = BPETokenizer(self.corpus)
+        tokenizer.train(1)
+
+        for _ in range(30):
+            vocab = tokenizer.vocab
+            n_merges = len(tokenizer.merges)
+            tokenizer.train(1)
+
+            pair = list(tokenizer.merges)[n_merges]
+            self.assertEqual(max(vocab.values()), vocab[pair])
+
+    def test_vocab_matches_recount(self):
+        # pair 빈도 index를 merge 마다 고친 결과가 단어들을 다시 쪼개서 센 것과 같아야 한다
+        tokenizer = BPETokenizer(self.corpus)
+        tokenizer.train(100)
+
+        tokens = tokenizer.symbols.tokens
+        encode_word = tokenizer.get_encoder().encode_word
+        expected = Counter()
+        for word, freq in tokenizer.word_freqs.items():
+            symbols = [tokens[i] for i in encode_word(word)]
+            for pair in zip(symbols, symbols[1:]):
+                expected[pair] += freq
+
+        self.assertEqual(dict(expected), {pair: freq for pair, freq in tokenizer.vocab.items() if freq > 0})
+
+if __name__ == '__main__':
+    unittest.main()
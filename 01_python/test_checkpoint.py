@@ -0,0 +1,104 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from YBIGTA import BPETokenizer, Checkpointer, TrainingMonitor
+from benchmarks.synthetic import make_corpus
+
+def random_corpus(rng, n_docs):
+    # 글자 종류가 적어서 빈도가 같은 pair (tie)가 많은 작은 corpus
+    return [' '.join(''.join(rng.choice('abcde') for _ in range(rng.randint(1, 6))) for _ in range(rng.randint(1, 8)))
+            for _ in range(n_docs)]
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'checkpoint')
+
+    def test_resume_matches_uninterrupted_training(self):
+        corpus = make_corpus(40, words_per_doc=100, n_words=1000)
+        full = BPETokenizer(corpus)
+        full.train(300)
+
+        # 100개 merge 뒤에 멈춘 학습을 checkpoint에서 이어간다
+        stopped = BPETokenizer(corpus)
+        stopped.train(300, monitor=TrainingMonitor(lambda progress: progress.n_merges < 100, every=1),
+                      checkpoint=Checkpointer(self.path, every=25))
+        self.assertLess(len(stopped.merges), 300)
+
+        resumed = BPETokenizer.resume(self.path, 300)
+        self.assertEqual(list(full.merges), list(resumed.merges))
+
+    def test_resume_multi_merge_rounds(self):
+        # merges_per_round > 1 이면 checkpoint의 merge를 원래 round 단위로 다시 적용해야 한다
+        corpus = make_corpus(40, words_per_doc=100, n_words=1000)
+        full = BPETokenizer(corpus)
+        full.train(300, merges_per_round=4)
+
+        stopped = BPETokenizer(corpus)
+        stopped.train(300, monitor=TrainingMonitor(lambda progress: progress.n_merges < 100, every=1),
+                      checkpoint=Checkpointer(self.path, every=25), merges_per_round=4)
+        self.assertLess(len(stopped.merges), 300)
+
+        resumed = BPETokenizer.resume(self.path, 300, merges_per_round=4)
+        self.assertEqual(list(full.merges), list(resumed.merges))
+
+    def test_resume_continued_training(self):
+        # train -> add_corpus -> train 중에 저장한 checkpoint에서 이어가도 끊기지 않은 학습과 같아야 한다
+        for seed in range(50):
+            rng = random.Random(seed)
+            first, second = random_corpus(rng, 5), random_corpus(rng, 5)
+
+            tokenizer = BPETokenizer(first)
+            tokenizer.train(5)
+            tokenizer.add_corpus(second)
+            tokenizer.train(15, checkpoint=Checkpointer(self.path, every=7))
+
+            resumed = BPETokenizer.resume(self.path, 30)
+            tokenizer.train(10)
+            self.assertEqual(list(tokenizer.merges), list(resumed.merges), seed)
+
+    def test_resume_loaded_tokenizer(self):
+        # load 한 tokenizer에 단어를 더해 이어서 학습한 경우
+        model = os.path.join(self.temp_dir, 'model')
+        for seed in range(50):
+            rng = random.Random(seed)
+            first, second = random_corpus(rng, 5), random_corpus(rng, 5)
+
+            trained = BPETokenizer(first)
+            trained.train(5)
+            trained.save(model)
+
+            tokenizer = BPETokenizer.load(model)
+            tokenizer.add_corpus(second)
+            tokenizer.train(10, checkpoint=Checkpointer(self.path, every=7))
+
+            resumed = BPETokenizer.resume(self.path, 25)
+            tokenizer.train(10)
+            self.assertEqual(list(tokenizer.merges), list(resumed.merges), seed)
+
+    def test_checkpointer_is_reusable(self):
+        corpus = make_corpus(40, words_per_doc=100, n_words=1000)
+        checkpoint = Checkpointer(self.path, every=25)
+        extra = make_corpus(20, words_per_doc=100, n_words=1000, seed=1)
+
+        tokenizer = BPETokenizer(corpus)
+        tokenizer.train(60, checkpoint=checkpoint)
+        tokenizer.add_corpus(extra)
+        tokenizer.train(60, checkpoint=checkpoint)
+
+        reference = BPETokenizer(corpus)
+        reference.train(60)
+        reference.add_corpus(extra)
+        reference.train(80)
+
+        self.assertEqual(list(reference.merges)[:120], list(tokenizer.merges))
+        self.assertEqual(list(reference.merges), list(BPETokenizer.resume(self.path, 140).merges))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
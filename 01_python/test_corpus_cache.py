@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import unittest
+from YBIGTA import CorpusCache, count_corpus
+from benchmarks.synthetic import make_corpus
+
+class TestCorpusCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = CorpusCache(os.path.join(self.temp_dir, 'cache'), max_entries=2)
+        self.input = os.path.join(self.temp_dir, 'input.txt')
+        with open(self.input, 'w') as f:
+            f.write('hello world\n')
+
+    def test_get_put(self):
+        word_freqs, alphabet = count_corpus(make_corpus(10, words_per_doc=30, n_words=200))
+        key = self.cache.key([self.input], n_corpus=10)
+
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, word_freqs, alphabet)
+
+        cached_freqs, cached_alphabet = self.cache.get(key)
+        self.assertEqual(list(word_freqs.items()), list(cached_freqs.items()))        # 처음 등장한 순서도 그대로
+        self.assertEqual(alphabet, cached_alphabet)
+
+    def test_key(self):
+        key = self.cache.key([self.input], n_corpus=10)
+
+        self.assertEqual(key, self.cache.key([self.input], n_corpus=10))
+        self.assertNotEqual(key, self.cache.key([self.input], n_corpus=20))
+
+        with open(self.input, 'w') as f:
+            f.write('hello there world\n')
+        self.assertNotEqual(key, self.cache.key([self.input], n_corpus=10))
+
+    def test_corrupt_entry(self):
+        key = self.cache.key([self.input])
+        with open(self.cache._path(key), 'wb') as f:
+            f.write(b'not a cache entry')
+
+        self.assertIsNone(self.cache.get(key))
+
+    def test_prune(self):
+        # put 할 때 최근에 쓴 (get / put 한) max_entries개만 남긴다
+        for i, key in enumerate(('a', 'b')):
+            self.cache.put(key, {'x': i}, ['x'])
+            os.utime(self.cache._path(key), ns=(i * 10**9, i * 10**9))
+
+        self.assertIsNotNone(self.cache.get('a'))
+        self.cache.put('c', {'x': 2}, ['x'])
+
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('c'))
+        self.assertEqual(2, sum(name.endswith('.ybtk') for name in os.listdir(self.cache.cache_dir)))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from YBIGTA import BPETokenizer, TextPreprocessor, WordTokenizer
+from YBIGTA.decoder import Decoder
+from benchmarks.synthetic import make_corpus
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class TestDecoder(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = make_corpus(20, words_per_doc=40, n_words=300)
+        # decode는 단어를 공백 하나로 이어붙인다
+        self.sentences = [' '.join(sent.split()) for sent in TextPreprocessor.preprocess(self.corpus)]
+
+    def test_decode(self):
+        decoder = Decoder(['<PAD>', '<UNK>', 'a', 'b', 'ab'], (0, 1))
+
+        self.assertEqual('abab', decoder.decode([4, 2, 3]))
+        self.assertEqual('ab ab', decoder.decode([4, 2, 3], [1, 1, 0]))
+        self.assertEqual('ab<UNK> b<PAD>', decoder.decode([4, 1, 3, 0], [1, 0, 1, 0]))
+        self.assertEqual('ab b', decoder.decode([4, 1, 3, 0], [1, 0, 1, 0], skip_special_tokens=True))
+
+    def test_decode_batch_lists(self):
+        tokenizer = BPETokenizer(self.corpus)
+        tokenizer.train(100)
+        encode_word = tokenizer.get_encoder().encode_word
+
+        ids, word_starts = [], []
+        for sent in self.sentences:
+            tokens = [encode_word(word) for word in sent.split()]
+            ids.append([idx for token in tokens for idx in token])
+            word_starts.append([int(i == 0) for token in tokens for i in range(len(token))])
+
+        self.assertEqual(self.sentences, tokenizer.decode_batch(ids, word_starts=word_starts))
+        self.assertEqual([sent.replace(' ', '') for sent in self.sentences], tokenizer.decode_batch(tokenizer.encode_batch(self.corpus)))
+
+    @unittest.skipIf(np is None, "requires numpy")
+    def test_decode_batch_tensors(self):
+        tokenizer = BPETokenizer(self.corpus)
+        tokenizer.train(100)
+
+        tensors = tokenizer.tokenize(self.corpus + ['abc ßß abc'], return_tensors='np')
+        self.assertEqual(self.sentences + ['abc <UNK><UNK> abc'], tokenizer.decode_batch(tensors))
+        self.assertEqual(self.sentences + ['abc abc'], tokenizer.decode_batch(tensors, skip_special_tokens=True))
+
+        # word_starts 없이 넣으면 단어 사이 공백 없이 이어붙인다
+        joined = tokenizer.decode_batch(tensors['input_ids'], tensors['attention_mask'])
+        self.assertEqual([sent.replace(' ', '') for sent in self.sentences], joined[:-1])
+
+    @unittest.skipIf(np is None, "requires numpy")
+    def test_decode_batch_word_level(self):
+        tokenizer = WordTokenizer(self.corpus)
+        tokenizer.train()
+        texts = self.corpus + ['zzz ' + self.sentences[0]]
+
+        tensors = tokenizer.tokenize(texts, return_tensors='np')
+        self.assertEqual(self.sentences + ['<UNK> ' + self.sentences[0]], tokenizer.decode_batch(tensors))
+        self.assertEqual(self.sentences + [self.sentences[0]], tokenizer.decode_batch(tensors, skip_special_tokens=True))
+        self.assertEqual(self.sentences, tokenizer.decode_batch(tokenizer.encode_batch(self.corpus)))
+
+if __name__ == '__main__':
+    unittest.main()
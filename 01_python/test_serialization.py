@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+from array import array
+from YBIGTA import BPETokenizer, WordTokenizer
+from YBIGTA.serialization import HEADER, MAGIC, VERSION, pack_strings, read_sections, unpack_strings, write_sections
+from benchmarks.synthetic import make_corpus
+
+class TestSerialization(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = make_corpus(20, words_per_doc=60, n_words=500)
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'model.ybtk')
+
+    def test_strings_round_trip(self):
+        strings = ['', 'abc', 'Ünïcödé', '', 'x y', '<UNK>']
+        self.assertEqual(strings, unpack_strings(*pack_strings(strings)))
+
+    def test_sections_round_trip(self):
+        sections = {'blob': b'abc', 'ids': array('I', [3, 1, 4, 1, 5]), 'offsets': array('Q', [0, 2**40])}
+        write_sections(self.path, 'Test', sections)
+
+        loaded = read_sections(self.path, 'Test')
+        self.assertEqual(b'abc', bytes(loaded['blob']))
+        self.assertEqual([3, 1, 4, 1, 5], list(loaded['ids']))
+        self.assertEqual([0, 2**40], list(loaded['offsets']))
+
+    def test_bpe_round_trip(self):
+        tokenizer = BPETokenizer(self.corpus)
+        tokenizer.train(100)
+        tokenizer.save(self.path)
+
+        loaded = BPETokenizer.load(self.path)
+        self.assertEqual(tokenizer.symbols.tokens, loaded.symbols.tokens)
+        self.assertEqual(list(tokenizer.merges.items()), list(loaded.merges.items()))
+        self.assertEqual(tokenizer.tokenize(self.corpus), loaded.tokenize(self.corpus))
+
+    def test_word_round_trip(self):
+        tokenizer = WordTokenizer(self.corpus, max_vocab=100)
+        tokenizer.train()
+        tokenizer.save(self.path)
+
+        loaded = WordTokenizer.load(self.path)
+        self.assertEqual(tokenizer.word_tokens, loaded.word_tokens)
+        self.assertEqual(tokenizer.tokenize(self.corpus), loaded.tokenize(self.corpus))
+
+    def test_wrong_kind(self):
+        WordTokenizer(self.corpus).save(self.path)
+        with self.assertRaises(ValueError):
+            BPETokenizer.load(self.path)
+
+    def test_bad_header(self):
+        with open(self.path, 'wb') as f:
+            f.write(HEADER.pack(b'NOPE', VERSION, b'BPETokenizer', 0))
+        with self.assertRaises(ValueError):
+            read_sections(self.path, 'BPETokenizer')
+
+        with open(self.path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION + 1, b'BPETokenizer', 0))
+        with self.assertRaises(ValueError):
+            read_sections(self.path, 'BPETokenizer')
+
+    def test_truncated(self):
+        write_sections(self.path, 'Test', {'ids': array('I', range(100))})
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        for size in (1, HEADER.size + 4, len(data) - 8):
+            with open(self.path, 'wb') as f:
+                f.write(data[:size])
+            with self.assertRaises(ValueError):
+                read_sections(self.path, 'Test')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import unittest
+from YBIGTA import WordTokenizer
+from YBIGTA.service import TokenizerClient, TokenizerService, percentile
+from benchmarks.synthetic import make_corpus
+
+class FailingTokenizer(WordTokenizer):
+    # 'boom'이 들어 있는 문서를 encode 하면 실패하는 tokenizer
+
+    def _encode_texts(self, texts):
+        if any('boom' in text for text in texts):
+            raise RuntimeError("boom")
+        return super()._encode_texts(texts)
+
+class TestTokenizerService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.corpus = make_corpus(50, words_per_doc=20, n_words=200)
+        self.tokenizer = FailingTokenizer(self.corpus)
+        self.tokenizer.train()
+
+        self.service = TokenizerService(self.tokenizer, max_batch_size=8, max_wait_ms=20)
+        await self.service.start()
+        self.client = await TokenizerClient.connect(*self.service.address)
+
+    async def test_encode(self):
+        results = await asyncio.gather(*(self.client.encode(text) for text in self.corpus))
+        self.assertEqual(self.tokenizer.encode_batch(self.corpus), results)
+
+        stats = await self.client.stats()
+        self.assertEqual(len(self.corpus), stats['requests'])
+        self.assertLess(stats['batches'], stats['requests'])          # 동시에 보낸 요청은 묶어서 encode 한다
+        self.assertLessEqual(stats['max_queue_depth'], len(self.corpus))
+
+    async def test_bad_request_does_not_fail_batch(self):
+        # 같은 batch에 들어간 다른 요청은 실패한 요청과 상관없이 결과를 받아야 한다
+        requests = [self.client.encode(text) for text in self.corpus[:3]]
+        requests.append(self.client.encode('boom'))
+        requests.append(self.client._request('encode', text=123))
+        requests += [self.client.encode(text) for text in self.corpus[3:6]]
+
+        results = await asyncio.gather(*requests, return_exceptions=True)
+
+        self.assertEqual(self.tokenizer.encode_batch(self.corpus[:3]), results[:3])
+        self.assertIsInstance(results[3], RuntimeError)
+        self.assertIn('boom', str(results[3]))
+        self.assertIsInstance(results[4], RuntimeError)
+        self.assertIn('TypeError', str(results[4]))
+        self.assertEqual(self.tokenizer.encode_batch(self.corpus[3:6]), results[5:])
+
+    async def test_invalid_requests(self):
+        with self.assertRaises(RuntimeError):
+            await self.client._request('decode', ids=[1])
+
+        # JSON이 아닌 줄에는 id 없이 에러를 돌려주고 connection은 계속 쓴다
+        reader, writer = await asyncio.open_connection(*self.service.address)
+        writer.write(b'not json\n{"id": 7, "op": "encode", "text": "a"}\n')
+        await writer.drain()
+        first, second = json.loads(await reader.readline()), json.loads(await reader.readline())
+        writer.close()
+        await writer.wait_closed()
+
+        self.assertIsNone(first['id'])
+        self.assertIn('error', first)
+        self.assertEqual(7, second['id'])
+        self.assertEqual(self.tokenizer.encode_batch(['a'])[0], second['ids'])
+
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(50.0, percentile(values, 50))
+        self.assertEqual(99.0, percentile(values, 99))
+        self.assertEqual(0.0, percentile([], 50))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.service.close()
+
+if __name__ == '__main__':
+    unittest.main()
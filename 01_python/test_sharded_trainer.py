@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+from YBIGTA import BPETokenizer
+from benchmarks.synthetic import make_corpus
+
+class TestShardedBPETrainer(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = make_corpus(40, words_per_doc=100, n_words=1000)
+        # 작은 corpus도 shard로 나누도록 shard 하나의 최소 단어 수를 낮춘다
+        self.patcher = mock.patch('YBIGTA.bpe_tokenizer.MIN_SHARD_WORDS', 10)
+        self.patcher.start()
+
+    def test_sharded_training_matches_single_process(self):
+        single = BPETokenizer(self.corpus)
+        single.train(150)
+
+        sharded = BPETokenizer(self.corpus, workers=3)
+        try:
+            sharded.train(150)
+            self.assertEqual('ShardedBPETrainer', type(sharded.trainer).__name__)
+            self.assertEqual(list(single.merges), list(sharded.merges))
+        finally:
+            sharded.close()
+
+    def test_sharded_continued_training(self):
+        # add_corpus로 더한 단어도 shard에 나눠 넣고 이어서 학습한다
+        extra = make_corpus(20, words_per_doc=100, n_words=1000, seed=1)
+        single = BPETokenizer(self.corpus)
+        sharded = BPETokenizer(self.corpus, workers=3)
+
+        try:
+            for tokenizer in (single, sharded):
+                tokenizer.train(50)
+                tokenizer.add_corpus(extra)
+                tokenizer.train(50)
+            self.assertEqual(list(single.merges), list(sharded.merges))
+        finally:
+            sharded.close()
+
+    def test_close_stops_workers(self):
+        tokenizer = BPETokenizer(self.corpus, workers=3)
+        tokenizer.train(20)
+        processes = list(tokenizer.trainer.processes)
+        self.assertTrue(all(process.is_alive() for process in processes))
+
+        tokenizer.close()
+        self.assertFalse(any(process.is_alive() for process in processes))
+
+    def test_get_stats_closes_previous_trainer(self):
+        tokenizer = BPETokenizer(self.corpus, workers=3)
+        tokenizer.get_stats()
+        processes = list(tokenizer.trainer.processes)
+
+        tokenizer.get_stats()
+        try:
+            self.assertFalse(any(process.is_alive() for process in processes))
+        finally:
+            tokenizer.close()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from array import array
+from YBIGTA import BPETokenizer, WordTokenizer
+from YBIGTA.tensors import to_tensors
+from benchmarks.synthetic import make_corpus
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+@unittest.skipIf(np is None, "requires numpy")
+class TestTensors(unittest.TestCase):
+
+    def test_to_tensors(self):
+        ids, offsets = array('i', [5, 6, 7, 8, 9, 10]), array('q', [0, 3, 3, 6])
+        tensors = to_tensors(ids, offsets, pad_id=0, word_positions=array('q', [0, 2, 3]))
+
+        self.assertEqual([[5, 6, 7], [0, 0, 0], [8, 9, 10]], tensors['input_ids'].tolist())
+        self.assertEqual([[1, 1, 1], [0, 0, 0], [1, 1, 1]], tensors['attention_mask'].tolist())
+        self.assertEqual([0, 3, 3, 6], tensors['offsets'].tolist())
+        self.assertEqual([[1, 0, 1], [0, 0, 0], [1, 0, 0]], tensors['word_starts'].tolist())
+        self.assertEqual(np.int32, tensors['input_ids'].dtype)
+
+    def test_to_tensors_max_length(self):
+        ids, offsets = array('i', [5, 6, 7, 8, 9]), array('q', [0, 3, 5])
+        tensors = to_tensors(ids, offsets, max_length=2, pad_id=0, word_positions=array('q', [0, 2, 3, 4]))
+
+        self.assertEqual([[5, 6], [8, 9]], tensors['input_ids'].tolist())
+        self.assertEqual([0, 2, 4], tensors['offsets'].tolist())
+        self.assertEqual([[1, 0], [1, 1]], tensors['word_starts'].tolist())
+
+    def test_to_tensors_empty(self):
+        tensors = to_tensors(array('i'), array('q', [0, 0]))
+        self.assertEqual((1, 0), tensors['input_ids'].shape)
+
+    def test_matches_list_output(self):
+        # attention_mask == 1인 자리의 id들이 encode_batch의 결과와 같아야 한다
+        corpus = make_corpus(20, words_per_doc=40, n_words=300) + ['', 'ßß zzz']
+
+        bpe = BPETokenizer(corpus[:-1])
+        bpe.train(100)
+        word = WordTokenizer(corpus[:-1], max_vocab=50)
+        word.train()
+
+        for tokenizer in (bpe, word):
+            tensors = tokenizer.tokenize(corpus, return_tensors='np')
+            flat = tensors['input_ids'][tensors['attention_mask'] == 1]
+            offsets = tensors['offsets']
+
+            self.assertEqual(tokenizer.encode_batch(corpus), [flat[start:end].tolist() for start, end in zip(offsets, offsets[1:])])
+            self.assertTrue((tensors['input_ids'][tensors['attention_mask'] == 0] == tokenizer.pad_id).all())
+            self.assertIn(tokenizer.unk_id, flat.tolist())
+
+    def test_unsupported_return_tensors(self):
+        tokenizer = WordTokenizer(['a b'])
+        tokenizer.train()
+        with self.assertRaises(ValueError):
+            tokenizer.tokenize('a b', return_tensors='pt')
+
+if __name__ == '__main__':
+    unittest.main()
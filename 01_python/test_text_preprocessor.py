@@ -0,0 +1,55 @@
+import random
+import unittest
+from YBIGTA import TextPreprocessor
+from benchmarks.synthetic import make_corpus
+
+# 하이픈 / 기호 / 숫자 / 줄바꿈 / 유니코드가 섞인 경우들
+SENTENCES = [
+    "Hello, World!",
+    "state-of-the-art a-b-c x- -y --z a--b",
+    "snake_case-word _a-_b",
+    "line one\nline two\n\n",
+    "  Price: $1,999.99 (50% off) [2019] {x=y} `q`~ » «",
+    "Ünïcödé-Straße café-au-lait ÀB",
+    "",
+    "----",
+    "tab\tseparated - spaced - hyphens",
+]
+
+class TestTextPreprocessor(unittest.TestCase):
+
+    def setUp(self):
+        self.texts = SENTENCES + make_corpus(20, words_per_doc=60, n_words=500)
+
+    def test_preprocess_fast_matches_regex(self):
+        for text in self.texts:
+            self.assertEqual(TextPreprocessor._preprocess_sentence(text), TextPreprocessor._preprocess_fast(text), repr(text))
+
+    def test_preprocess_shard_matches_regex(self):
+        expected = [TextPreprocessor._preprocess_sentence(text) for text in self.texts]
+
+        self.assertEqual(expected, TextPreprocessor._preprocess_shard(self.texts))
+        self.assertEqual(expected, TextPreprocessor.preprocess(self.texts))
+
+    def test_preprocess_shard_with_separator(self):
+        # 문서 안에 SEPARATOR가 있으면 문서마다 따로 처리한다
+        texts = ["a-b\x00c-d", "e-f"]
+        self.assertEqual([TextPreprocessor._preprocess_sentence(text) for text in texts], TextPreprocessor._preprocess_shard(texts))
+
+    def test_preprocess_fast_matches_regex_random(self):
+        # 하이픈 / 밑줄 / 숫자 / NUL / 유니코드 글자를 섞은 무작위 문장
+        rng = random.Random(0)
+        letters = 'ab-_- 1.\n\x00éß'
+        for _ in range(2000):
+            text = ''.join(rng.choice(letters) for _ in range(rng.randint(0, 20)))
+            self.assertEqual(TextPreprocessor._preprocess_sentence(text), TextPreprocessor._preprocess_fast(text), repr(text))
+
+    def test_preprocess_workers_and_iterator(self):
+        expected = [TextPreprocessor._preprocess_sentence(text) for text in self.texts]
+
+        self.assertEqual(expected, TextPreprocessor.preprocess_batch(self.texts, workers=2))
+        self.assertEqual(expected, list(TextPreprocessor.iter_preprocess(iter(self.texts))))
+        self.assertEqual(expected, list(TextPreprocessor.iter_preprocess(iter(self.texts), workers=2)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from array import array
+from YBIGTA import BPETokenizer, read_shard
+from YBIGTA.token_shards import INDEX_SUFFIX, META_SUFFIX, shard_dtype
+from benchmarks.synthetic import make_corpus
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class TestTokenShards(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = make_corpus(50, words_per_doc=40, n_words=300) + ['']
+        self.tokenizer = BPETokenizer(self.corpus)
+        self.tokenizer.train(100)
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'tokens.bin')
+
+    def test_encode_to_file(self):
+        # encode_to_file은 generator를 chunk 단위로 읽어 encode_batch와 같은 id들을 이어붙인다
+        expected = self.tokenizer.encode_batch(self.corpus)
+        info = self.tokenizer.encode_to_file(iter(self.corpus), self.path, chunk_size=7)
+
+        self.assertEqual((len(self.corpus), sum(map(len, expected)), '<u2'), (info.n_docs, info.n_tokens, info.dtype))
+
+        with open(self.path, 'rb') as f:
+            ids = array('H', f.read())
+        with open(self.path + INDEX_SUFFIX, 'rb') as f:
+            offsets = array('Q', f.read())
+        with open(self.path + META_SUFFIX) as f:
+            meta = json.load(f)
+
+        self.assertEqual([idx for doc in expected for idx in doc], ids.tolist())
+        self.assertEqual(expected, [ids[start:end].tolist() for start, end in zip(offsets, offsets[1:])])
+        self.assertEqual({'dtype': '<u2', 'n_docs': len(self.corpus), 'n_tokens': info.n_tokens,
+                          'vocab_size': self.tokenizer.vocab_size, 'tokenizer': 'BPETokenizer'}, meta)
+        self.assertEqual([self.path, self.path + INDEX_SUFFIX, self.path + META_SUFFIX], sorted(os.path.join(self.temp_dir, name) for name in os.listdir(self.temp_dir)))
+
+    def test_pooled_encode_to_file(self):
+        expected = self.tokenizer.encode_batch(self.corpus)
+        try:
+            self.tokenizer.encode_to_file(self.corpus, self.path, workers=2, chunk_size=7)
+        finally:
+            self.tokenizer.close()
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual([idx for doc in expected for idx in doc], array('H', f.read()).tolist())
+
+    @unittest.skipIf(np is None, "requires numpy")
+    def test_read_shard(self):
+        expected = self.tokenizer.encode_batch(self.corpus)
+        self.tokenizer.encode_to_file(self.corpus, self.path)
+
+        ids, offsets = read_shard(self.path)
+        self.assertEqual(np.dtype('<u2'), ids.dtype)
+        self.assertEqual(expected, [ids[start:end].tolist() for start, end in zip(offsets, offsets[1:])])
+
+    @unittest.skipIf(np is None, "requires numpy")
+    def test_read_empty_shard(self):
+        self.tokenizer.encode_to_file(['', ''], self.path)
+
+        ids, offsets = read_shard(self.path)
+        self.assertEqual(0, len(ids))
+        self.assertEqual([0, 0, 0], offsets.tolist())
+
+    def test_shard_dtype(self):
+        self.assertEqual(('H', '<u2'), shard_dtype(1 << 16))
+        self.assertEqual(('I', '<u4'), shard_dtype((1 << 16) + 1))
+        with self.assertRaises(ValueError):
+            shard_dtype((1 << 32) + 1)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from YBIGTA import BPETokenizer, TextPreprocessor
+from YBIGTA.bpe_encoder import BPEEncoder
+from YBIGTA.symbol_table import SymbolTable
+from YBIGTA.trie_encoder import TrieEncoder
+from benchmarks.synthetic import make_corpus
+
+def longest_match(word, vocab):
+    # 왼쪽부터 vocab에 있는 가장 긴 token을 고르는 (느린) 기준 구현. 없으면 글자 하나를 None으로
+
+    tokens, start = [], 0
+    while start < len(word):
+        end = max((end for end in range(start + 1, len(word) + 1) if word[start:end] in vocab), default=None)
+        tokens.append(None if end is None else word[start:end])
+        start = start + 1 if end is None else end
+    return tokens
+
+class TestTrieEncoder(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = make_corpus(40, words_per_doc=100, n_words=1000)
+        self.tokenizer = BPETokenizer(self.corpus)
+        self.tokenizer.train(150)
+
+    def test_matches_longest_match(self):
+        tokenizer = self.tokenizer
+        tokens, unk_id = tokenizer.symbols.tokens, tokenizer.unk_id
+        vocab = set(tokens) - {'<PAD>', '<UNK>'}
+        encode_word = TrieEncoder(tokenizer.symbols, unk_id, special_ids=(tokenizer.pad_id, unk_id)).encode_word
+
+        for word in list(tokenizer.word_freqs) + ['zzzz', 'thßee', '<UNK>', 'a']:
+            expected = longest_match(word, vocab)
+            self.assertEqual(expected, [None if idx == unk_id else tokens[idx] for idx in encode_word(word)], word)
+
+    def test_differs_from_bpe(self):
+        # merge 순서가 longest match와 다르면 결과가 달라질 수 있다
+        symbols = SymbolTable(['<PAD>', '<UNK>', 'a', 'b', 'c', 'bc', 'ab'])
+        bpe = BPEEncoder(symbols, [('b', 'c'), ('a', 'b')], unk_id=1)
+        trie = TrieEncoder(symbols, unk_id=1, special_ids=(0, 1))
+
+        self.assertEqual((2, 5), bpe.encode_word('abc'))
+        self.assertEqual((6, 4), trie.encode_word('abc'))
+
+    def test_set_encoding(self):
+        tokenizer = self.tokenizer
+        bpe_ids = tokenizer.encode_batch(self.corpus)
+
+        tokenizer.set_encoding('trie')
+        self.assertIsInstance(tokenizer.get_encoder(), TrieEncoder)
+        trie = tokenizer.get_encoder().encode_word
+        expected = [[idx for word in sent.split() for idx in trie(word)] for sent in TextPreprocessor.preprocess(self.corpus)]
+        self.assertEqual(expected, tokenizer.encode_batch(self.corpus))
+
+        tokenizer.set_encoding('bpe')
+        self.assertEqual(bpe_ids, tokenizer.encode_batch(self.corpus))
+
+        with self.assertRaises(ValueError):
+            tokenizer.set_encoding('wordpiece')
+
+    def test_compare_encoders(self):
+        tokenizer = self.tokenizer
+        comparison = tokenizer.compare_encoders(self.corpus)
+
+        bpe = tokenizer._build_encoder('bpe').encode_word
+        trie = tokenizer._build_encoder('trie').encode_word
+        words = [word for sent in TextPreprocessor.preprocess(self.corpus) for word in sent.split()]
+
+        self.assertEqual(len(words), comparison.n_words)
+        self.assertEqual(sum(bpe(word) != trie(word) for word in words), comparison.n_different)
+        self.assertEqual(len(set(words)), comparison.n_unique)
+        self.assertEqual(sum(bpe(word) != trie(word) for word in set(words)), comparison.n_unique_different)
+        self.assertEqual(sum(len(bpe(word)) for word in words), comparison.bpe_tokens)
+        self.assertEqual(sum(len(trie(word)) for word in words), comparison.trie_tokens)
+        self.assertAlmostEqual(comparison.n_different / comparison.n_words, comparison.rate)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import random
+import unittest
+from collections import Counter
+from YBIGTA import WordTokenizer
+from YBIGTA.vocab_builder import VocabBuilder
+
+class TestVocabBuilder(unittest.TestCase):
+
+    def test_exact_under_capacity(self):
+        builder = VocabBuilder(capacity=10)
+        builder.update({'a': 3, 'b': 1})
+        builder.update({'b': 2, 'c': 1})
+
+        self.assertEqual({'a': 3, 'b': 3, 'c': 1}, builder.counts)
+        self.assertEqual(0, builder.error)
+        self.assertEqual(7, builder.total)
+
+    def test_reduce(self):
+        # 넘치면 (capacity + 1)번째로 큰 count만큼 빼고 0 이하인 단어를 버린다
+        builder = VocabBuilder(capacity=2)
+        builder.update({'a': 5, 'b': 3, 'c': 2, 'd': 1})
+
+        self.assertEqual({'a': 3, 'b': 1}, builder.counts)
+        self.assertEqual(2, builder.error)
+        self.assertEqual(11, builder.total)
+
+    def test_error_bound(self):
+        # count <= 실제 빈도 <= count + error, 버려진 단어의 실제 빈도는 error 이하
+        for seed in range(50):
+            rng = random.Random(seed)
+            builder = VocabBuilder(capacity=rng.randint(1, 8))
+            freqs = Counter()
+
+            for _ in range(rng.randint(1, 20)):
+                chunk = Counter(rng.choice('abcdefghijkl') for _ in range(rng.randint(1, 10)))
+                builder.update(dict(chunk))
+                freqs.update(chunk)
+
+            self.assertLessEqual(len(builder.counts), builder.capacity, seed)
+            self.assertEqual(sum(freqs.values()), builder.total, seed)
+            for word, freq in freqs.items():
+                count = builder.counts.get(word, 0)
+                self.assertLessEqual(count, freq, seed)
+                self.assertLessEqual(freq, count + builder.error, seed)
+
+    def test_most_common(self):
+        builder = VocabBuilder()
+        builder.update({'c': 1, 'a': 3, 'b': 2, 'd': 3})
+
+        self.assertEqual(['c', 'a', 'b', 'd'], builder.most_common())
+        self.assertEqual(['a', 'd'], builder.most_common(max_vocab=2))        # 처음 등장한 순서대로
+        self.assertEqual(['a', 'b', 'd'], builder.most_common(min_freq=2))
+
+class TestWordTokenizerVocab(unittest.TestCase):
+
+    def setUp(self):
+        self.tokenizer = WordTokenizer(['a a a b b c', 'a b d'])
+
+    def test_max_vocab_includes_special_tokens(self):
+        self.tokenizer.train(max_vocab=4)
+        self.assertEqual({'<PAD>': 0, '<UNK>': 1, 'a': 2, 'b': 3}, self.tokenizer.word_tokens)
+
+        self.tokenizer.train(max_vocab=1)
+        self.assertEqual({'<PAD>': 0, '<UNK>': 1}, self.tokenizer.word_tokens)
+
+    def test_min_freq(self):
+        self.tokenizer.train(min_freq=3)
+        self.assertEqual({'<PAD>': 0, '<UNK>': 1, 'a': 2, 'b': 3}, self.tokenizer.word_tokens)
+
+        self.tokenizer.train(min_freq=4)
+        self.assertEqual({'<PAD>': 0, '<UNK>': 1, 'a': 2}, self.tokenizer.word_tokens)
+
+    def test_unknown_word(self):
+        self.tokenizer.train(max_vocab=4)
+        unk_id = self.tokenizer.unk_id
+
+        self.assertEqual([[2, unk_id, unk_id]], self.tokenizer.tokenize('a c e'))
+        self.assertEqual([[2, unk_id], [3, 0]], self.tokenizer.tokenize(['a e', 'b'], padding=True))
+        self.assertEqual([[2, unk_id]], self.tokenizer.tokenize(['a e'], return_tensors='np')['input_ids'].tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_multi_pattern.py
+"""
+Compare the Aho-Corasick automaton used by `grep -e/-f` with a regex alternation of the same literals.
+
+Both matchers run through GrepCommand's line search over the same memory-mapped synthetic log, so
+the numbers include line handling and differ only in the matcher. Two kinds of pattern sets are used:
+request ids sharing the 'req' prefix (the regex engine can use the common prefix, the automaton
+starts on every 'r') and random alphanumeric strings (no shared prefix). GrepCommand switches from
+the alternation to the automaton at AHO_CORASICK_MIN_PATTERNS patterns. Run from the 02_python folder:
+
+    python -m benchmarks.bench_multi_pattern --lines 200000 --patterns 10,100,200,500,1000
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import re
+import string
+import tempfile
+import time
+
+from commands.grep_command import GrepCommand
+from utils.aho_corasick import AhoCorasick
+
+
+def parse_ints(value):
+    return [int(v) for v in value.split(',') if v]
+
+
+def make_log(path: str, n_lines: int, seed: int = 0) -> None:
+    """
+    Write a synthetic request log with one random request id per line.
+    """
+    rng = random.Random(seed)
+    with open(path, 'w') as f:
+        for i in range(n_lines):
+            f.write(f"2024-01-01 12:{i // 60 % 60:02d}:{i % 60:02d} INFO request_id=req{rng.randrange(10 ** 7):07d} "
+                    f"path=/api/v1/items/{rng.randrange(1000)} status=200\n")
+
+
+def time_matcher(command: GrepCommand, matcher, path: str):
+    """
+    Count the matching lines of path with matcher and return (seconds, matching lines).
+    """
+    start = time.perf_counter()
+    with command._open_buffer(path) as buf:
+        n_lines = sum(1 for _ in command._iter_matching_lines(matcher, buf))
+    return time.perf_counter() - start, n_lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=200000)                        # log lines
+    parser.add_argument("--patterns", type=parse_ints, default=[10, 100, 200, 500, 1000])     # numbers of literal ids to search
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    command = GrepCommand([], [])
+    results = {'lines': args.lines, 'runs': []}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'requests.log')
+        make_log(path, args.lines)
+        size_mb = os.path.getsize(path) / 1e6
+
+        kinds = {
+            'request_ids': lambda: f"req{rng.randrange(10 ** 7):07d}",
+            'random': lambda: ''.join(rng.choice(string.ascii_lowercase + string.digits) for _ in range(8)),
+        }
+        for (kind, make_pattern), n_patterns in itertools.product(kinds.items(), args.patterns):
+            patterns = [make_pattern().encode() for _ in range(n_patterns)]
+
+            start = time.perf_counter()
+            automaton = AhoCorasick(patterns)
+            build_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            alternation = re.compile(b'|'.join(map(re.escape, patterns)), re.MULTILINE)
+            compile_seconds = time.perf_counter() - start
+
+            ac_seconds, ac_lines = time_matcher(command, automaton, path)
+            re_seconds, re_lines = time_matcher(command, alternation, path)
+            assert ac_lines == re_lines, (ac_lines, re_lines)
+
+            results['runs'].append({
+                'kind': kind,
+                'patterns': n_patterns,
+                'matching_lines': ac_lines,
+                'aho_corasick_build_seconds': round(build_seconds, 4),
+                'aho_corasick_seconds': round(ac_seconds, 4),
+                'aho_corasick_mb_per_sec': round(size_mb / ac_seconds, 1),
+                'regex_compile_seconds': round(compile_seconds, 4),
+                'regex_seconds': round(re_seconds, 4),
+                'regex_mb_per_sec': round(size_mb / re_seconds, 1),
+                'speedup': round(re_seconds / ac_seconds, 2),
+            })
+
+    output = json.dumps(results, indent=2)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
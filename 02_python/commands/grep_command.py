@@ -1,6 +1,13 @@
+import mmap
+import os
 import re
-from typing import List
+import stat
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 from .base_command import BaseCommand
+from utils.aho_corasick import AhoCorasick
 
 """
 TODO 9-1: Fix the bug of grep not printing the matched line.
@@ -14,7 +21,47 @@ Use breakpoint() and following commands to debug:
 - help (h): show the help message
 """
 
+# Characters with a special meaning in a regular expression. A pattern without any of them is searched as a plain string.
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+# Inline flags ((?i), (?s), (?-i:...)) change how a regex treats case and newlines
+INLINE_FLAGS = frozenset('aiLmsux-')
+
+# Options taking a value, which must be attached (`-m5`, `-eERROR`, `-fpatterns.txt`): the command
+# parser splits options from arguments without keeping their positions, so `-m 5` is ambiguous
+VALUE_OPTIONS = ('-m', '-e', '-f')
+
+# From this many plain-string patterns on, one Aho-Corasick pass beats a regex alternation
+# (see benchmarks/bench_multi_pattern.py; below it the C regex engine is faster than the pure-Python automaton)
+AHO_CORASICK_MIN_PATTERNS = 200
+
+# A carriage return not followed by a newline. Text mode (universal newlines) ends a line there, the byte search does not
+BARE_CARRIAGE_RETURN = re.compile(b'\r(?!\n)')
+
+# Bytes counted per slice when numbering lines, so a multi-GB gap between matches is never copied at once
+COUNT_CHUNK_SIZE = 1 << 20
+
+Matcher = Union[bytes, 're.Pattern', AhoCorasick, Tuple['re.Pattern', ...]]
+
 class GrepCommand(BaseCommand):
+    """
+    Search files for lines matching a pattern.
+
+    Files are memory-mapped and the pattern runs over the whole byte buffer, so lines are only
+    decoded and numbered when they match. Patterns without regex metacharacters are searched
+    with bytes.find, and hundreds of such patterns (-e / -f) with one Aho-Corasick automaton that is
+    built once and shared by every file of a recursive search. Regular expressions run over the raw
+    bytes only when that gives the same lines as decoded text (see _matches_like_text); the others,
+    files that cannot be mapped (pipes, /proc) and files with lone '\\r' line endings are searched line by line.
+
+    Attributes:
+        max_workers (int): Number of threads searching files in parallel with -r.
+        binary_probe_size (int): Number of leading bytes checked for a NUL byte to detect binary files.
+    """
+
+    max_workers = min(32, (os.cpu_count() or 1) + 4)
+    binary_probe_size = 8192
+
     def __init__(self, options: List[str], args: List[str]) -> None:
         """
         Initialize the GrepCommand object.
@@ -22,48 +69,528 @@ class GrepCommand(BaseCommand):
         Args:
             options (List[str]): List of command options.
             args (List[str]): List of command arguments (pattern and file name).
+                The value of an option such as -m is attached to it (-m5).
         """
         super().__init__(options, args)
 
         # Override the attributes inherited from BaseCommand
         self.description = 'Search for a pattern in a file'
-        self.usage = 'Usage: grep [OPTION]... PATTERN FILE'
-        
+        self.usage = ('Usage: grep [OPTION]... PATTERN FILE\n'
+                      '       grep [OPTION]... -ePATTERN... FILE\n'
+                      '       grep [OPTION]... -fPATTERN_FILE FILE\n'
+                      'Options: -n (line numbers), -r (recursive search of a directory), -c (count matching lines),\n'
+                      '         -mN (stop after N matching lines), -ePATTERN (repeatable), -fFILE (one pattern per line),\n'
+                      '         -F (patterns are plain strings)')
+
         # Command-specific attributes go here
         self.name = 'grep'
-        self.pattern = args[0] if args else ''
-        self.file = args[1] if len(args) > 1 else ''
-        self.options = options
+        self.options, args, self.values = self._parse_options(options, args)
+        if '-e' in self.values or '-f' in self.values:       # the patterns come from the options, every argument is a file
+            self.pattern = None
+            self.file = args[0] if args else ''
+        else:
+            self.pattern = args[0] if args else ''
+            self.file = args[1] if len(args) > 1 else ''
+
+    @staticmethod
+    def _parse_options(options: List[str], args: List[str]) -> Tuple[List[str], List[str], Dict[str, List[Optional[str]]]]:
+        """
+        Split the options that take a value from the plain flags.
+
+        The command parser puts every token starting with '-' into options and everything else into
+        args without keeping their order, so a separated value (-m 5) cannot be told apart from the
+        pattern or the file. Values must be attached (-m5); a bare value option gets None, which
+        execute reports.
+
+        Args:
+            options (List[str]): The parsed options.
+            args (List[str]): The parsed positional arguments.
+
+        Returns:
+            Tuple[List[str], List[str], Dict[str, List[Optional[str]]]]: The flags, the arguments and
+            the values of each value option.
+        """
+        flags, values = [], {}
+        for option in options:
+            name = next((name for name in VALUE_OPTIONS if option.startswith(name)), None)
+            if name is None:
+                flags.append(option)
+            else:
+                values.setdefault(name, []).append(option[len(name):] or None)
 
+        return flags, args, values
 
     def execute(self) -> None:
         """
         Execute the grep command.
         Supported options:
             -n: Prefix each line of output with the line number within its input file.
+            -r: Search every file under the given directory. Each output line is prefixed with its file path.
+            -c: Print only the number of matching lines (per file with -r).
+            -mN: Stop reading a file after N matching lines.
+            -ePATTERN: Search for PATTERN. Repeat to match lines containing any of the patterns.
+            -fFILE: Read the patterns from FILE, one per line.
+            -F: Treat the patterns as plain strings.
         """
 
+        for name, values in self.values.items():
+            if None in values:
+                print(f"grep: option requires a value attached to it: {name} (e.g. {name}VALUE)")
+                return
+
+        max_count = self.values.get('-m', [None])[-1]
+        if max_count is not None:
+            if not max_count.isdigit():
+                print(f"grep: invalid max count: {max_count!r}")
+                return
+            max_count = int(max_count)
+
+        try:
+            patterns = self._read_patterns()
+        except OSError as e:
+            print(f"grep: {e.filename}: {e.strerror}")
+            return
+
         # Compile the pattern
-        pattern = re.compile(self.pattern)
+        try:
+            matcher = self._compile(patterns, fixed_strings='-F' in self.options)
+        except re.error as e:
+            print(f"grep: invalid pattern: {e}")
+            return
         # Process the file
-    
+
         show_line_number = True if '-n' in self.options else False
-        try:
-            with open(self.file, 'r') as file:
-                for line_number, line in enumerate(file, start=1):
-                    result = pattern.search(line)
+        count_only = '-c' in self.options
+        recursive = '-r' in self.options
+
+        if count_only:
+            search = lambda path: self._count_file(matcher, path, max_count)
+        else:
+            search = lambda path: self._search_file(matcher, path, max_count)
+
+        if recursive and os.path.isdir(self.file):
+            self._search_tree(search, self.file, show_line_number)
+            return
 
-                    if result:
-                        self.print_line(line_number, line, show_line_number)
-                                
+        if os.path.isdir(self.file):
+            print(f"grep: {self.file}: Is a directory")
+            return
+
+        try:
+            result = search(self.file)
         except FileNotFoundError:
             print(f"grep: {self.file}: No such file or directory")
+            return
+
+        self._print_result(result, show_line_number)
+
+    def _read_patterns(self) -> List[str]:
+        """
+        Collect the patterns: the positional pattern, or every -e value followed by the lines of every -f file.
+
+        Returns:
+            List[str]: The patterns.
+        """
+        if self.pattern is not None:
+            return [self.pattern]
+
+        patterns = list(self.values.get('-e', []))
+        for path in self.values.get('-f', []):
+            with open(path, 'r') as file:
+                patterns.extend(line.rstrip('\r\n') for line in file)
+        return patterns
+
+    def _compile(self, patterns: List[str], fixed_strings: bool = False) -> Matcher:
+        """
+        Build the matcher for the patterns. A line matches if it matches any of them.
+
+        Args:
+            patterns (List[str]): The patterns given on the command line.
+            fixed_strings (bool): Whether to treat every pattern as a plain string (-F).
+
+        Returns:
+            Matcher: For plain strings, the UTF-8 bytes of a single pattern (searched with bytes.find), an
+            AhoCorasick automaton for AHO_CORASICK_MIN_PATTERNS or more, or an escaped bytes alternation
+            for fewer. Otherwise a compiled bytes pattern (an alternation of the patterns) when every pattern
+            matches the raw bytes like decoded text, or a tuple of compiled str patterns for the line-by-line
+            fallback. Several patterns with groups are compiled one by one rather than joined, since a
+            backreference, a named group or an inline flag changes meaning (or fails) inside an alternation.
+        """
+        if not patterns:
+            return re.compile(b'(?!)')                  # -f with an empty file matches nothing
+        if '' in patterns:
+            return b''                                  # an empty pattern matches every line
+
+        if fixed_strings or not any(map(REGEX_METACHARACTERS.intersection, patterns)):
+            literals = list(dict.fromkeys(pattern.encode('utf-8') for pattern in patterns))
+            if len(literals) == 1:
+                return literals[0]
+            if len(literals) >= AHO_CORASICK_MIN_PATTERNS:
+                return AhoCorasick(literals)
+            return re.compile(b'|'.join(map(re.escape, literals)))
+
+        if len(patterns) > 1 and any('(' in pattern for pattern in patterns):
+            return tuple(re.compile(pattern) for pattern in patterns)
+
+        pattern = patterns[0] if len(patterns) == 1 else '|'.join(f'(?:{pattern})' for pattern in patterns)
+        if all(map(self._matches_like_text, patterns)):
+            return re.compile(pattern.encode('ascii'), re.MULTILINE)
+        return (re.compile(pattern),)
+
+    @staticmethod
+    def _matches_like_text(pattern: str) -> bool:
+        """
+        Check whether a regex finds the same lines on the raw UTF-8 buffer as on each decoded line.
+
+        On bytes, '.' and negated classes match one byte of a multi-byte character, \\w, \\d, \\s and \\b
+        are ASCII only, '$' does not match before the '\\r' of a CRLF line, and escapes such as \\n or
+        \\012 and inline flags can match across a newline. Patterns using any of them (or non-ASCII
+        characters) are rejected; this is conservative, e.g. '[.]' is rejected too.
+
+        Args:
+            pattern (str): A single regex.
+
+        Returns:
+            bool: True if the pattern can run on the raw bytes.
+        """
+        if not pattern.isascii():
+            return False
+
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if char == '\\':
+                if pattern[i + 1:i + 2].isalnum():     # \w, \d, \s, \b, \n, \Z, \1, \012, ...
+                    return False
+                i += 2
+                continue
+            if char in '.$' or pattern.startswith('[^', i):
+                return False
+            if pattern.startswith('(?', i) and pattern[i + 2:i + 3] in INLINE_FLAGS:
+                return False
+            i += 1
+        return True
+
+    def _search_file(self, matcher: Matcher, path: str, max_count: Optional[int] = None) -> List[Tuple[int, str]]:
+        """
+        Search a single file.
+
+        Args:
+            matcher (Matcher): The matcher built by _compile.
+            path (str): The file to search.
+            max_count (Optional[int]): Stop after this many matching lines.
+
+        Returns:
+            List[Tuple[int, str]]: The (line number, line) pairs that match.
+        """
+        if self._needs_line_search(matcher, path):
+            return self._search_lines(matcher, path, max_count)
+
+        matches = []
+        with self._open_buffer(path) as buf:
+            if BARE_CARRIAGE_RETURN.search(buf):
+                return self._search_lines(matcher, path, max_count)
+            for line_number, start, end in self._iter_matching_lines(matcher, buf, max_count):
+                matches.append((line_number, buf[start:end].decode('utf-8', 'replace')))
+        return matches
+
+    def _count_file(self, matcher: Matcher, path: str, max_count: Optional[int] = None) -> int:
+        """
+        Count the matching lines of a single file without decoding them.
+
+        Args:
+            matcher (Matcher): The matcher built by _compile.
+            path (str): The file to search.
+            max_count (Optional[int]): Stop counting at this many matching lines.
+
+        Returns:
+            int: The number of matching lines.
+        """
+        if self._needs_line_search(matcher, path):
+            return len(self._search_lines(matcher, path, max_count))
+
+        with self._open_buffer(path) as buf:
+            if BARE_CARRIAGE_RETURN.search(buf):
+                return len(self._search_lines(matcher, path, max_count))
+            return sum(1 for _ in self._iter_matching_lines(matcher, buf, max_count))
+
+    @staticmethod
+    def _needs_line_search(matcher: Matcher, path: str) -> bool:
+        """
+        Check whether a file has to be searched line by line instead of memory-mapped.
+
+        Args:
+            matcher (Matcher): The matcher built by _compile.
+            path (str): The file to search.
+
+        Returns:
+            bool: True for str patterns (text fallback), a file that is not a regular file or a file of
+            size 0. Pipes report a size of 0 and /proc files are regular files of size 0, yet neither is
+            empty; streaming a really empty file costs nothing.
+        """
+        if isinstance(matcher, tuple):
+            return True
+        info = os.stat(path)
+        return not stat.S_ISREG(info.st_mode) or info.st_size == 0
+
+    def _open_buffer(self, path: str):
+        """
+        Memory-map a regular file for reading. Empty files, which cannot be mapped, give an empty buffer.
+
+        Args:
+            path (str): The file to map.
+
+        Returns:
+            A context manager giving a read-only mmap (or b'' for an empty file).
+        """
+        with open(path, 'rb') as file:
+            info = os.fstat(file.fileno())
+            if stat.S_ISREG(info.st_mode) and info.st_size == 0:
+                return nullcontext(b'')
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _iter_matching_lines(self, matcher: Matcher, buf, max_count: Optional[int] = None) -> Iterator[Tuple[int, int, int]]:
+        """
+        Find the matching lines of a byte buffer.
+
+        The matcher runs over the whole buffer. For each match the surrounding line is located from
+        the newline positions, reported once, and the search continues after it. Line numbers are
+        counted only up to the matching lines.
+
+        Args:
+            matcher (Matcher): A literal, an AhoCorasick automaton or a compiled bytes pattern.
+            buf: The buffer to search (mmap or bytes-like).
+            max_count (Optional[int]): Stop after this many matching lines.
+
+        Yields:
+            Tuple[int, int, int]: The line number and the start / end offsets (without the newline) of each matching line.
+        """
+        size = len(buf)
+        pos, counted, line_number, n_found = 0, 0, 1, 0
+
+        while pos <= size and (max_count is None or n_found < max_count):
+            span = self._find(matcher, buf, pos)
+            if span is None:
+                return
+            start, end = span
+
+            newline = buf.rfind(b'\n', pos, start)
+            line_start = pos if newline < 0 else newline + 1
+            if line_start >= size:               # empty match after the final newline
+                return
+            line_end = buf.find(b'\n', line_start)
+            if line_end < 0:
+                line_end = size
+
+            pos = line_end + 1
+            if end > line_end and not self._find(matcher, buf, line_start, line_end):
+                continue                         # the match ran across a newline; the line itself does not match
+
+            line_number += self._count_newlines(buf, counted, line_start)
+            counted = line_start
+            n_found += 1
+            yield line_number, line_start, line_end
+
+    @staticmethod
+    def _count_newlines(buf, start: int, end: int) -> int:
+        """
+        Count the newlines in buf[start:end] (mmap has no count method).
+
+        Args:
+            buf: The buffer.
+            start (int): The first offset to count from.
+            end (int): The offset to count up to.
+
+        Returns:
+            int: The number of newlines.
+        """
+        return sum(buf[i:min(i + COUNT_CHUNK_SIZE, end)].count(b'\n') for i in range(start, end, COUNT_CHUNK_SIZE))
+
+    @staticmethod
+    def _find(matcher: Matcher, buf, pos: int, endpos: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """
+        Find the next match in buf[pos:endpos].
+
+        Args:
+            matcher (Matcher): A literal, an AhoCorasick automaton or a compiled bytes pattern.
+            buf: The buffer to search.
+            pos (int): Where to start searching.
+            endpos (Optional[int]): Where to stop searching (the end of the buffer by default).
+
+        Returns:
+            Optional[Tuple[int, int]]: The (start, end) offsets of the match, or None.
+        """
+        endpos = len(buf) if endpos is None else endpos
+        if isinstance(matcher, bytes):
+            start = buf.find(matcher, pos, endpos)
+            return None if start < 0 else (start, start + len(matcher))
+        if isinstance(matcher, re.Pattern):
+            match = matcher.search(buf, pos, endpos)
+            return None if match is None else match.span()
+
+        return matcher.search(buf, pos, endpos)         # AhoCorasick returns the span itself
+
+    def _search_lines(self, matcher: Matcher, path: str, max_count: Optional[int] = None) -> List[Tuple[int, str]]:
+        """
+        Search a file line by line, streaming it instead of mapping it.
+
+        The file is read in text mode, so lines end at '\\n', '\\r\\n' or a lone '\\r' (universal newlines)
+        and '$' matches before '\\r\\n'. str patterns run on each decoded line, and a line matches if any of
+        them matches. The other matchers run on the UTF-8 bytes of each line without its newline.
+
+        Args:
+            matcher (Matcher): The matcher built by _compile.
+            path (str): The file to search.
+            max_count (Optional[int]): Stop after this many matching lines.
+
+        Returns:
+            List[Tuple[int, str]]: The (line number, line) pairs that match.
+        """
+        matches = []
+        if max_count == 0:
+            return matches
+
+        if isinstance(matcher, tuple):
+            file = open(path, 'r', errors='replace')
+            is_match = lambda line: any(pattern.search(line) for pattern in matcher)
+        else:
+            # surrogateescape gives back the original bytes of undecodable input
+            file = open(path, 'r', encoding='utf-8', errors='surrogateescape')
+            is_match = lambda line: self._find(matcher, line.rstrip('\n').encode('utf-8', 'surrogateescape'), 0) is not None
+
+        with file:
+            for line_number, line in enumerate(file, start=1):
+                if is_match(line):
+                    if not isinstance(matcher, tuple):
+                        line = line.encode('utf-8', 'surrogateescape').decode('utf-8', 'replace')
+                    matches.append((line_number, line))
+                    if len(matches) == max_count:
+                        break
+        return matches
+
+    def _search_tree(self, search: Callable[[str], Union[int, List[Tuple[int, str]]]], root: str, show_line_number: bool) -> None:
+        """
+        Search every text file under root on a thread pool and print the results file by file.
+
+        At most max_workers * 2 files are in flight at once, and the results are printed in
+        the order the files were found, so the output does not depend on thread scheduling.
+
+        Args:
+            search (Callable[[str], Union[int, List[Tuple[int, str]]]]): Searches one file (_search_file or _count_file).
+            root (str): The directory to search.
+            show_line_number (bool): Whether to prefix each line with its line number.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = deque()
+
+            for path in self._walk(root):
+                pending.append((path, pool.submit(self._search_text_file, search, path)))
+                if len(pending) >= self.max_workers * 2:
+                    self._print_matches(*pending.popleft(), show_line_number)
+
+            while pending:
+                self._print_matches(*pending.popleft(), show_line_number)
+
+    def _print_matches(self, path: str, future, show_line_number: bool) -> None:
+        """
+        Print the result of one file found by _search_tree.
+
+        Args:
+            path (str): The searched file.
+            future (Future): The future returning the result, or None for a skipped file.
+            show_line_number (bool): Whether to prefix each line with its line number.
+        """
+        try:
+            result = future.result()
+        except OSError as e:
+            print(f"grep: {path}: {e.strerror}")
+            return
+
+        if result is not None:
+            self._print_result(result, show_line_number, path)
+
+    def _print_result(self, result: Union[int, List[Tuple[int, str]]], show_line_number: bool, file_name: Optional[str] = None) -> None:
+        """
+        Print the matching lines of a file, or its count with -c.
+
+        Args:
+            result (Union[int, List[Tuple[int, str]]]): The count or the (line number, line) pairs.
+            show_line_number (bool): Whether to prefix each line with its line number.
+            file_name (Optional[str]): The file name to prefix each line with (-r).
+        """
+        if isinstance(result, int):
+            print(f"{file_name}:{result}" if file_name is not None else result)
+            return
+
+        for line_number, line in result:
+            self.print_line(line_number, line, show_line_number, file_name)
+
+    def _search_text_file(self, search: Callable[[str], Union[int, List[Tuple[int, str]]]], path: str) -> Optional[Union[int, List[Tuple[int, str]]]]:
+        """
+        Search a file found by -r, skipping binary files.
+
+        Args:
+            search (Callable[[str], Union[int, List[Tuple[int, str]]]]): Searches one file.
+            path (str): The file to search.
+
+        Returns:
+            Optional[Union[int, List[Tuple[int, str]]]]: The result, or None if the file is binary.
+        """
+        if self.is_binary(path):
+            return None
+        return search(path)
+
+    def is_binary(self, path: str) -> bool:
+        """
+        Check whether a file looks binary, i.e. has a NUL byte in its first binary_probe_size bytes.
+
+        Args:
+            path (str): The file to check.
+
+        Returns:
+            bool: True if the file is binary.
+        """
+        with open(path, 'rb') as file:
+            return b'\0' in file.read(self.binary_probe_size)
+
+    def _walk(self, root: str) -> Iterator[str]:
+        """
+        Yield the regular files under root in sorted, depth-first order using os.scandir.
+
+        Symbolic links to directories are not followed, so the walk cannot loop.
+
+        Args:
+            root (str): The directory to walk.
+
+        Yields:
+            str: The path of each file.
+        """
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                print(f"grep: {directory}: {e.strerror}")
+                continue
+
+            subdirectories = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path
+
+            stack.extend(reversed(subdirectories))
 
-    def print_line(self, line_number, line, show_line_number):
+    def print_line(self, line_number, line, show_line_number, file_name=None):
         """
         Print the matched line with or without the line number.
+        With -r the line is also prefixed with the name of its file.
         """
+        prefix = f"{file_name}:" if file_name is not None else ''
         if show_line_number:
-            print(f"{line_number}:{line.strip()}")
+            print(f"{prefix}{line_number}:{line.strip()}")
         else:
-            print(line.strip())
+            print(f"{prefix}{line.strip()}")
@@ -0,0 +1,46 @@
+import unittest
+import re
+from utils.aho_corasick import AhoCorasick
+
+class TestAhoCorasick(unittest.TestCase):
+
+    def test_search_finds_first_match_by_end(self):
+        automaton = AhoCorasick([b"he", b"she", b"his", b"hers"])
+
+        # "she" and "he" both end at offset 4; the shorter one is reported
+        self.assertEqual((2, 4), automaton.search(b"ushers"))
+        self.assertEqual((0, 3), automaton.search(b"his"))
+        self.assertIsNone(automaton.search(b"xyz"))
+
+    def test_search_follows_failure_links(self):
+        automaton = AhoCorasick([b"abcd", b"bce"])
+
+        self.assertEqual((1, 4), automaton.search(b"abce"))
+
+    def test_search_with_bounds(self):
+        automaton = AhoCorasick([b"id42", b"id7"])
+
+        self.assertEqual((10, 14), automaton.search(b"id7 x\nfoo id42", 3))
+        self.assertIsNone(automaton.search(b"id7 x\nfoo id42", 3, 13))
+
+    def test_search_agrees_with_regex_alternation(self):
+        patterns = [b"ab", b"bab", b"aab", b"bbba", b"a"]
+        automaton = AhoCorasick(patterns)
+        alternation = re.compile(b'|'.join(patterns))
+        text = b"bbbabababaabbbbabba"
+
+        for pos in range(len(text) + 1):
+            for endpos in range(pos, len(text) + 1):
+                found = automaton.search(text, pos, endpos)
+                self.assertEqual(alternation.search(text, pos, endpos) is None, found is None)
+                if found is not None:
+                    self.assertIn(text[found[0]:found[1]], patterns)
+
+    def test_empty_pattern_is_rejected(self):
+        with self.assertRaises(ValueError):
+            AhoCorasick([b"a", b""])
+        with self.assertRaises(ValueError):
+            AhoCorasick([])
+
+if __name__ == '__main__':
+    unittest.main()
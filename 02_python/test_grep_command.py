@@ -1,9 +1,12 @@
 import unittest
 import os
 import tempfile
+import shutil
 from io import StringIO
 import sys
-from commands.grep_command import GrepCommand
+from unittest import mock
+from commands.grep_command import AHO_CORASICK_MIN_PATTERNS, GrepCommand
+from utils.aho_corasick import AhoCorasick
 
 class TestGrepCommand(unittest.TestCase):
 
@@ -35,9 +38,303 @@ class TestGrepCommand(unittest.TestCase):
         output = sys.stdout.getvalue().strip()
         self.assertIn("3:Grep test line", output)
 
+    def test_grep_command_count(self):
+        command = GrepCommand(options=['-c'], args=["line", self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip()
+        self.assertEqual("2", output)
+
+    def test_grep_command_max_count(self):
+        command = GrepCommand(options=['-m1', '-n'], args=["line", self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip()
+        self.assertEqual("2:Another line", output)
+
+    def test_grep_command_separated_option_value(self):
+        # The parser does not keep token positions, so `grep line -m 1 file` must not read "line" as the count
+        command = GrepCommand(options=['-m'], args=["line", "1", self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip()
+        self.assertEqual("grep: option requires a value attached to it: -m (e.g. -mVALUE)", output)
+
+    def test_grep_command_count_with_max_count(self):
+        command = GrepCommand(options=['-c', '-m1', '-n'], args=["line", self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip()
+        self.assertEqual("1", output)
+
+    def test_grep_command_invalid_max_count(self):
+        command = GrepCommand(options=['-mline'], args=["line", self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip()
+        self.assertEqual("grep: invalid max count: 'line'", output)
+
+    def test_grep_command_regex(self):
+        command = GrepCommand(options=['-n'], args=["^(Hello|Grep) .*$", self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip().splitlines()
+        self.assertEqual(["1:Hello World", "3:Grep test line"], output)
+
+    def test_grep_command_regex_does_not_match_across_lines(self):
+        command = GrepCommand(options=[], args=["line\\s+Grep", self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip()
+        self.assertEqual("", output)
+
+    def test_grep_command_literal_is_not_a_regex(self):
+        # A pattern without metacharacters is searched as a plain string; with them it is a regex
+        with open(self.temp_file.name, 'ab') as f:
+            f.write(b"a.b\naxb")
+
+        command = GrepCommand(options=['-n'], args=["a.b", self.temp_file.name])
+        command.execute()
+        command = GrepCommand(options=['-c'], args=["axb", self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip().splitlines()
+        self.assertEqual(["4:a.b", "5:axb", "1"], output)
+
+    def test_grep_command_empty_file(self):
+        with open(self.temp_file.name, 'wb'):
+            pass
+
+        command = GrepCommand(options=['-c'], args=["Grep", self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip()
+        self.assertEqual("0", output)
+
+    def test_grep_command_non_ascii_line(self):
+        # '.' and \w must match a whole character, not a single byte of its UTF-8 encoding
+        with open(self.temp_file.name, 'ab') as f:
+            f.write("a naïve test\n".encode('utf-8'))
+
+        for pattern in ("na.ve", "\\w+ve", "na[^x]ve", "naïve"):
+            sys.stdout = StringIO()
+            command = GrepCommand(options=['-n'], args=[pattern, self.temp_file.name])
+            command.execute()
+
+            output = sys.stdout.getvalue().strip()
+            self.assertEqual("4:a naïve test", output)
+
+    def test_grep_command_crlf_file(self):
+        with open(self.temp_file.name, 'wb') as f:
+            f.write(b"foo\tbar\r\nbar baz\r\n")
+
+        command = GrepCommand(options=['-n'], args=["bar$", self.temp_file.name])
+        command.execute()
+        command = GrepCommand(options=['-c'], args=["^bar", self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip().splitlines()
+        self.assertEqual(["1:foo\tbar", "1"], output)
+
+    def test_grep_command_bare_cr_file(self):
+        # A lone '\r' ends a line, as in text mode
+        with open(self.temp_file.name, 'wb') as f:
+            f.write(b"foo bar\rbaz\nbar\r")
+
+        command = GrepCommand(options=['-n'], args=["bar", self.temp_file.name])
+        command.execute()
+        command = GrepCommand(options=['-n'], args=["^ba", self.temp_file.name])
+        command.execute()
+        command = GrepCommand(options=['-c'], args=["ba", self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip().splitlines()
+        self.assertEqual(["1:foo bar", "3:bar", "2:baz", "3:bar", "3"], output)
+
+    @unittest.skipUnless(os.path.exists('/proc/self/status'), "requires procfs")
+    def test_grep_command_special_file(self):
+        # /proc files report a size of 0 but are not empty
+        command = GrepCommand(options=['-n'], args=["Name", "/proc/self/status"])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip()
+        self.assertTrue(output.startswith("1:Name:"), output)
+
+    def test_grep_command_file_not_found(self):
+        command = GrepCommand(options=[], args=["Grep", self.temp_file.name + ".missing"])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip()
+        self.assertEqual(f"grep: {self.temp_file.name}.missing: No such file or directory", output)
+
+    def test_grep_command_multiple_patterns(self):
+        command = GrepCommand(options=['-eHello', '-e^Grep', '-n'], args=[self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip().splitlines()
+        self.assertEqual(["1:Hello World", "3:Grep test line"], output)
+
+    def test_grep_command_multiple_patterns_with_groups(self):
+        # Each pattern keeps its own groups, backreferences and inline flags
+        with open(self.temp_file.name, 'wb') as f:
+            f.write(b"aa\nbb\nBAR\nab\n")
+
+        cases = [
+            (["(a)\\1", "(b)\\1"], ["1:aa", "2:bb"]),
+            (["foo", "(?i)bar"], ["3:BAR"]),
+            (["(?P<x>a)(?P=x)", "(?P<x>b)(?P=x)"], ["1:aa", "2:bb"]),
+        ]
+        for patterns, expected in cases:
+            sys.stdout = StringIO()
+            command = GrepCommand(options=['-n'] + ['-e' + pattern for pattern in patterns], args=[self.temp_file.name])
+            command.execute()
+
+            output = sys.stdout.getvalue().strip().splitlines()
+            self.assertEqual(expected, output, patterns)
+
+    def test_grep_command_pattern_file(self):
+        pattern_file = self.temp_file.name + ".patterns"
+        with open(pattern_file, 'w') as f:
+            f.write("Another\nnot there\n")
+        try:
+            command = GrepCommand(options=['-f' + pattern_file], args=[self.temp_file.name])
+            command.execute()
+        finally:
+            os.remove(pattern_file)
+
+        output = sys.stdout.getvalue().strip()
+        self.assertEqual("Another line", output)
+
+    def test_grep_command_fixed_strings(self):
+        with open(self.temp_file.name, 'ab') as f:
+            f.write(b"cost (usd)\n")
+
+        command = GrepCommand(options=['-F', '-e(usd)', '-eWor.d'], args=[self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip()
+        self.assertEqual("cost (usd)", output)
+
+    def test_grep_command_many_patterns_use_aho_corasick(self):
+        ids = [f"id{i:04d}" for i in range(AHO_CORASICK_MIN_PATTERNS)]
+        with open(self.temp_file.name, 'a') as f:
+            f.write("request id0123 done\nrequest id9999 done\n")
+
+        command = GrepCommand(options=[], args=[])
+        self.assertIsInstance(command._compile(ids), AhoCorasick)
+        self.assertNotIsInstance(command._compile(ids[:2]), AhoCorasick)
+
+        command = GrepCommand(options=['-n'] + ['-e' + id for id in ids], args=[self.temp_file.name])
+        command.execute()
+
+        output = sys.stdout.getvalue().strip()
+        self.assertEqual("4:request id0123 done", output)
+
+    def test_grep_command_directory_without_recursive(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            command = GrepCommand(options=[], args=["Grep", temp_dir])
+            command.execute()
+
+            output = sys.stdout.getvalue().strip()
+            self.assertEqual(f"grep: {temp_dir}: Is a directory", output)
+        finally:
+            os.rmdir(temp_dir)
+
     def tearDown(self):
         sys.stdout = self.held
         os.remove(self.temp_file.name)  # Remove the temporary file
 
+
+class TestRecursiveGrepCommand(unittest.TestCase):
+
+    def setUp(self):
+        # Create a directory tree with text files, a binary file and a nested directory
+        self.temp_dir = tempfile.mkdtemp()
+        self.files = {
+            "a.log": b"error: disk full\nok\n",
+            "b.bin": b"error\0\x01\x02\n",
+            os.path.join("sub", "c.log"): b"ok\nerror: timeout\nerror: retry\n",
+            os.path.join("sub", "deeper", "d.log"): b"nothing here\n",
+            "z.log": b"late error\n",
+        }
+        for name, content in self.files.items():
+            path = os.path.join(self.temp_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(content)
+
+        self.held, sys.stdout = sys.stdout, StringIO()
+
+    def path(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def test_recursive_grep(self):
+        command = GrepCommand(options=['-r'], args=["error", self.temp_dir])
+        command.execute()
+
+        output = sys.stdout.getvalue().splitlines()
+        self.assertEqual([
+            f"{self.path('a.log')}:error: disk full",
+            f"{self.path('z.log')}:late error",
+            f"{self.path(os.path.join('sub', 'c.log'))}:error: timeout",
+            f"{self.path(os.path.join('sub', 'c.log'))}:error: retry",
+        ], output)
+
+    def test_recursive_grep_with_line_number(self):
+        command = GrepCommand(options=['-r', '-n'], args=["error", self.temp_dir])
+        command.execute()
+
+        output = sys.stdout.getvalue()
+        self.assertIn(f"{self.path(os.path.join('sub', 'c.log'))}:3:error: retry", output)
+        self.assertNotIn("b.bin", output)
+
+    def test_recursive_grep_output_is_ordered(self):
+        # Many small files on a small pool: the output must still follow the walk order
+        for i in range(50):
+            with open(self.path(f"many{i:02d}.txt"), 'w') as f:
+                f.write(f"match {i}\n")
+
+        command = GrepCommand(options=['-r'], args=["match", self.temp_dir])
+        command.max_workers = 2
+        command.execute()
+
+        output = sys.stdout.getvalue().splitlines()
+        self.assertEqual([f"{self.path(f'many{i:02d}.txt')}:match {i}" for i in range(50)], output)
+
+    def test_recursive_grep_count(self):
+        command = GrepCommand(options=['-r', '-c'], args=["error", self.temp_dir])
+        command.execute()
+
+        output = sys.stdout.getvalue().splitlines()
+        self.assertEqual([
+            f"{self.path('a.log')}:1",
+            f"{self.path('z.log')}:1",
+            f"{self.path(os.path.join('sub', 'c.log'))}:2",
+            f"{self.path(os.path.join('sub', 'deeper', 'd.log'))}:0",
+        ], output)
+
+    def test_recursive_grep_builds_one_automaton(self):
+        pattern_file = os.path.join(self.temp_dir, "sub", "deeper", "patterns.txt")
+        with open(pattern_file, 'w') as f:
+            f.write("\n".join(["timeout", "full"] + [f"id{i:04d}" for i in range(AHO_CORASICK_MIN_PATTERNS)]) + "\n")
+
+        with mock.patch('commands.grep_command.AhoCorasick', wraps=AhoCorasick) as automaton:
+            command = GrepCommand(options=['-r', '-f' + pattern_file], args=[self.temp_dir])
+            command.execute()
+
+        self.assertEqual(1, automaton.call_count)
+        output = sys.stdout.getvalue().splitlines()
+        self.assertEqual([
+            f"{self.path('a.log')}:error: disk full",
+            f"{self.path(os.path.join('sub', 'c.log'))}:error: timeout",
+            f"{pattern_file}:timeout",
+            f"{pattern_file}:full",
+        ], output[:4])
+
+    def tearDown(self):
+        sys.stdout = self.held
+        shutil.rmtree(self.temp_dir)
+
 if __name__ == '__main__':
     unittest.main()
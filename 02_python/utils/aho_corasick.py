@@ -0,0 +1,134 @@
+# utils/aho_corasick.py
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class AhoCorasick:
+    """
+    An Aho-Corasick automaton matching many literal byte strings in a single pass.
+
+    The automaton is built once and is read-only afterwards, so one instance can be shared by
+    every file (and every thread) of a recursive search.
+
+    Transitions are stored as a complete DFA over the bytes that appear in the patterns: any other
+    byte sends the automaton back to the root. While in the root state the search jumps straight
+    to the next byte that can start a pattern with a compiled character class, so text without
+    candidates is skipped at C speed.
+
+    Attributes:
+        patterns (List[bytes]): The patterns, without duplicates.
+        delta (List[Dict[int, int]]): State -> {byte: next state}.
+        lengths (List[int]): State -> length of the shortest pattern ending at that state (0 if none).
+    """
+
+    def __init__(self, patterns: Iterable[bytes]) -> None:
+        """
+        Build the automaton.
+
+        Args:
+            patterns (Iterable[bytes]): The literal patterns. They must be non-empty.
+
+        Raises:
+            ValueError: If no pattern is given or a pattern is empty.
+        """
+        self.patterns = list(dict.fromkeys(patterns))
+        if not self.patterns:
+            raise ValueError("AhoCorasick needs at least one pattern.")
+        if not all(self.patterns):
+            raise ValueError("AhoCorasick patterns must be non-empty.")
+
+        goto: List[Dict[int, int]] = [{}]
+        self.lengths = [0]
+
+        for pattern in self.patterns:
+            state = 0
+            for byte in pattern:
+                nxt = goto[state].get(byte)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][byte] = nxt
+                    goto.append({})
+                    self.lengths.append(0)
+                state = nxt
+            if not self.lengths[state] or len(pattern) < self.lengths[state]:
+                self.lengths[state] = len(pattern)
+
+        self.delta = self._build_delta(goto)
+        first_bytes = bytes(sorted(goto[0]))
+        self._skip = re.compile(b'[' + b''.join(re.escape(bytes([byte])) for byte in first_bytes) + b']')
+
+    def _build_delta(self, goto: List[Dict[int, int]]) -> List[Dict[int, int]]:
+        """
+        Turn the trie into a DFA by following the failure links breadth first.
+
+        Args:
+            goto (List[Dict[int, int]]): The trie transitions.
+
+        Returns:
+            List[Dict[int, int]]: The full transitions over the pattern bytes (missing bytes go to the root).
+        """
+        alphabet = {byte for pattern in self.patterns for byte in pattern}
+        delta = [dict() for _ in goto]
+        fail = [0] * len(goto)
+
+        queue = deque()
+        for byte in alphabet:
+            nxt = goto[0].get(byte, 0)
+            if nxt:
+                delta[0][byte] = nxt
+                queue.append(nxt)
+
+        while queue:
+            state = queue.popleft()
+            fallback = delta[fail[state]]
+
+            # A pattern ending at the failure state also ends here
+            if fail[state] and self.lengths[fail[state]] and (not self.lengths[state] or self.lengths[fail[state]] < self.lengths[state]):
+                self.lengths[state] = self.lengths[fail[state]]
+
+            for byte in alphabet:
+                nxt = goto[state].get(byte)
+                if nxt is None:
+                    target = fallback.get(byte, 0)
+                    if target:
+                        delta[state][byte] = target
+                else:
+                    fail[nxt] = fallback.get(byte, 0)
+                    delta[state][byte] = nxt
+                    queue.append(nxt)
+
+        return delta
+
+    def search(self, buf, pos: int = 0, endpos: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """
+        Find the first match (by end position) in buf[pos:endpos].
+
+        Args:
+            buf: The bytes-like buffer to search (bytes, mmap, ...).
+            pos (int): Where to start searching.
+            endpos (Optional[int]): Where to stop searching (the end of the buffer by default).
+
+        Returns:
+            Optional[Tuple[int, int]]: The (start, end) offsets of the match, or None.
+        """
+        endpos = len(buf) if endpos is None else endpos
+        delta, lengths, skip = self.delta, self.lengths, self._skip
+        i = pos
+
+        while i < endpos:
+            candidate = skip.search(buf, i, endpos)      # the next byte that can start a pattern
+            if candidate is None:
+                return None
+            i = candidate.start()
+
+            state = 0
+            while i < endpos:
+                state = delta[state].get(buf[i], 0)
+                i += 1
+                if lengths[state]:
+                    return i - lengths[state], i
+                if not state:                           # back at the root: skip ahead again
+                    break
+
+        return None